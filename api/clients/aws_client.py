@@ -2,17 +2,37 @@
 AWS API client for collecting infrastructure and security evidence
 """
 
+import asyncio
+import csv
+import io
+import time
+from functools import partial
+from operator import itemgetter
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Any, Optional, Sequence, Tuple
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 from .base_api_client import (
     BaseAPIClient,
     APICredentials,
     EvidenceItem,
     BaseEvidenceCollector,
+    StreamingEvidenceCollector,
     APIException,
     AuthType,
 )
@@ -20,6 +40,234 @@ from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Assumed-role credentials are reused until they are this close to expiry
+CREDENTIAL_REFRESH_BUFFER = timedelta(minutes=5)
+
+# How long a get_caller_identity result is reused by health checks (seconds)
+CALLER_IDENTITY_TTL = 60
+
+# Maximum number of IAM entities whose details are fetched concurrently
+IAM_DETAIL_CONCURRENCY = 20
+
+# Page sizes at the API maximums to keep round-trips down
+IAM_PAGE_SIZE = 1000
+CLOUDTRAIL_PAGE_SIZE = 50
+EC2_PAGE_SIZE = 1000
+
+# Default cap on CloudTrail events collected per event name
+CLOUDTRAIL_MAX_EVENTS = 1000
+
+# Polling for IAM credential report generation (attempts, seconds between them)
+CREDENTIAL_REPORT_ATTEMPTS = 10
+CREDENTIAL_REPORT_POLL_INTERVAL = 1
+
+# SOC 2 controls evidenced by each kind of item
+_CC_IAM_POLICY = ("CC6.1", "CC6.2", "CC6.3")  # Logical access
+_CC_IAM_USER = ("CC6.1", "CC6.2", "CC6.7")  # User access
+_CC_IAM_ROLE = ("CC6.1", "CC6.3")  # Role-based access
+_CC_AUDIT = ("CC6.1", "CC7.2", "CC7.3")  # Monitoring and logging
+_CC_NETWORK = ("CC6.1", "CC6.6")  # Network security
+
+# Ports whose exposure to the internet is penalized most heavily (SSH, RDP)
+_DANGEROUS_PORTS = frozenset({22, 3389})
+_DANGEROUS_PORT_LIST = sorted(_DANGEROUS_PORTS)
+_OPEN_CIDR = "0.0.0.0/0"
+
+# Security-relevant CloudTrail events collected when no event types are requested
+_SECURITY_EVENTS = (
+    "CreateUser",
+    "DeleteUser",
+    "AttachUserPolicy",
+    "DetachUserPolicy",
+    "CreateRole",
+    "DeleteRole",
+    "AttachRolePolicy",
+    "DetachRolePolicy",
+    "CreateAccessKey",
+    "DeleteAccessKey",
+    "UpdateAccessKey",
+    "ConsoleLogin",
+    "AssumeRole",
+    "CreateLoginProfile",
+    "DeleteLoginProfile",
+)
+
+# Fields every useful CloudTrail record should carry
+_REQUIRED_LOG_FIELDS = ("userIdentity", "sourceIPAddress", "eventTime", "eventSource")
+
+# C-level field accessors for name lists built in per-entity loops
+_user_name = itemgetter("UserName")
+_role_name = itemgetter("RoleName")
+_policy_name = itemgetter("PolicyName")
+
+# Entity types to request from get_account_authorization_details per IAM
+# evidence type; policy attachments need every entity type
+_IAM_DETAIL_FILTERS: Dict[Optional[str], List[str]] = {
+    None: ["User", "Group", "Role", "LocalManagedPolicy"],
+    "iam_policies": ["User", "Group", "Role", "LocalManagedPolicy"],
+    "iam_users": ["User"],
+    "iam_roles": ["Role"],
+}
+
+# Shared by every client: adaptive retries back off under IAM/STS throttling and
+# the pool is large enough for IAM_DETAIL_CONCURRENCY parallel requests
+_BOTO_CONFIG = Config(
+    retries={"mode": "adaptive", "max_attempts": 10},
+    max_pool_connections=50,
+    connect_timeout=5,
+    read_timeout=30,
+    tcp_keepalive=True,
+)
+
+# STS credentials shared across clients, keyed on (role_arn, external_id)
+_assumed_role_cache: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+# Sentinel returned by next() once a paginator is exhausted
+_PAGES_DONE = object()
+
+# Sentinel queued by _merge_streams when one of its sources is exhausted
+_STREAM_DONE = object()
+
+
+def _expires_soon(expires_at: Optional[datetime]) -> bool:
+    """Check whether credentials expire within the refresh buffer"""
+    if expires_at is None:
+        return True
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at - datetime.now(tz=timezone.utc) <= CREDENTIAL_REFRESH_BUFFER
+
+
+async def _run_sync(func, *args, **kwargs) -> Any:
+    """Run a blocking boto3 call in the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+
+async def _merge_streams(*streams: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Run several async iterators concurrently and yield their items as they arrive"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=IAM_PAGE_SIZE)
+
+    async def drain(stream: AsyncIterator[Any]) -> None:
+        try:
+            async for item in stream:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(_STREAM_DONE)
+
+    tasks = [asyncio.create_task(drain(stream)) for stream in streams]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """Format an optional datetime as ISO 8601"""
+    return value.isoformat() if value else None
+
+
+def _rule_dict(rule: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a security group permission into evidence form"""
+    return {
+        "ip_protocol": rule.get("IpProtocol"),
+        "from_port": rule.get("FromPort"),
+        "to_port": rule.get("ToPort"),
+        "ip_ranges": rule.get("IpRanges", []),
+        "ipv6_ranges": rule.get("Ipv6Ranges", []),
+        "user_id_group_pairs": rule.get("UserIdGroupPairs", []),
+        "prefix_list_ids": rule.get("PrefixListIds", []),
+    }
+
+
+def _security_group_quality_score(sg: Dict) -> float:
+    """Calculate quality score for security group"""
+    score = 1.0
+
+    # Check for overly permissive rules
+    for rule in sg.get("IpPermissions", []):
+        # Penalize rules open to the internet, remote access ports most of all
+        penalty = 0.5 if rule.get("FromPort") in _DANGEROUS_PORTS else 0.2
+        for ip_range in rule.get("IpRanges", []):
+            if ip_range.get("CidrIp") == _OPEN_CIDR:
+                score -= penalty
+                if score <= 0.0:
+                    return 0.0
+
+    # Check if security group has description
+    description = sg.get("Description")
+    if not description or description == sg.get("GroupName"):
+        score -= 0.1
+
+    return max(0.0, score)
+
+
+def score_security_groups_bulk(security_groups: Sequence[Dict]) -> List[float]:
+    """Calculate quality scores for many security groups at once
+
+    Open ingress rules are flattened into columns and penalized with vectorized
+    NumPy operations; without NumPy each group is scored individually.
+    """
+    if np is None:
+        return [_security_group_quality_score(sg) for sg in security_groups]
+
+    sg_indexes: List[int] = []
+    from_ports: List[int] = []
+    undescribed: List[bool] = []
+    for index, sg in enumerate(security_groups):
+        for rule in sg.get("IpPermissions", []):
+            from_port = rule.get("FromPort", -1)
+            for ip_range in rule.get("IpRanges", []):
+                if ip_range.get("CidrIp") == _OPEN_CIDR:
+                    sg_indexes.append(index)
+                    from_ports.append(from_port)
+
+        description = sg.get("Description")
+        undescribed.append(not description or description == sg.get("GroupName"))
+
+    penalties = np.where(
+        np.isin(np.array(from_ports, dtype=np.int64), _DANGEROUS_PORT_LIST), 0.5, 0.2
+    )
+    scores = 1.0 - np.bincount(
+        np.array(sg_indexes, dtype=np.int64), weights=penalties, minlength=len(security_groups)
+    )
+    scores -= 0.1 * np.array(undescribed, dtype=bool)
+
+    return np.clip(scores, 0.0, 1.0).tolist()
+
+
+def _is_wildcard(value: Any) -> bool:
+    """Check whether a policy Action/Resource value is or contains a bare wildcard"""
+    if isinstance(value, str):
+        return value == "*"
+    return isinstance(value, list) and "*" in value
+
+
+async def _async_paginate(paginator, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+    """Iterate boto3 paginator pages off the event loop, prefetching the next page"""
+    loop = asyncio.get_running_loop()
+    pages = iter(paginator.paginate(**kwargs))
+
+    next_page = loop.run_in_executor(None, next, pages, _PAGES_DONE)
+    while True:
+        page = await next_page
+        if page is _PAGES_DONE:
+            return
+        # Start fetching page N+1 while the caller works on page N
+        next_page = loop.run_in_executor(None, next, pages, _PAGES_DONE)
+        yield page
+
 
 class AWSAPIException(APIException):
     """AWS-specific API exception"""
@@ -34,6 +282,10 @@ class AWSAPIClient(BaseAPIClient):
         super().__init__(credentials)
         self.aws_session: Optional[boto3.Session] = None
         self.region = credentials.region or "us-east-1"
+        self._clients: Dict[str, Any] = {}
+        self._refresh_lock = asyncio.Lock()
+        self._caller_identity: Optional[Dict[str, Any]] = None
+        self._caller_identity_at = 0.0
 
     @property
     def provider_name(self) -> str:
@@ -42,9 +294,20 @@ class AWSAPIClient(BaseAPIClient):
     def get_base_url(self) -> str:
         return ""  # Not used for boto3
 
+    def get_client(self, service: str):
+        """Get a cached boto3 client for a service, creating it on first use"""
+        client = self._clients.get(service)
+        if client is None:
+            client = self.aws_session.client(service, config=_BOTO_CONFIG)
+            self._clients[service] = client
+        return client
+
     async def authenticate(self) -> bool:
         """Authenticate using AWS credentials (Access Key, Role Assumption, etc.)"""
         try:
+            # Clients are bound to the session they were created from
+            self._clients.clear()
+
             if self.credentials.auth_type == AuthType.API_KEY:
                 # Access key authentication
                 self.aws_session = boto3.Session(
@@ -54,21 +317,29 @@ class AWSAPIClient(BaseAPIClient):
                 )
 
             elif self.credentials.auth_type == AuthType.ROLE_ASSUMPTION:
-                # STS role assumption
-                sts_client = boto3.client("sts")
+                # STS role assumption, reusing unexpired credentials for the same role
+                role_arn = self.credentials.credentials["role_arn"]
+                external_id = self.credentials.credentials.get("external_id")
+                cache_key = (role_arn, external_id)
+
+                credentials = _assumed_role_cache.get(cache_key)
+                if credentials is None or _expires_soon(credentials.get("Expiration")):
+                    sts_client = await _run_sync(boto3.client, "sts", config=_BOTO_CONFIG)
 
-                assume_role_params = {
-                    "RoleArn": self.credentials.credentials["role_arn"],
-                    "RoleSessionName": "ruleiq-evidence-collection",
-                }
+                    assume_role_params = {
+                        "RoleArn": role_arn,
+                        "RoleSessionName": "ruleiq-evidence-collection",
+                    }
 
-                # Add external ID if provided
-                if "external_id" in self.credentials.credentials:
-                    assume_role_params["ExternalId"] = self.credentials.credentials["external_id"]
+                    # Add external ID if provided
+                    if external_id is not None:
+                        assume_role_params["ExternalId"] = external_id
 
-                response = sts_client.assume_role(**assume_role_params)
+                    response = await _run_sync(sts_client.assume_role, **assume_role_params)
+
+                    credentials = response["Credentials"]
+                    _assumed_role_cache[cache_key] = credentials
 
-                credentials = response["Credentials"]
                 self.aws_session = boto3.Session(
                     aws_access_key_id=credentials["AccessKeyId"],
                     aws_secret_access_key=credentials["SecretAccessKey"],
@@ -83,8 +354,10 @@ class AWSAPIClient(BaseAPIClient):
                 raise AWSAPIException(f"Unsupported AWS auth type: {self.credentials.auth_type}")
 
             # Test authentication by getting caller identity
-            sts = self.aws_session.client("sts")
-            caller_identity = sts.get_caller_identity()
+            sts = self.get_client("sts")
+            caller_identity = await _run_sync(sts.get_caller_identity)
+            self._caller_identity = caller_identity
+            self._caller_identity_at = time.monotonic()
 
             logger.info(
                 f"AWS authentication successful for account: {caller_identity.get('Account')}"
@@ -99,48 +372,22 @@ class AWSAPIClient(BaseAPIClient):
             return False
 
     async def refresh_credentials(self) -> bool:
-        """Refresh AWS credentials if using role assumption"""
-        if self.credentials.auth_type == AuthType.ROLE_ASSUMPTION:
+        """Refresh AWS credentials if using role assumption and they are about to expire"""
+        if self.credentials.auth_type != AuthType.ROLE_ASSUMPTION:
+            return True
+
+        # Concurrent collectors wait on the same refresh instead of each calling STS
+        async with self._refresh_lock:
+            if self.aws_session and not _expires_soon(self.credentials.expires_at):
+                return True
             return await self.authenticate()
-        return True
 
     def get_evidence_collector(self, evidence_type: str):
         """Get AWS evidence collector for specific evidence type"""
         if not self.aws_session:
             return None
 
-        collectors = {
-            "iam_policies": AWSIAMEvidenceCollector(self),
-            "iam_users": AWSIAMEvidenceCollector(self),
-            "iam_roles": AWSIAMEvidenceCollector(self),
-            "security_groups": AWSSecurityGroupCollector(self),
-            "vpc_configuration": AWSVPCCollector(self),
-            "cloudtrail_logs": AWSCloudTrailCollector(self),
-            "config_rules": AWSConfigCollector(self),
-            "guardduty_findings": AWSGuardDutyCollector(self),
-            "inspector_findings": AWSInspectorCollector(self),
-            "compliance_reports": AWSComplianceCollector(self),
-            "s3_buckets": AWSS3Collector(self),
-            "ec2_instances": AWSEC2Collector(self),
-        }
-        return collectors.get(evidence_type)
-
-    def get_supported_evidence_types(self) -> List[str]:
-        """Get list of supported evidence types for AWS"""
-        return [
-            "iam_policies",
-            "iam_users",
-            "iam_roles",
-            "security_groups",
-            "vpc_configuration",
-            "cloudtrail_logs",
-            "config_rules",
-            "guardduty_findings",
-            "inspector_findings",
-            "compliance_reports",
-            "s3_buckets",
-            "ec2_instances",
-        ]
+        return super().get_evidence_collector(evidence_type)
 
     def get_health_endpoint(self) -> str:
         return "/health"  # Custom health check method
@@ -151,13 +398,18 @@ class AWSAPIClient(BaseAPIClient):
             if not await self.ensure_authenticated():
                 raise AWSAPIException("Authentication failed")
 
-            start_time = datetime.utcnow()
+            start_time = time.monotonic()
 
-            # Use STS get_caller_identity as health check
-            sts = self.aws_session.client("sts")
-            caller_identity = sts.get_caller_identity()
+            # Use STS get_caller_identity as health check, reusing a recent result
+            caller_identity = self._caller_identity
+            identity_age = start_time - self._caller_identity_at
+            if caller_identity is None or identity_age > CALLER_IDENTITY_TTL:
+                sts = self.get_client("sts")
+                caller_identity = await _run_sync(sts.get_caller_identity)
+                self._caller_identity = caller_identity
+                self._caller_identity_at = time.monotonic()
 
-            response_time = (datetime.utcnow() - start_time).total_seconds()
+            response_time = time.monotonic() - start_time
 
             return {
                 "status": "healthy",
@@ -180,254 +432,316 @@ class AWSAPIClient(BaseAPIClient):
             }
 
 
-class AWSIAMEvidenceCollector(BaseEvidenceCollector):
+@AWSAPIClient.register_collector("iam_roles", evidence_subtype="iam_roles")
+@AWSAPIClient.register_collector("iam_users", evidence_subtype="iam_users")
+@AWSAPIClient.register_collector("iam_policies", evidence_subtype="iam_policies")
+class AWSIAMEvidenceCollector(StreamingEvidenceCollector):
     """Collect IAM-related evidence from AWS"""
 
-    async def collect(self, **kwargs) -> List[EvidenceItem]:
-        """Collect IAM policies, users, roles, and access patterns"""
-        evidence = []
+    def __init__(self, api_client, evidence_subtype: Optional[str] = None):
+        super().__init__(api_client)
+        # One of iam_policies/iam_users/iam_roles, or None to collect all three
+        self.evidence_subtype = evidence_subtype
+
+    async def stream(self, **kwargs) -> AsyncIterator[EvidenceItem]:
+        """Stream IAM policies, users, roles, and access patterns"""
+        subtype = self.evidence_subtype
 
         try:
-            iam = self.api_client.aws_session.client("iam")
+            iam = self.api_client.get_client("iam")
+
+            # One bulk call returns policy documents and attachments for every entity
+            details = await self._get_authorization_details(
+                iam, _IAM_DETAIL_FILTERS.get(subtype, _IAM_DETAIL_FILTERS[None])
+            )
 
             # Collect IAM policies
-            evidence.extend(await self._collect_iam_policies(iam))
+            if subtype in (None, "iam_policies"):
+                for item in self._collect_iam_policies(details):
+                    yield item
 
-            # Collect IAM users
-            evidence.extend(await self._collect_iam_users(iam))
+            # Collect IAM users and roles concurrently, they share no API calls
+            streams = []
+            if subtype in (None, "iam_users"):
+                streams.append(self._collect_iam_users(iam, details))
+            if subtype in (None, "iam_roles"):
+                streams.append(self._collect_iam_roles(iam, details))
 
-            # Collect IAM roles
-            evidence.extend(await self._collect_iam_roles(iam))
+            async for item in _merge_streams(*streams):
+                yield item
 
         except ClientError as e:
             self.logger.error(f"Error collecting IAM evidence: {e}")
             raise AWSAPIException(f"Failed to collect IAM evidence: {e}")
 
-        return evidence
+    async def _get_authorization_details(
+        self, iam_client, entity_filter: List[str]
+    ) -> Dict[str, List[Dict]]:
+        """Fetch users, groups, roles and local managed policies in bulk"""
+        details = {"users": [], "groups": [], "roles": [], "policies": []}
+
+        paginator = iam_client.get_paginator("get_account_authorization_details")
+        async for page in _async_paginate(
+            paginator,
+            Filter=entity_filter,
+            PaginationConfig={"PageSize": IAM_PAGE_SIZE},
+        ):
+            details["users"].extend(page.get("UserDetailList", []))
+            details["groups"].extend(page.get("GroupDetailList", []))
+            details["roles"].extend(page.get("RoleDetailList", []))
+            details["policies"].extend(page.get("Policies", []))
+
+        return details
+
+    async def _fetch_details(
+        self, build, iam_client, entities: List[Dict], name_key: str, label: str
+    ) -> List[EvidenceItem]:
+        """Run a blocking per-entity detail builder for a page of entities concurrently"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(IAM_DETAIL_CONCURRENCY)
 
-    async def _collect_iam_policies(self, iam_client) -> List[EvidenceItem]:
-        """Collect IAM policies"""
-        evidence = []
+        async def fetch_one(entity: Dict) -> EvidenceItem:
+            async with semaphore:
+                return await loop.run_in_executor(None, build, iam_client, entity)
 
-        try:
-            # Get custom policies only (exclude AWS managed policies for now)
-            policies_paginator = iam_client.get_paginator("list_policies")
-
-            for page in policies_paginator.paginate(Scope="Local"):
-                for policy in page["Policies"]:
-                    try:
-                        # Get the policy document
-                        policy_version = iam_client.get_policy_version(
-                            PolicyArn=policy["Arn"], VersionId=policy["DefaultVersionId"]
-                        )
-
-                        # Get entities attached to this policy
-                        entities = iam_client.list_entities_for_policy(PolicyArn=policy["Arn"])
-
-                        evidence_item = self.create_evidence_item(
-                            evidence_type="iam_policy",
-                            resource_id=policy["Arn"],
-                            resource_name=policy["PolicyName"],
-                            data={
-                                "policy_name": policy["PolicyName"],
-                                "policy_id": policy["PolicyId"],
-                                "arn": policy["Arn"],
-                                "path": policy["Path"],
-                                "policy_document": policy_version["PolicyVersion"]["Document"],
-                                "default_version_id": policy["DefaultVersionId"],
-                                "attachment_count": policy["AttachmentCount"],
-                                "permissions_boundary_usage_count": policy.get(
-                                    "PermissionsBoundaryUsageCount", 0
-                                ),
-                                "is_attachable": policy["IsAttachable"],
-                                "description": policy.get("Description", ""),
-                                "create_date": policy["CreateDate"].isoformat(),
-                                "update_date": policy["UpdateDate"].isoformat(),
-                                "attached_users": [
-                                    user["UserName"] for user in entities.get("PolicyUsers", [])
-                                ],
-                                "attached_groups": [
-                                    group["GroupName"] for group in entities.get("PolicyGroups", [])
-                                ],
-                                "attached_roles": [
-                                    role["RoleName"] for role in entities.get("PolicyRoles", [])
-                                ],
-                            },
-                            compliance_controls=[
-                                "CC6.1",
-                                "CC6.2",
-                                "CC6.3",
-                            ],  # SOC 2 Logical Access controls
-                            quality_score=self._calculate_policy_quality_score(
-                                policy, policy_version["PolicyVersion"]["Document"]
-                            ),
-                        )
-
-                        evidence.append(evidence_item)
-
-                    except ClientError as e:
-                        self.logger.warning(
-                            f"Failed to get details for policy {policy['PolicyName']}: {e}"
-                        )
-                        continue
+        results = await asyncio.gather(
+            *(fetch_one(entity) for entity in entities), return_exceptions=True
+        )
 
-        except ClientError as e:
-            self.logger.error(f"Error collecting IAM policies: {e}")
+        evidence = []
+        for entity, result in zip(entities, results):
+            if isinstance(result, ClientError):
+                self.logger.warning(
+                    f"Failed to get details for {label} {entity[name_key]}: {result}"
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                evidence.append(result)
 
         return evidence
 
-    async def _collect_iam_users(self, iam_client) -> List[EvidenceItem]:
+    def _collect_iam_policies(self, details: Dict[str, List[Dict]]) -> Iterator[EvidenceItem]:
+        """Collect IAM policies (custom policies only, AWS managed policies are excluded)"""
+        collected_at = datetime.utcnow()
+
+        # Invert the per-entity attachments into per-policy attachment lists
+        attachments: Dict[str, Dict[str, List[str]]] = {}
+        entity_names = (("users", "UserName"), ("groups", "GroupName"), ("roles", "RoleName"))
+        for key, name_key in entity_names:
+            for entity in details[key]:
+                for attached in entity.get("AttachedManagedPolicies", []):
+                    policy_attachments = attachments.setdefault(
+                        attached["PolicyArn"], {"users": [], "groups": [], "roles": []}
+                    )
+                    policy_attachments[key].append(entity[name_key])
+
+        for policy in details["policies"]:
+            policy_document = next(
+                (
+                    version["Document"]
+                    for version in policy.get("PolicyVersionList", [])
+                    if version.get("IsDefaultVersion")
+                ),
+                None,
+            )
+            attached = attachments.get(policy["Arn"], {})
+
+            yield self.create_evidence_item(
+                evidence_type="iam_policy",
+                resource_id=policy["Arn"],
+                resource_name=policy["PolicyName"],
+                data={
+                    "policy_name": policy["PolicyName"],
+                    "policy_id": policy["PolicyId"],
+                    "arn": policy["Arn"],
+                    "path": policy["Path"],
+                    "policy_document": policy_document,
+                    "default_version_id": policy["DefaultVersionId"],
+                    "attachment_count": policy["AttachmentCount"],
+                    "permissions_boundary_usage_count": policy.get(
+                        "PermissionsBoundaryUsageCount", 0
+                    ),
+                    "is_attachable": policy["IsAttachable"],
+                    "description": policy.get("Description", ""),
+                    "create_date": policy["CreateDate"].isoformat(),
+                    "update_date": policy["UpdateDate"].isoformat(),
+                    "attached_users": attached.get("users", []),
+                    "attached_groups": attached.get("groups", []),
+                    "attached_roles": attached.get("roles", []),
+                },
+                compliance_controls=_CC_IAM_POLICY,
+                quality_score=self._calculate_policy_quality_score(policy, policy_document),
+                collection_timestamp=collected_at,
+            )
+
+    async def _collect_iam_users(
+        self, iam_client, details: Dict[str, List[Dict]]
+    ) -> AsyncIterator[EvidenceItem]:
         """Collect IAM users"""
-        evidence = []
+        user_details = dict(zip(map(_user_name, details["users"]), details["users"]))
+        build = partial(
+            self._build_user_evidence,
+            console_access=await self._get_console_access(iam_client),
+            now=datetime.utcnow(),
+        )
 
         try:
+            # list_users still supplies PasswordLastUsed, which authorization details omit
             users_paginator = iam_client.get_paginator("list_users")
 
-            for page in users_paginator.paginate():
-                for user in page["Users"]:
-                    try:
-                        # Get user policies and groups
-                        user_policies = iam_client.list_attached_user_policies(
-                            UserName=user["UserName"]
-                        )
-                        user_groups = iam_client.get_groups_for_user(UserName=user["UserName"])
-
-                        # Get access keys
-                        access_keys = iam_client.list_access_keys(UserName=user["UserName"])
-
-                        # Get MFA devices
-                        mfa_devices = iam_client.list_mfa_devices(UserName=user["UserName"])
-
-                        # Get login profile (console access)
-                        has_console_access = False
-                        try:
-                            iam_client.get_login_profile(UserName=user["UserName"])
-                            has_console_access = True
-                        except ClientError:
-                            pass  # No console access
-
-                        evidence_item = self.create_evidence_item(
-                            evidence_type="iam_user",
-                            resource_id=user["Arn"],
-                            resource_name=user["UserName"],
-                            data={
-                                "user_name": user["UserName"],
-                                "user_id": user["UserId"],
-                                "arn": user["Arn"],
-                                "path": user["Path"],
-                                "create_date": user["CreateDate"].isoformat(),
-                                "password_last_used": user.get("PasswordLastUsed", "").isoformat()
-                                if user.get("PasswordLastUsed")
-                                else None,
-                                "has_console_access": has_console_access,
-                                "attached_policies": [
-                                    policy["PolicyName"]
-                                    for policy in user_policies["AttachedPolicies"]
-                                ],
-                                "groups": [group["GroupName"] for group in user_groups["Groups"]],
-                                "access_keys": [
-                                    {
-                                        "access_key_id": key["AccessKeyId"],
-                                        "status": key["Status"],
-                                        "create_date": key["CreateDate"].isoformat(),
-                                    }
-                                    for key in access_keys["AccessKeyMetadata"]
-                                ],
-                                "mfa_devices": [
-                                    {
-                                        "serial_number": device["SerialNumber"],
-                                        "enable_date": device["EnableDate"].isoformat(),
-                                    }
-                                    for device in mfa_devices["MFADevices"]
-                                ],
-                                "tags": user.get("Tags", []),
-                            },
-                            compliance_controls=[
-                                "CC6.1",
-                                "CC6.2",
-                                "CC6.7",
-                            ],  # SOC 2 user access controls
-                            quality_score=self._calculate_user_quality_score(
-                                user, mfa_devices["MFADevices"], access_keys["AccessKeyMetadata"]
-                            ),
-                        )
-
-                        evidence.append(evidence_item)
-
-                    except ClientError as e:
-                        self.logger.warning(
-                            f"Failed to get details for user {user['UserName']}: {e}"
-                        )
-                        continue
+            async for page in _async_paginate(
+                users_paginator, PaginationConfig={"PageSize": IAM_PAGE_SIZE}
+            ):
+                users = [
+                    {**user_details.get(user["UserName"], {}), **user} for user in page["Users"]
+                ]
+                for item in await self._fetch_details(build, iam_client, users, "UserName", "user"):
+                    yield item
 
         except ClientError as e:
             self.logger.error(f"Error collecting IAM users: {e}")
 
-        return evidence
+    async def _get_console_access(self, iam_client) -> Optional[Dict[str, bool]]:
+        """Map user names to console access from the IAM credential report
 
-    async def _collect_iam_roles(self, iam_client) -> List[EvidenceItem]:
+        Returns None if the report cannot be generated or read, in which case
+        console access is probed per user instead.
+        """
+        try:
+            for _ in range(CREDENTIAL_REPORT_ATTEMPTS):
+                response = await _run_sync(iam_client.generate_credential_report)
+                if response["State"] == "COMPLETE":
+                    break
+                await asyncio.sleep(CREDENTIAL_REPORT_POLL_INTERVAL)
+            else:
+                self.logger.warning("IAM credential report was not ready in time")
+                return None
+
+            content = (await _run_sync(iam_client.get_credential_report))["Content"]
+        except ClientError as e:
+            self.logger.warning(f"Error getting IAM credential report: {e}")
+            return None
+
+        return {
+            row["user"]: row["password_enabled"] == "true"
+            for row in csv.DictReader(io.StringIO(content.decode()))
+        }
+
+    def _build_user_evidence(
+        self,
+        iam_client,
+        user: Dict,
+        console_access: Optional[Dict[str, bool]] = None,
+        now: Optional[datetime] = None,
+    ) -> EvidenceItem:
+        """Fetch credential details for a user and build its evidence item (blocking)"""
+        user_name = user["UserName"]
+
+        # Get access keys
+        access_keys = iam_client.list_access_keys(UserName=user_name)["AccessKeyMetadata"]
+
+        # Get MFA devices
+        mfa_devices = iam_client.list_mfa_devices(UserName=user_name)["MFADevices"]
+
+        # Console access comes from the credential report when it is available
+        if console_access is not None:
+            has_console_access = console_access.get(user_name, False)
+        else:
+            has_console_access = False
+            try:
+                iam_client.get_login_profile(UserName=user_name)
+                has_console_access = True
+            except ClientError:
+                pass  # No console access
+
+        return self.create_evidence_item(
+            evidence_type="iam_user",
+            resource_id=user["Arn"],
+            resource_name=user_name,
+            data={
+                "user_name": user_name,
+                "user_id": user["UserId"],
+                "arn": user["Arn"],
+                "path": user["Path"],
+                "create_date": user["CreateDate"].isoformat(),
+                "password_last_used": _iso(user.get("PasswordLastUsed")),
+                "has_console_access": has_console_access,
+                "attached_policies": list(
+                    map(_policy_name, user.get("AttachedManagedPolicies", ()))
+                ),
+                "groups": user.get("GroupList", []),
+                "access_keys": [
+                    {
+                        "access_key_id": key["AccessKeyId"],
+                        "status": key["Status"],
+                        "create_date": key["CreateDate"].isoformat(),
+                    }
+                    for key in access_keys
+                ],
+                "mfa_devices": [
+                    {
+                        "serial_number": device["SerialNumber"],
+                        "enable_date": device["EnableDate"].isoformat(),
+                    }
+                    for device in mfa_devices
+                ],
+                "tags": user.get("Tags", []),
+            },
+            compliance_controls=_CC_IAM_USER,
+            quality_score=self._calculate_user_quality_score(
+                user, mfa_devices, access_keys, now or datetime.utcnow()
+            ),
+        )
+
+    async def _collect_iam_roles(
+        self, iam_client, details: Dict[str, List[Dict]]
+    ) -> AsyncIterator[EvidenceItem]:
         """Collect IAM roles"""
-        evidence = []
+        role_details = dict(zip(map(_role_name, details["roles"]), details["roles"]))
 
         try:
+            # list_roles still supplies Description and MaxSessionDuration
             roles_paginator = iam_client.get_paginator("list_roles")
 
-            for page in roles_paginator.paginate():
+            async for page in _async_paginate(
+                roles_paginator, PaginationConfig={"PageSize": IAM_PAGE_SIZE}
+            ):
                 for role in page["Roles"]:
-                    try:
-                        # Get role policies
-                        role_policies = iam_client.list_attached_role_policies(
-                            RoleName=role["RoleName"]
-                        )
-
-                        # Get inline policies
-                        inline_policies = iam_client.list_role_policies(RoleName=role["RoleName"])
-
-                        evidence_item = self.create_evidence_item(
-                            evidence_type="iam_role",
-                            resource_id=role["Arn"],
-                            resource_name=role["RoleName"],
-                            data={
-                                "role_name": role["RoleName"],
-                                "role_id": role["RoleId"],
-                                "arn": role["Arn"],
-                                "path": role["Path"],
-                                "assume_role_policy_document": role["AssumeRolePolicyDocument"],
-                                "description": role.get("Description", ""),
-                                "max_session_duration": role.get("MaxSessionDuration", 3600),
-                                "create_date": role["CreateDate"].isoformat(),
-                                "last_used": role.get("RoleLastUsed", {})
-                                .get("LastUsedDate", "")
-                                .isoformat()
-                                if role.get("RoleLastUsed", {}).get("LastUsedDate")
-                                else None,
-                                "last_used_region": role.get("RoleLastUsed", {}).get("Region"),
-                                "attached_policies": [
-                                    policy["PolicyName"]
-                                    for policy in role_policies["AttachedPolicies"]
-                                ],
-                                "inline_policies": inline_policies["PolicyNames"],
-                                "tags": role.get("Tags", []),
-                            },
-                            compliance_controls=[
-                                "CC6.1",
-                                "CC6.3",
-                            ],  # SOC 2 role-based access controls
-                            quality_score=self._calculate_role_quality_score(role),
-                        )
-
-                        evidence.append(evidence_item)
-
-                    except ClientError as e:
-                        self.logger.warning(
-                            f"Failed to get details for role {role['RoleName']}: {e}"
-                        )
-                        continue
+                    role = {**role_details.get(role["RoleName"], {}), **role}
+                    yield self._build_role_evidence(role)
 
         except ClientError as e:
             self.logger.error(f"Error collecting IAM roles: {e}")
 
-        return evidence
+    def _build_role_evidence(self, role: Dict) -> EvidenceItem:
+        """Build the evidence item for a role"""
+        role_last_used = role.get("RoleLastUsed") or {}
+
+        return self.create_evidence_item(
+            evidence_type="iam_role",
+            resource_id=role["Arn"],
+            resource_name=role["RoleName"],
+            data={
+                "role_name": role["RoleName"],
+                "role_id": role["RoleId"],
+                "arn": role["Arn"],
+                "path": role["Path"],
+                "assume_role_policy_document": role["AssumeRolePolicyDocument"],
+                "description": role.get("Description", ""),
+                "max_session_duration": role.get("MaxSessionDuration", 3600),
+                "create_date": role["CreateDate"].isoformat(),
+                "last_used": _iso(role_last_used.get("LastUsedDate")),
+                "last_used_region": role_last_used.get("Region"),
+                "attached_policies": list(
+                    map(_policy_name, role.get("AttachedManagedPolicies", ()))
+                ),
+                "inline_policies": list(map(_policy_name, role.get("RolePolicyList", ()))),
+                "tags": role.get("Tags", []),
+            },
+            compliance_controls=_CC_IAM_ROLE,
+            quality_score=self._calculate_role_quality_score(role),
+        )
 
     def _calculate_policy_quality_score(self, policy: Dict, policy_document: Any) -> float:
         """Calculate quality score for IAM policy"""
@@ -438,36 +752,31 @@ class AWSIAMEvidenceCollector(BaseEvidenceCollector):
             score -= 0.1
 
         # Check if policy document follows least privilege
-        if isinstance(policy_document, dict):
-            statements = policy_document.get("Statement", [])
-            if isinstance(statements, dict):
-                statements = [statements]
-
-            for statement in statements:
-                # Check for overly broad permissions
-                if statement.get("Effect") == "Allow":
-                    actions = statement.get("Action", [])
-                    if isinstance(actions, str):
-                        actions = [actions]
-
-                    # Penalize wildcard actions
-                    if "*" in actions:
-                        score -= 0.3
-
-                    # Check for overly broad resources
-                    resources = statement.get("Resource", [])
-                    if isinstance(resources, str):
-                        resources = [resources]
-
-                    if "*" in resources and "*" in actions:
-                        score -= 0.4  # Very dangerous combination
+        if not isinstance(policy_document, dict):
+            return score
+
+        statements = policy_document.get("Statement", ())
+        if isinstance(statements, dict):
+            statements = (statements,)
+
+        for statement in statements:
+            # Only Allow statements with wildcard actions are penalized
+            if statement.get("Effect") != "Allow" or not _is_wildcard(statement.get("Action")):
+                continue
+
+            score -= 0.3
+            if _is_wildcard(statement.get("Resource")):
+                score -= 0.4  # Very dangerous combination
+
+            if score <= 0.0:
+                return 0.0
 
         return max(0.0, score)
 
     def _calculate_user_quality_score(
-        self, user: Dict, mfa_devices: List, access_keys: List
+        self, user: Dict, mfa_devices: List, access_keys: List, now: datetime
     ) -> float:
-        """Calculate quality score for IAM user"""
+        """Calculate quality score for IAM user, with key and login ages measured at now"""
         score = 1.0
 
         # Check if user has MFA enabled
@@ -476,14 +785,14 @@ class AWSIAMEvidenceCollector(BaseEvidenceCollector):
 
         # Check for old access keys
         for key in access_keys:
-            key_age = (datetime.utcnow() - key["CreateDate"].replace(tzinfo=None)).days
+            key_age = (now - key["CreateDate"].replace(tzinfo=None)).days
             if key_age > 90:  # Keys older than 90 days
                 score -= 0.2
 
         # Check if user has used password recently (if they have console access)
         if user.get("PasswordLastUsed"):
             last_used = user["PasswordLastUsed"].replace(tzinfo=None)
-            days_since_login = (datetime.utcnow() - last_used).days
+            days_since_login = (now - last_used).days
             if days_since_login > 90:  # Inactive user
                 score -= 0.2
 
@@ -498,36 +807,41 @@ class AWSIAMEvidenceCollector(BaseEvidenceCollector):
             score -= 0.1
 
         # Check assume role policy for security
-        assume_policy = role.get("AssumeRolePolicyDocument", {})
-        if isinstance(assume_policy, dict):
-            statements = assume_policy.get("Statement", [])
-            if isinstance(statements, dict):
-                statements = [statements]
-
-            for statement in statements:
-                principal = statement.get("Principal", {})
-                if principal == "*" or (
-                    isinstance(principal, dict) and principal.get("AWS") == "*"
-                ):
-                    score -= 0.5  # Very dangerous - allows any AWS account to assume
+        assume_policy = role.get("AssumeRolePolicyDocument")
+        if not isinstance(assume_policy, dict):
+            return score
+
+        statements = assume_policy.get("Statement", ())
+        if isinstance(statements, dict):
+            statements = (statements,)
+
+        for statement in statements:
+            principal = statement.get("Principal")
+            if principal == "*" or (isinstance(principal, dict) and principal.get("AWS") == "*"):
+                score -= 0.5  # Very dangerous - allows any AWS account to assume
+                if score <= 0.0:
+                    return 0.0
 
         return max(0.0, score)
 
 
-class AWSCloudTrailCollector(BaseEvidenceCollector):
+@AWSAPIClient.register_collector("cloudtrail_logs")
+class AWSCloudTrailCollector(StreamingEvidenceCollector):
     """Collect CloudTrail audit logs for compliance evidence"""
 
-    async def collect(
-        self, start_time: datetime = None, event_types: List[str] = None, **kwargs
-    ) -> List[EvidenceItem]:
-        """Collect CloudTrail events for audit evidence"""
+    async def stream(
+        self,
+        start_time: datetime = None,
+        event_types: List[str] = None,
+        max_events: int = CLOUDTRAIL_MAX_EVENTS,
+        **kwargs,
+    ) -> AsyncIterator[EvidenceItem]:
+        """Stream CloudTrail events for audit evidence"""
         if not start_time:
             start_time = datetime.utcnow() - timedelta(days=7)  # Last 7 days by default
 
-        evidence = []
-
         try:
-            cloudtrail = self.api_client.aws_session.client("cloudtrail")
+            cloudtrail = self.api_client.get_client("cloudtrail")
 
             # Configure lookup attributes for event filtering
             lookup_attributes = []
@@ -538,95 +852,104 @@ class AWSCloudTrailCollector(BaseEvidenceCollector):
                     )
             else:
                 # Default to security-relevant events
-                security_events = [
-                    "CreateUser",
-                    "DeleteUser",
-                    "AttachUserPolicy",
-                    "DetachUserPolicy",
-                    "CreateRole",
-                    "DeleteRole",
-                    "AttachRolePolicy",
-                    "DetachRolePolicy",
-                    "CreateAccessKey",
-                    "DeleteAccessKey",
-                    "UpdateAccessKey",
-                    "ConsoleLogin",
-                    "AssumeRole",
-                    "CreateLoginProfile",
-                    "DeleteLoginProfile",
-                ]
-
-                for event in security_events:
+                for event in _SECURITY_EVENTS:
                     lookup_attributes.append({"AttributeKey": "EventName", "AttributeValue": event})
 
             # Collect events (CloudTrail lookup_events has limitations, so we'll collect in batches)
-            for lookup_attr in lookup_attributes[:5]:  # Limit to avoid API limits
+            end_time = datetime.utcnow()
+            loop = asyncio.get_running_loop()
+
+            async def lookup(lookup_attr: Dict) -> List[EvidenceItem]:
                 try:
-                    response = cloudtrail.lookup_events(
-                        LookupAttributes=[lookup_attr],
-                        StartTime=start_time,
-                        EndTime=datetime.utcnow(),
-                        MaxItems=100,  # Limit per event type
+                    return await loop.run_in_executor(
+                        None,
+                        self._lookup_events,
+                        cloudtrail,
+                        lookup_attr,
+                        start_time,
+                        end_time,
+                        max_events,
                     )
-
-                    for event in response["Events"]:
-                        # Parse CloudTrail event
-                        event_detail = json.loads(event.get("CloudTrailEvent", "{}"))
-
-                        evidence_item = self.create_evidence_item(
-                            evidence_type="audit_log",
-                            resource_id=event["EventId"],
-                            resource_name=event["EventName"],
-                            data={
-                                "event_id": event["EventId"],
-                                "event_name": event["EventName"],
-                                "event_time": event["EventTime"].isoformat(),
-                                "username": event.get("Username"),
-                                "user_identity": event_detail.get("userIdentity", {}),
-                                "source_ip_address": event_detail.get("sourceIPAddress"),
-                                "user_agent": event_detail.get("userAgent"),
-                                "aws_region": event_detail.get("awsRegion"),
-                                "event_source": event_detail.get("eventSource"),
-                                "event_type": event_detail.get("eventType"),
-                                "api_version": event_detail.get("apiVersion"),
-                                "request_parameters": event_detail.get("requestParameters", {}),
-                                "response_elements": event_detail.get("responseElements", {}),
-                                "resources": event.get("Resources", []),
-                                "error_code": event_detail.get("errorCode"),
-                                "error_message": event_detail.get("errorMessage"),
-                            },
-                            compliance_controls=[
-                                "CC6.1",
-                                "CC7.2",
-                                "CC7.3",
-                            ],  # SOC 2 monitoring and logging
-                            quality_score=self._calculate_log_quality_score(event_detail),
-                        )
-
-                        evidence.append(evidence_item)
-
                 except ClientError as e:
                     self.logger.warning(
                         f"Failed to collect events for {lookup_attr['AttributeValue']}: {e}"
                     )
-                    continue
+                    return []
+
+            # Yield each event type's evidence as soon as its lookup finishes
+            lookups = [lookup(attr) for attr in lookup_attributes[:5]]  # Limit to avoid API limits
+            for finished in asyncio.as_completed(lookups):
+                for item in await finished:
+                    yield item
 
         except ClientError as e:
             self.logger.error(f"Error collecting CloudTrail evidence: {e}")
             raise AWSAPIException(f"Failed to collect CloudTrail evidence: {e}")
 
+    def _lookup_events(
+        self,
+        cloudtrail,
+        lookup_attr: Dict,
+        start_time: datetime,
+        end_time: datetime,
+        max_events: int,
+    ) -> List[EvidenceItem]:
+        """Look up events for a single attribute and build evidence items (blocking)"""
+        evidence = []
+
+        events_paginator = cloudtrail.get_paginator("lookup_events")
+        pages = events_paginator.paginate(
+            LookupAttributes=[lookup_attr],
+            StartTime=start_time,
+            EndTime=end_time,
+            PaginationConfig={"PageSize": CLOUDTRAIL_PAGE_SIZE, "MaxItems": max_events},
+        )
+
+        for page in pages:
+            for event in page["Events"]:
+                # Parse CloudTrail event
+                event_detail = _json_loads(event.get("CloudTrailEvent") or "{}")
+
+                evidence_item = self.create_evidence_item(
+                    evidence_type="audit_log",
+                    resource_id=event["EventId"],
+                    resource_name=event["EventName"],
+                    data={
+                        "event_id": event["EventId"],
+                        "event_name": event["EventName"],
+                        "event_time": event["EventTime"].isoformat(),
+                        "username": event.get("Username"),
+                        "user_identity": event_detail.get("userIdentity", {}),
+                        "source_ip_address": event_detail.get("sourceIPAddress"),
+                        "user_agent": event_detail.get("userAgent"),
+                        "aws_region": event_detail.get("awsRegion"),
+                        "event_source": event_detail.get("eventSource"),
+                        "event_type": event_detail.get("eventType"),
+                        "api_version": event_detail.get("apiVersion"),
+                        "request_parameters": event_detail.get("requestParameters", {}),
+                        "response_elements": event_detail.get("responseElements", {}),
+                        "resources": event.get("Resources", []),
+                        "error_code": event_detail.get("errorCode"),
+                        "error_message": event_detail.get("errorMessage"),
+                    },
+                    compliance_controls=_CC_AUDIT,
+                    quality_score=self._calculate_log_quality_score(event_detail),
+                    collection_timestamp=end_time,
+                )
+
+                evidence.append(evidence_item)
+
         return evidence
 
     def _calculate_log_quality_score(self, event_detail: Dict) -> float:
         """Calculate quality score for audit log entry"""
         score = 1.0
 
-        # Check if essential fields are present
-        required_fields = ["userIdentity", "sourceIPAddress", "eventTime", "eventSource"]
-        missing_fields = [field for field in required_fields if not event_detail.get(field)]
+        # Check if essential fields are present (empty values count as missing)
+        missing_count = sum(1 for field in _REQUIRED_LOG_FIELDS if not event_detail.get(field))
 
-        if missing_fields:
-            score -= 0.2 * len(missing_fields)
+        if missing_count:
+            score -= 0.2 * missing_count
 
         # Check if it's an error event
         if event_detail.get("errorCode"):
@@ -635,126 +958,101 @@ class AWSCloudTrailCollector(BaseEvidenceCollector):
         return max(0.0, score)
 
 
-class AWSSecurityGroupCollector(BaseEvidenceCollector):
+@AWSAPIClient.register_collector("security_groups")
+class AWSSecurityGroupCollector(StreamingEvidenceCollector):
     """Collect Security Group configurations for network security evidence"""
 
-    async def collect(self, **kwargs) -> List[EvidenceItem]:
-        """Collect security group configurations"""
-        evidence = []
-
+    async def stream(self, **kwargs) -> AsyncIterator[EvidenceItem]:
+        """Stream security group configurations"""
         try:
-            ec2 = self.api_client.aws_session.client("ec2")
-
-            # Get all security groups
-            response = ec2.describe_security_groups()
-
-            for sg in response["SecurityGroups"]:
-                evidence_item = self.create_evidence_item(
-                    evidence_type="security_group",
-                    resource_id=sg["GroupId"],
-                    resource_name=sg["GroupName"],
-                    data={
-                        "group_id": sg["GroupId"],
-                        "group_name": sg["GroupName"],
-                        "description": sg["Description"],
-                        "vpc_id": sg.get("VpcId"),
-                        "owner_id": sg["OwnerId"],
-                        "inbound_rules": [
-                            {
-                                "ip_protocol": rule.get("IpProtocol"),
-                                "from_port": rule.get("FromPort"),
-                                "to_port": rule.get("ToPort"),
-                                "ip_ranges": rule.get("IpRanges", []),
-                                "ipv6_ranges": rule.get("Ipv6Ranges", []),
-                                "user_id_group_pairs": rule.get("UserIdGroupPairs", []),
-                                "prefix_list_ids": rule.get("PrefixListIds", []),
-                            }
-                            for rule in sg.get("IpPermissions", [])
-                        ],
-                        "outbound_rules": [
-                            {
-                                "ip_protocol": rule.get("IpProtocol"),
-                                "from_port": rule.get("FromPort"),
-                                "to_port": rule.get("ToPort"),
-                                "ip_ranges": rule.get("IpRanges", []),
-                                "ipv6_ranges": rule.get("Ipv6Ranges", []),
-                                "user_id_group_pairs": rule.get("UserIdGroupPairs", []),
-                                "prefix_list_ids": rule.get("PrefixListIds", []),
-                            }
-                            for rule in sg.get("IpPermissionsEgress", [])
-                        ],
-                        "tags": sg.get("Tags", []),
-                    },
-                    compliance_controls=["CC6.1", "CC6.6"],  # SOC 2 network security controls
-                    quality_score=self._calculate_security_group_quality_score(sg),
-                )
-
-                evidence.append(evidence_item)
+            ec2 = self.api_client.get_client("ec2")
+
+            # Page through all security groups; an unpaged call can truncate large VPCs
+            sg_paginator = ec2.get_paginator("describe_security_groups")
+            collected_at = datetime.utcnow()
+
+            async for page in _async_paginate(
+                sg_paginator, PaginationConfig={"PageSize": EC2_PAGE_SIZE}
+            ):
+                security_groups = page["SecurityGroups"]
+                scores = score_security_groups_bulk(security_groups)
+                for sg, quality_score in zip(security_groups, scores):
+                    yield self.create_evidence_item(
+                        evidence_type="security_group",
+                        resource_id=sg["GroupId"],
+                        resource_name=sg["GroupName"],
+                        data={
+                            "group_id": sg["GroupId"],
+                            "group_name": sg["GroupName"],
+                            "description": sg["Description"],
+                            "vpc_id": sg.get("VpcId"),
+                            "owner_id": sg["OwnerId"],
+                            "inbound_rules": [
+                                _rule_dict(rule) for rule in sg.get("IpPermissions", [])
+                            ],
+                            "outbound_rules": [
+                                _rule_dict(rule) for rule in sg.get("IpPermissionsEgress", [])
+                            ],
+                            "tags": sg.get("Tags", []),
+                        },
+                        compliance_controls=_CC_NETWORK,
+                        quality_score=quality_score,
+                        collection_timestamp=collected_at,
+                    )
 
         except ClientError as e:
             self.logger.error(f"Error collecting security group evidence: {e}")
             raise AWSAPIException(f"Failed to collect security group evidence: {e}")
 
-        return evidence
-
     def _calculate_security_group_quality_score(self, sg: Dict) -> float:
         """Calculate quality score for security group"""
-        score = 1.0
-
-        # Check for overly permissive rules
-        for rule in sg.get("IpPermissions", []):
-            for ip_range in rule.get("IpRanges", []):
-                if ip_range.get("CidrIp") == "0.0.0.0/0":
-                    # Penalize rules open to the internet
-                    if rule.get("FromPort") == 22 or rule.get("FromPort") == 3389:  # SSH or RDP
-                        score -= 0.5  # Very dangerous
-                    else:
-                        score -= 0.2  # Moderately dangerous
-
-        # Check if security group has description
-        if not sg.get("Description") or sg["Description"] == sg["GroupName"]:
-            score -= 0.1
-
-        return max(0.0, score)
+        return _security_group_quality_score(sg)
 
 
 # Additional collectors can be implemented similarly
+@AWSAPIClient.register_collector("vpc_configuration")
 class AWSVPCCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for VPC configuration collection
         return []
 
 
+@AWSAPIClient.register_collector("config_rules")
 class AWSConfigCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for AWS Config rules collection
         return []
 
 
+@AWSAPIClient.register_collector("guardduty_findings")
 class AWSGuardDutyCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for GuardDuty findings collection
         return []
 
 
+@AWSAPIClient.register_collector("inspector_findings")
 class AWSInspectorCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for Inspector findings collection
         return []
 
 
+@AWSAPIClient.register_collector("compliance_reports")
 class AWSComplianceCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for compliance reports collection
         return []
 
 
+@AWSAPIClient.register_collector("s3_buckets")
 class AWSS3Collector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for S3 bucket security collection
         return []
 
 
+@AWSAPIClient.register_collector("ec2_instances")
 class AWSEC2Collector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for EC2 instance collection
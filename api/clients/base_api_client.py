@@ -3,19 +3,91 @@ Base API client for all enterprise integrations
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from typing import (
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Deque,
+    Dict,
+    List,
+    Any,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from dataclasses import dataclass, field, replace
 import asyncio
+import copy
 import aiohttp
+import yarl
 import time
-import hashlib
+import json
+import random
+import secrets
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from enum import Enum
+from functools import lru_cache, partial
+from types import MappingProxyType
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
 
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds after which clients re-authenticate
+REAUTH_INTERVAL = 3600
+
+# HTTP methods whose requests carry no body
+_BODYLESS_METHODS = frozenset({"GET", "DELETE", "HEAD"})
+
+# Successful GET responses cached per client for requests that opt in (entries, default seconds)
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL = 60
+
+# Bytes read at a time when streaming newline-delimited JSON responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Rate limit headers carrying a unix timestamp at which the limit window resets
+_RATE_LIMIT_RESET_HEADERS = ("X-RateLimit-Reset", "X-Rate-Limit-Reset")
+
+# HTTP sessions shared by all clients of a provider, keyed by (provider name, base URL,
+# event loop) since a session only works on the loop that created it, along with the
+# number of open clients using each one
+_SessionKey = Tuple[str, str, asyncio.AbstractEventLoop]
+_SESSIONS: Dict[_SessionKey, aiohttp.ClientSession] = {}
+_SESSION_REFS: Dict[_SessionKey, int] = {}
+
+
+def _drop_dead_loop_sessions() -> None:
+    """Forget sessions whose event loop has closed, e.g. after a worker's asyncio.run"""
+    for key in [key for key in _SESSIONS if key[2].is_closed()]:
+        del _SESSIONS[key]
+        del _SESSION_REFS[key]
+
+
+async def close_shared_sessions() -> None:
+    """Close every shared HTTP session on the running loop, e.g. on application shutdown"""
+    _drop_dead_loop_sessions()
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _SESSIONS if key[2] is loop]:
+        session = _SESSIONS.pop(key)
+        del _SESSION_REFS[key]
+        await session.close()
+
 
 class AuthType(str, Enum):
     OAUTH2 = "oauth2"
@@ -45,16 +117,23 @@ class APIRequest:
     body: Optional[Any] = None
     timeout: int = 30
     retry_attempts: int = 3
+    # Evidence must be fresh, so only requests that opt in may be served from the cache
+    cacheable: bool = False
 
 
 @dataclass
 class APIResponse:
     status_code: int
     data: Any
-    headers: Dict[str, str]
+    headers: Mapping[str, str]
     response_time: float
     request_id: str
 
+    @property
+    def headers_dict(self) -> Dict[str, str]:
+        """Response headers copied into a plain dict"""
+        return dict(self.headers)
+
 
 @dataclass
 class EvidenceItem:
@@ -62,7 +141,7 @@ class EvidenceItem:
     resource_id: str
     resource_name: str
     data: Dict[str, Any]
-    compliance_controls: List[str]
+    compliance_controls: Sequence[str]
     collection_timestamp: datetime
     quality_score: float = 1.0
     metadata: Dict[str, Any] = field(default_factory=dict)
@@ -113,7 +192,9 @@ class APIAuthenticationException(APIException):
 class APIRateLimitException(APIException):
     """API rate limit exception"""
 
-    pass
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class UnsupportedEvidenceTypeException(APIException):
@@ -122,17 +203,200 @@ class UnsupportedEvidenceTypeException(APIException):
     pass
 
 
+@lru_cache(maxsize=32)
+def _timeout(total: float) -> aiohttp.ClientTimeout:
+    """Get a shared timeout object for the given total seconds"""
+    return aiohttp.ClientTimeout(total=total)
+
+
+@lru_cache(maxsize=1024)
+def _join_url(base_url: str, endpoint: str) -> yarl.URL:
+    """Join an endpoint, which may carry a query string, onto the API base URL
+
+    Endpoints are taken as already encoded, so escapes such as %2F in an ID stay part
+    of their path segment. Absolute endpoints, e.g. pagination links, are used as given.
+    """
+    endpoint_url = yarl.URL(endpoint, encoded=True)
+    if not base_url or endpoint_url.is_absolute():
+        return endpoint_url
+
+    return yarl.URL(f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}", encoded=True)
+
+
+def _parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Get the seconds to wait before retrying from a rate limited response's headers"""
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+
+        # Retry-After may also be an HTTP date
+        try:
+            return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+
+    for name in _RATE_LIMIT_RESET_HEADERS:
+        reset = headers.get(name)
+        if reset is not None:
+            try:
+                return max(float(reset) - time.time(), 0.0)
+            except ValueError:
+                pass
+
+    return None
+
+
+def _cache_control(headers: Optional[Mapping[str, str]]) -> List[str]:
+    """Get the lower-cased Cache-Control directives from headers"""
+    value = (headers or {}).get("Cache-Control", "")
+    return [directive.strip().lower() for directive in value.split(",") if directive.strip()]
+
+
+def _response_cache_ttl(headers: Mapping[str, str]) -> float:
+    """Get how long a response may be cached, honouring its Cache-Control header"""
+    directives = _cache_control(headers)
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return max(float(directive[len("max-age=") :]), 0.0)
+            except ValueError:
+                pass
+
+    return RESPONSE_CACHE_TTL
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a per-entry time to live"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        """Get a live entry, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        """Store an entry, evicting the least recently used one when full"""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class TokenBucket:
+    """Token bucket rate limiter on the monotonic clock"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def paused(self) -> bool:
+        return time.monotonic() < self.paused_until
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given time, e.g. until a rate limit window resets"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a request may be made and take a token for it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
 class BaseAPIClient(ABC):
     """Base class for all enterprise API clients"""
 
+    # Connection pool tuning, overridable per provider
+    connection_limit = 1024
+    connection_limit_per_host = 64
+    dns_cache_ttl = 300
+    keepalive_timeout = 75
+
+    # Headers sent with every request
+    _BASE_HEADERS: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "User-Agent": "ruleIQ-compliance-collector/1.0",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+    )
+
+    # Evidence collector factories by evidence type, filled in by register_collector
+    _COLLECTORS: ClassVar[Dict[str, Callable[["BaseAPIClient"], "BaseEvidenceCollector"]]] = {}
+
+    # Request admission control, overridable per provider
+    max_concurrent = 32
+    rate_per_sec = 20.0
+    burst = 40
+
     def __init__(self, credentials: APICredentials):
         self.credentials = credentials
         self.base_url = self.get_base_url()
         self.session: Optional[aiohttp.ClientSession] = None
+        self._session_key: Optional[_SessionKey] = None
+        self._dispatch: Dict[str, Callable[..., Any]] = {}
         self.authenticated = False
         self.last_auth_check = None
+        self._last_auth_monotonic: Optional[float] = None
+        self._auth_task: Optional[asyncio.Task] = None
         self.request_count = 0
         self.error_count = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._bucket = TokenBucket(rate=self.rate_per_sec, burst=self.burst)
+        self._collector_cache: Dict[str, BaseEvidenceCollector] = {}
+        self._response_cache = TTLCache(RESPONSE_CACHE_SIZE)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each provider keeps its own registry, starting from its parent's
+        cls._COLLECTORS = dict(cls._COLLECTORS)
+
+    @classmethod
+    def register_collector(cls, evidence_type: str, **collector_kwargs):
+        """Class decorator registering an evidence collector for this provider"""
+
+        def decorator(collector_cls):
+            cls._COLLECTORS[evidence_type] = (
+                partial(collector_cls, **collector_kwargs) if collector_kwargs else collector_cls
+            )
+            return collector_cls
+
+        return decorator
 
     @property
     @abstractmethod
@@ -155,10 +419,15 @@ class BaseAPIClient(ABC):
         """Refresh authentication credentials"""
         pass
 
-    @abstractmethod
     def get_evidence_collector(self, evidence_type: str):
-        """Get evidence collector for specific evidence type"""
-        pass
+        """Get evidence collector for specific evidence type, reusing it across calls"""
+        collector = self._collector_cache.get(evidence_type)
+        if collector is None:
+            collector_factory = self._COLLECTORS.get(evidence_type)
+            if collector_factory is None:
+                return None
+            collector = self._collector_cache[evidence_type] = collector_factory(self)
+        return collector
 
     @abstractmethod
     def get_health_endpoint(self) -> str:
@@ -167,19 +436,25 @@ class BaseAPIClient(ABC):
 
     async def ensure_authenticated(self) -> bool:
         """Ensure client is authenticated"""
-        now = datetime.utcnow()
-
-        # Check if we need to re-authenticate
+        # Check if we need to re-authenticate, compared on the monotonic clock
         if (
             not self.authenticated
-            or not self.last_auth_check
-            or (now - self.last_auth_check).total_seconds() > 3600
-        ):  # Re-auth every hour
-            self.authenticated = await self.authenticate()
-            self.last_auth_check = now
+            or self._last_auth_monotonic is None
+            or time.monotonic() - self._last_auth_monotonic > REAUTH_INTERVAL
+        ):
+            # Concurrent callers share one in-flight authentication
+            if self._auth_task is None or self._auth_task.done():
+                self._auth_task = asyncio.create_task(self._run_authentication())
+            await asyncio.shield(self._auth_task)
 
         return self.authenticated
 
+    async def _run_authentication(self) -> None:
+        """Authenticate and record when it happened"""
+        self.authenticated = await self.authenticate()
+        self._last_auth_monotonic = time.monotonic()
+        self.last_auth_check = datetime.utcnow()
+
     async def make_request(self, request: APIRequest) -> APIResponse:
         """Make authenticated API request with retry logic"""
 
@@ -187,21 +462,43 @@ class BaseAPIClient(ABC):
         if not await self.ensure_authenticated():
             raise APIAuthenticationException(f"Authentication failed for {self.provider_name}")
 
+        # Serve repeated idempotent requests from the response cache
+        cache_key = None
+        if (
+            request.cacheable
+            and request.method == "GET"
+            and "no-cache" not in _cache_control(request.headers)
+        ):
+            cache_key = self._response_cache_key(request)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                # Each caller gets its own copy of the data, so changes to it are not shared
+                return replace(cached, data=copy.deepcopy(cached.data))
+
         # Execute request with retry logic
         last_exception = None
 
         for attempt in range(request.retry_attempts):
             try:
-                response = await self._execute_request(request)
+                async with self._semaphore:
+                    await self._bucket.acquire()
+                    response = await self._execute_request(request)
                 self.request_count += 1
+
+                if cache_key is not None:
+                    ttl = _response_cache_ttl(response.headers)
+                    if ttl > 0:
+                        snapshot = replace(response, data=copy.deepcopy(response.data))
+                        self._response_cache.set(cache_key, snapshot, ttl)
                 return response
 
             except APIRateLimitException as e:
-                # Handle rate limiting with exponential backoff
                 if attempt < request.retry_attempts - 1:
-                    wait_time = (2**attempt) + (attempt * 0.1)  # Exponential backoff with jitter
+                    # Wait for the advertised reset, else back off exponentially, with jitter
+                    wait_time = e.retry_after if e.retry_after is not None else 2**attempt
+                    wait_time *= random.uniform(0.9, 1.1)
                     logger.warning(
-                        f"Rate limited by {self.provider_name}, retrying in {wait_time}s"
+                        f"Rate limited by {self.provider_name}, retrying in {wait_time:.2f}s"
                     )
                     await asyncio.sleep(wait_time)
                     last_exception = e
@@ -233,14 +530,59 @@ class BaseAPIClient(ABC):
         else:
             raise APIException(f"All retry attempts failed for {self.provider_name}")
 
+    def _response_cache_key(self, request: APIRequest) -> Tuple[str, str, Tuple]:
+        """Build the response cache key for a request"""
+        params = tuple(sorted((key, str(value)) for key, value in (request.params or {}).items()))
+        return (request.method, str(_join_url(self.base_url, request.endpoint)), params)
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create an HTTP session with a tuned connection pool"""
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+        return aiohttp.ClientSession(timeout=_timeout(60), connector=connector, trust_env=True)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session shared by all clients of this provider and base URL"""
+        key = (self.provider_name, self.base_url, asyncio.get_running_loop())
+        # Replace a session closed by close_shared_sessions or left on an earlier loop
+        if not self.session or self.session.closed or self._session_key != key:
+            self._release_session()
+            session = _SESSIONS.get(key)
+            if session is None or session.closed:
+                _drop_dead_loop_sessions()
+                session = _SESSIONS[key] = self._create_session()
+                _SESSION_REFS[key] = 0
+
+            _SESSION_REFS[key] += 1
+            self.session = session
+            self._session_key = key
+            self._dispatch = {
+                "GET": session.get,
+                "POST": session.post,
+                "PUT": session.put,
+                "PATCH": session.patch,
+                "DELETE": session.delete,
+                "HEAD": session.head,
+            }
+
+        return self.session
+
+    def _request_method(self, method: str) -> Callable[..., Any]:
+        """Get the session's request function for an HTTP method"""
+        session = self._get_session()
+        return self._dispatch.get(method) or partial(session.request, method)
+
     async def _execute_request(self, request: APIRequest) -> APIResponse:
         """Execute HTTP request with full error handling"""
 
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=60)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-
-        start_time = time.time()
+        send = self._request_method(request.method)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         request_id = self._generate_request_id(request)
 
         try:
@@ -253,35 +595,26 @@ class BaseAPIClient(ABC):
             )
 
             # Execute request
-            url = f"{self.base_url}{request.endpoint}" if self.base_url else request.endpoint
+            url = _join_url(self.base_url, request.endpoint)
 
-            async with self.session.request(
-                method=request.method,
-                url=url,
+            body = None
+            if request.body is not None and request.method not in _BODYLESS_METHODS:
+                # Bytes are already encoded by the caller, e.g. a multipart batch body
+                body = request.body
+                if not isinstance(body, bytes):
+                    body = _json_dumps(body)
+
+            async with send(
+                url,
                 params=request.params,
                 headers=headers,
-                json=request.body if request.method not in ["GET", "DELETE"] else None,
-                timeout=aiohttp.ClientTimeout(total=request.timeout),
+                data=body,
+                timeout=_timeout(request.timeout),
             ) as response:
-                response_time = time.time() - start_time
+                response_time = loop.time() - start_time
 
                 # Handle different response types
-                if response.status == 429:
-                    raise APIRateLimitException(f"Rate limited by {self.provider_name}")
-                elif response.status == 401:
-                    self.authenticated = False
-                    raise APIAuthenticationException(
-                        f"Authentication failed for {self.provider_name}"
-                    )
-                elif response.status >= 500:
-                    raise APIConnectionException(
-                        f"Server error from {self.provider_name}: {response.status}"
-                    )
-                elif response.status >= 400:
-                    error_text = await response.text()
-                    raise APIException(
-                        f"Client error from {self.provider_name}: {response.status} - {error_text}"
-                    )
+                await self._check_response_status(response)
 
                 # Parse response data
                 response_data = await self._parse_response(response)
@@ -294,60 +627,164 @@ class BaseAPIClient(ABC):
                 return APIResponse(
                     status_code=response.status,
                     data=response_data,
-                    headers=dict(response.headers),
+                    headers=response.headers,
                     response_time=response_time,
                     request_id=request_id,
                 )
 
-        except asyncio.TimeoutError:
+        except asyncio.TimeoutError as e:
             raise APITimeoutException(
                 f"Request to {self.provider_name} timed out after {request.timeout}s"
-            )
+            ) from e
         except aiohttp.ClientError as e:
-            raise APIConnectionException(f"Connection error to {self.provider_name}: {str(e)}")
+            raise APIConnectionException(
+                f"Connection error to {self.provider_name}: {str(e)}"
+            ) from e
+        except APIException:
+            raise
         except Exception as e:
-            if isinstance(
-                e,
-                (
-                    APIException,
-                    APITimeoutException,
-                    APIConnectionException,
-                    APIAuthenticationException,
-                    APIRateLimitException,
-                ),
-            ):
-                raise e
-            else:
-                raise APIException(f"Unexpected error calling {self.provider_name}: {str(e)}")
+            raise APIException(f"Unexpected error calling {self.provider_name}: {str(e)}") from e
+
+    async def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_param: str = "page",
+        first_page: int = 1,
+        items_key: Optional[str] = None,
+        max_concurrent: int = 8,
+    ) -> AsyncIterator[Any]:
+        """Yield items from a page-numbered endpoint, fetching pages ahead concurrently
+
+        Up to max_concurrent pages are in flight ahead of the one being consumed, so
+        page requests overlap with processing, while items are still yielded in page
+        order. Paging stops at the first empty page.
+        """
+
+        async def fetch_page(page: int) -> List[Any]:
+            response = await self.make_request(
+                APIRequest(
+                    "GET", endpoint, params={**(params or {}), page_param: page}, cacheable=False
+                )
+            )
+            data = response.data
+            return (data.get(items_key) if items_key else data) or []
+
+        pending: Deque[asyncio.Task] = deque()
+        next_page = first_page
+        try:
+            while True:
+                while len(pending) < max_concurrent:
+                    pending.append(asyncio.create_task(fetch_page(next_page)))
+                    next_page += 1
+
+                items = await pending.popleft()
+                if not items:
+                    break
+                for item in items:
+                    yield item
+        finally:
+            # Drop pages fetched speculatively past the end
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def stream_json_lines(self, request: APIRequest) -> AsyncIterator[Any]:
+        """Stream a newline-delimited JSON response, yielding each decoded record
+
+        Memory use is bounded by the largest record rather than the whole payload,
+        which suits export and inventory endpoints. Streams are not retried since
+        records may already have been consumed.
+        """
+        if not await self.ensure_authenticated():
+            raise APIAuthenticationException(f"Authentication failed for {self.provider_name}")
+
+        send = self._request_method(request.method)
+        headers = await self._prepare_headers(request.headers or {})
+        url = _join_url(self.base_url, request.endpoint)
+
+        try:
+            async with self._semaphore:
+                await self._bucket.acquire()
+                async with send(
+                    url,
+                    params=request.params,
+                    headers=headers,
+                    timeout=_timeout(request.timeout),
+                ) as response:
+                    await self._check_response_status(response)
+                    self.request_count += 1
+
+                    buffer = b""
+                    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        *lines, buffer = (buffer + chunk).split(b"\n")
+                        for line in lines:
+                            if line.strip():
+                                yield _json_loads(line)
+
+                    if buffer.strip():
+                        yield _json_loads(buffer)
+
+        except asyncio.TimeoutError as e:
+            raise APITimeoutException(
+                f"Request to {self.provider_name} timed out after {request.timeout}s"
+            ) from e
+        except aiohttp.ClientError as e:
+            raise APIConnectionException(
+                f"Connection error to {self.provider_name}: {str(e)}"
+            ) from e
+
+    async def _check_response_status(self, response: aiohttp.ClientResponse) -> None:
+        """Raise the matching API exception for an error response"""
+        if response.status == 429:
+            retry_after = _parse_retry_after(response.headers)
+            if retry_after is not None:
+                self._bucket.pause(retry_after)
+            raise APIRateLimitException(
+                f"Rate limited by {self.provider_name}", retry_after=retry_after
+            )
+        elif response.status == 401:
+            self.authenticated = False
+            raise APIAuthenticationException(f"Authentication failed for {self.provider_name}")
+        elif response.status >= 500:
+            raise APIConnectionException(
+                f"Server error from {self.provider_name}: {response.status}"
+            )
+        elif response.status >= 400:
+            error_text = await response.text()
+            raise APIException(
+                f"Client error from {self.provider_name}: {response.status} - {error_text}"
+            )
 
     async def _parse_response(self, response: aiohttp.ClientResponse) -> Any:
         """Parse API response data"""
         content_type = response.headers.get("content-type", "").lower()
 
         if "application/json" in content_type:
-            return await response.json()
+            body = await response.read()
+            return _json_loads(body) if body.strip() else None
         elif "text/" in content_type:
             return await response.text()
         else:
             return await response.read()
 
-    async def _prepare_headers(self, additional_headers: Dict[str, str] = None) -> Dict[str, str]:
-        """Prepare headers with authentication - to be implemented by subclasses"""
-        headers = {
-            "User-Agent": "ruleIQ-compliance-collector/1.0",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
+    def _auth_headers(self) -> Dict[str, str]:
+        """Get authentication headers - to be implemented by subclasses"""
+        return {}
 
-        if additional_headers:
-            headers.update(additional_headers)
+    async def _prepare_headers(
+        self, additional_headers: Dict[str, str] = None
+    ) -> Mapping[str, str]:
+        """Prepare headers with authentication, sharing the base headers when nothing is added"""
+        auth_headers = self._auth_headers()
+        if not auth_headers and not additional_headers:
+            return self._BASE_HEADERS
 
-        return headers
+        return {**self._BASE_HEADERS, **auth_headers, **(additional_headers or {})}
 
     def _generate_request_id(self, request: APIRequest) -> str:
         """Generate unique request ID for tracking"""
-        request_data = f"{request.method}:{request.endpoint}:{time.time()}"
-        return hashlib.md5(request_data.encode()).hexdigest()[:12]
+        return secrets.token_hex(6)
 
     async def collect_evidence(self, evidence_type: str, **kwargs) -> List[EvidenceItem]:
         """Collect specific evidence type from this API"""
@@ -361,21 +798,75 @@ class BaseAPIClient(ABC):
 
         return await evidence_collector.collect(**kwargs)
 
+    async def collect_many(self, evidence_types: Sequence[str], **kwargs) -> CollectionResult:
+        """Collect several evidence types from this API concurrently
+
+        Collectors run at the same time on the client's shared session, so they must
+        not keep per-call state on themselves or the client. A failing evidence type
+        is reported in the result's errors without cancelling the others.
+        """
+        results = await asyncio.gather(
+            *(self.collect_evidence(evidence_type, **kwargs) for evidence_type in evidence_types),
+            return_exceptions=True,
+        )
+
+        evidence_items: List[EvidenceItem] = []
+        errors: List[str] = []
+        for evidence_type, result in zip(evidence_types, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Failed to collect {evidence_type} from {self.provider_name}: {result}"
+                )
+                errors.append(f"{evidence_type}: {result}")
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                evidence_items.extend(result)
+
+        return CollectionResult(
+            success=not errors,
+            evidence_items=evidence_items,
+            errors=errors,
+            collection_metadata={
+                "provider": self.provider_name,
+                "evidence_types": list(evidence_types),
+            },
+            quality_score=(
+                sum(item.quality_score for item in evidence_items) / len(evidence_items)
+                if evidence_items
+                else 0.0
+            ),
+            total_collected=len(evidence_items),
+        )
+
+    async def stream_evidence(self, evidence_type: str, **kwargs) -> AsyncIterator[EvidenceItem]:
+        """Stream specific evidence type from this API as items are collected"""
+        evidence_collector = self.get_evidence_collector(evidence_type)
+        if not evidence_collector:
+            supported_types = self.get_supported_evidence_types()
+            raise UnsupportedEvidenceTypeException(
+                f"{evidence_type} not supported by {self.provider_name}. "
+                f"Supported types: {', '.join(supported_types)}"
+            )
+
+        async for item in evidence_collector.stream(**kwargs):
+            yield item
+
     def get_supported_evidence_types(self) -> List[str]:
         """Get list of supported evidence types for this provider"""
-        # This should be implemented by subclasses
-        return []
+        return list(self._COLLECTORS)
 
     async def health_check(self) -> Dict[str, Any]:
         """Check API health and connectivity"""
         try:
-            start_time = time.time()
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
 
             # Use a simple health check endpoint
-            health_request = APIRequest("GET", self.get_health_endpoint())
+            health_request = APIRequest("GET", self.get_health_endpoint(), cacheable=False)
             await self.make_request(health_request)
 
-            response_time = time.time() - start_time
+            response_time = loop.time() - start_time
 
             return {
                 "status": "healthy",
@@ -397,11 +888,30 @@ class BaseAPIClient(ABC):
                 "error_count": self.error_count,
             }
 
+    def _release_session(self) -> Optional[aiohttp.ClientSession]:
+        """Stop using the current session, returning it if no other client still uses it"""
+        session, key = self.session, self._session_key
+        self.session = self._session_key = None
+        self._dispatch = {}
+        if session is None:
+            return None
+
+        if _SESSIONS.get(key) is session:
+            _SESSION_REFS[key] -= 1
+            if _SESSION_REFS[key] > 0:
+                return None
+            del _SESSIONS[key]
+            del _SESSION_REFS[key]
+
+        return session
+
     async def close(self):
-        """Close the API client and cleanup resources"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Close the API client, closing its session once no other client uses it"""
+        key = self._session_key
+        session = self._release_session()
+        # A session left on another, possibly closed, loop cannot be closed from this one
+        if session is not None and key[2] is asyncio.get_running_loop():
+            await session.close()
 
     async def __aenter__(self):
         return self
@@ -422,15 +932,21 @@ class BaseEvidenceCollector(ABC):
         """Collect evidence items"""
         pass
 
+    async def stream(self, **kwargs) -> AsyncIterator[EvidenceItem]:
+        """Yield evidence items; collectors that can stream override this"""
+        for item in await self.collect(**kwargs):
+            yield item
+
     def create_evidence_item(
         self,
         evidence_type: str,
         resource_id: str,
         resource_name: str,
         data: Dict[str, Any],
-        compliance_controls: List[str],
+        compliance_controls: Sequence[str],
         quality_score: float = 1.0,
         metadata: Dict[str, Any] = None,
+        collection_timestamp: Optional[datetime] = None,
     ) -> EvidenceItem:
         """Helper method to create evidence items"""
         return EvidenceItem(
@@ -439,7 +955,20 @@ class BaseEvidenceCollector(ABC):
             resource_name=resource_name,
             data=data,
             compliance_controls=compliance_controls,
-            collection_timestamp=datetime.utcnow(),
+            collection_timestamp=collection_timestamp or datetime.utcnow(),
             quality_score=quality_score,
             metadata=metadata or {},
         )
+
+
+class StreamingEvidenceCollector(BaseEvidenceCollector):
+    """Base class for collectors that yield evidence items as they are fetched"""
+
+    @abstractmethod
+    async def stream(self, **kwargs) -> AsyncIterator[EvidenceItem]:
+        """Yield evidence items as they are collected"""
+        pass
+
+    async def collect(self, **kwargs) -> List[EvidenceItem]:
+        """Collect all streamed evidence items into a list"""
+        return [item async for item in self.stream(**kwargs)]
@@ -3,26 +3,37 @@ Google Workspace API Client for compliance evidence collection.
 Follows the foundation architecture pattern for enterprise API integrations.
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import secrets
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from operator import itemgetter
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, urlencode
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 from .base_api_client import (
     BaseAPIClient,
     APICredentials,
+    APIRequest,
     AuthType,
     CollectionResult,
     EvidenceQuality,
+    _json_loads,
 )
 
 # Mock Google API imports for graceful degradation
 try:
     from google.auth.transport.requests import Request
     from google.oauth2.credentials import Credentials
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
 
     GOOGLE_AVAILABLE = True
 except ImportError:
@@ -45,30 +56,159 @@ except ImportError:
     class Request:
         pass
 
-    def build(*args, **kwargs):
-        return MockGoogleService()
 
-    class HttpError(Exception):
-        pass
+logger = logging.getLogger(__name__)
 
-    class MockGoogleService:
-        def activities(self):
-            return self
+# Admin SDK REST APIs, relative to the admin API host
+DIRECTORY_API = "/admin/directory/v1"
+REPORTS_API = "/admin/reports/v1"
 
-        def users(self):
-            return self
+# Directory API batch endpoint, and the most calls Google accepts in one batch
+DIRECTORY_BATCH_API = "/batch/admin/directory_v1"
+BATCH_MAX_CALLS = 100
 
-        def groups(self):
-            return self
+# Partial responses: only the fields the evidence uses are sent back
+USER_FIELDS = (
+    "users(id,primaryEmail,isAdmin,isEnforcedIn2Sv,isEnrolledIn2Sv,suspended,lastLoginTime),"
+    "nextPageToken"
+)
+GROUP_FIELDS = "groups(id,email,name,description,directMembersCount),nextPageToken"
+MEMBER_FIELDS = "members(id,email,role,type,status),nextPageToken"
+ACTIVITY_FIELDS = "items(id/time,actor/email,events(type,name)),nextPageToken"
+
+# Activity logs are collected over this many days
+ACTIVITY_WINDOW_DAYS = 7
+
+# Activities newer than this count towards log evidence quality
+RECENT_ACTIVITY_DAYS = 3
+
+
+# Reports API login event names counted as successful and failed logins
+_LOGIN_SUCCESS_EVENTS = frozenset({"login_success"})
+_LOGIN_FAILURE_EVENTS = frozenset({"login_failure"})
+
+# Directory API user flags summarized for the users evidence
+_USER_FLAGS = itemgetter("isEnforcedIn2Sv", "suspended")
+
+
+def summarize_users(users: Sequence[Dict]) -> Tuple[int, int]:
+    """Count users with enforced 2-Step Verification and suspended users
+
+    Users returned with both flags are read with one C-level itemgetter per user
+    into flag columns, counted as a NumPy boolean array when NumPy is available;
+    if any user omits a flag, every user is read with defaulted lookups instead.
+    """
+    try:
+        columns = list(zip(*map(_USER_FLAGS, users)))
+    except KeyError:
+        mfa_enabled = 0
+        suspended = 0
+        for user in users:
+            if user.get("isEnforcedIn2Sv", False):
+                mfa_enabled += 1
+            if user.get("suspended", False):
+                suspended += 1
+        return mfa_enabled, suspended
+
+    if not columns:
+        return 0, 0
+    if np is not None:
+        mfa_enabled, suspended = np.array(columns, dtype=bool).sum(axis=1).tolist()
+        return mfa_enabled, suspended
+
+    mfa_column, suspended_column = columns
+    return sum(map(bool, mfa_column)), sum(map(bool, suspended_column))
+
+
+def _members_path(group_id: str, page_token: Optional[str] = None) -> str:
+    """Directory API path, with query string, for one page of a group's members"""
+    params = {"maxResults": 200, "fields": MEMBER_FIELDS}
+    if page_token:
+        params["pageToken"] = page_token
+    return f"{DIRECTORY_API}/groups/{quote(group_id, safe='')}/members?{urlencode(params)}"
+
+
+def _batch_body(boundary: str, paths: Sequence[str]) -> bytes:
+    """Encode GET requests as the parts of a multipart/mixed batch request body"""
+    lines = []
+    for index, path in enumerate(paths):
+        lines += [
+            f"--{boundary}",
+            "Content-Type: application/http",
+            f"Content-ID: <{index}>",
+            "",
+            f"GET {path}",
+            "",
+        ]
+    lines.append(f"--{boundary}--")
+    return "\r\n".join(lines).encode()
 
-        def list(self, **kwargs):
-            return self
 
-        def execute(self):
-            return {"items": []}
+def _batch_responses(content_type: str, body: bytes) -> Dict[int, Tuple[int, Any]]:
+    """Split a multipart/mixed batch response into the status and JSON body of each call
 
+    Responses are keyed by the index their request was sent with.
+    """
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+    )
+    responses = {}
+    for part in message.iter_parts():
+        # Google answers the part sent as <n> with <response-n>
+        index = int(part["Content-ID"].strip("<>").rpartition("-")[2])
+        head, _, content = part.get_payload(decode=True).partition(b"\r\n\r\n")
+        status = int(head.split(None, 2)[1])
+        responses[index] = (status, _json_loads(content) if content.strip() else {})
+    return responses
 
-logger = logging.getLogger(__name__)
+
+def _activity_time(activity: Dict) -> str:
+    return activity.get("id", {}).get("time", "")
+
+
+def _seven_days_ago_rfc3339() -> str:
+    """Get the start of the activity log window as a Reports API timestamp"""
+    start = datetime.utcnow() - timedelta(days=ACTIVITY_WINDOW_DAYS)
+    return start.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _recent_activity_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(days=RECENT_ACTIVITY_DAYS)
+
+
+def count_recent_activities(activities: Sequence[Dict], cutoff: Optional[datetime] = None) -> int:
+    """Count activities that happened after the cutoff, by default three days ago
+
+    Timestamps are parsed into one NumPy datetime array and compared at once;
+    without NumPy, or if a timestamp NumPy cannot parse, each is checked individually.
+    Activities without a parseable timestamp are not counted.
+    """
+    if cutoff is None:
+        cutoff = _recent_activity_cutoff()
+
+    if np is not None:
+        try:
+            # Reports API times are UTC; NumPy datetimes carry no zone suffix
+            timestamps = np.array(
+                [_activity_time(activity).rstrip("Z") for activity in activities],
+                dtype="datetime64[ns]",
+            )
+        except ValueError:
+            pass
+        else:
+            return int((timestamps > np.datetime64(cutoff, "ns")).sum())
+
+    recent = 0
+    for activity in activities:
+        try:
+            timestamp = datetime.fromisoformat(_activity_time(activity).replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        if timestamp > cutoff:
+            recent += 1
+    return recent
 
 
 class GoogleWorkspaceCredentials(BaseModel):
@@ -95,14 +235,33 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
         "https://www.googleapis.com/auth/admin.security.readonly",
     ]
 
-    def __init__(self, credentials: APICredentials):
+    # Evidence collectors run concurrently, at most this many at a time
+    max_concurrent_collectors = 5
+
+    def __init__(self, credentials: APICredentials, retain_raw: bool = False):
         super().__init__(credentials)
-        self.service_cache = {}
+        # Evidence holds only summaries unless the raw users and activities are asked for
+        self.retain_raw = retain_raw
         self.credentials_obj: Optional[Credentials] = None
+        self._refresh_lock = asyncio.Lock()
+
+        # Validate the OAuth2 credentials once, up front; authenticate() reuses them
+        self._workspace_creds: Optional[GoogleWorkspaceCredentials] = None
+        self._credentials_error: Optional[str] = None
+        if credentials.auth_type == AuthType.OAUTH2:
+            try:
+                self._workspace_creds = GoogleWorkspaceCredentials(**credentials.credentials)
+            except ValidationError as e:
+                self._credentials_error = str(e)
+                logger.error(f"Invalid Google Workspace credentials: {e}")
+
+    @property
+    def provider_name(self) -> str:
+        return "google_workspace"
 
     def get_base_url(self) -> str:
-        """Google APIs use different base URLs per service."""
-        return "https://www.googleapis.com"
+        """The Directory and Reports APIs are both served from the admin API host."""
+        return "https://admin.googleapis.com"
 
     async def authenticate(self) -> bool:
         """Authenticate with Google Workspace using OAuth2."""
@@ -112,27 +271,31 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
                 self.authenticated = True
                 return True
 
-            # Parse credentials
-            if self.credentials.auth_type != AuthType.OAUTH2:
-                raise ValueError("Google Workspace requires OAuth2 authentication")
-
-            creds_data = self.credentials.credentials
-            workspace_creds = GoogleWorkspaceCredentials(**creds_data)
-
-            # Create Google credentials object
-            self.credentials_obj = Credentials(
-                token=workspace_creds.access_token,
-                refresh_token=workspace_creds.refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=workspace_creds.client_id,
-                client_secret=workspace_creds.client_secret,
-                scopes=self.SCOPES,
-            )
+            if self.credentials_obj is None:
+                if self.credentials.auth_type != AuthType.OAUTH2:
+                    raise ValueError("Google Workspace requires OAuth2 authentication")
+                if self._workspace_creds is None:
+                    raise ValueError(f"Invalid credentials: {self._credentials_error}")
+
+                workspace_creds = self._workspace_creds
+
+                # Create Google credentials object
+                self.credentials_obj = Credentials(
+                    token=workspace_creds.access_token,
+                    refresh_token=workspace_creds.refresh_token,
+                    token_uri="https://oauth2.googleapis.com/token",
+                    client_id=workspace_creds.client_id,
+                    client_secret=workspace_creds.client_secret,
+                    scopes=self.SCOPES,
+                )
+            elif self.credentials_obj.valid:
+                # Token still valid, nothing to do
+                self.authenticated = True
+                return True
 
             # Refresh token if needed
             if self.credentials_obj.expired and self.credentials_obj.refresh_token:
-                self.credentials_obj.refresh(Request())
-                logger.info("Google Workspace credentials refreshed")
+                await self._refresh_token()
 
             self.authenticated = self.credentials_obj.valid
             return self.authenticated
@@ -142,6 +305,40 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
             self.authenticated = False
             return False
 
+    async def refresh_credentials(self) -> bool:
+        """Refresh the OAuth2 access token."""
+        if not GOOGLE_AVAILABLE or self.credentials_obj is None:
+            return await self.authenticate()
+
+        try:
+            await self._refresh_token()
+            return self.credentials_obj.valid
+        except Exception as e:
+            logger.error(f"Failed to refresh Google Workspace credentials: {e}")
+            return False
+
+    async def _refresh_token(self) -> None:
+        """Refresh the access token, once for callers that find it stale together."""
+        stale_token = self.credentials_obj.token
+        async with self._refresh_lock:
+            # Another caller refreshed the token while this one waited
+            if self.credentials_obj.token != stale_token and self.credentials_obj.valid:
+                return
+
+            # The refresh is a blocking HTTPS call, so keep it off the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.credentials_obj.refresh, Request())
+            logger.info("Google Workspace credentials refreshed")
+
+    def _auth_headers(self) -> Dict[str, str]:
+        """Get headers with the OAuth2 access token."""
+        if self.credentials_obj is None or not self.credentials_obj.token:
+            return {}
+        return {"Authorization": f"Bearer {self.credentials_obj.token}"}
+
+    def get_health_endpoint(self) -> str:
+        return f"{DIRECTORY_API}/customer/my_customer/domains"
+
     async def test_connection(self) -> Tuple[bool, str]:
         """Test connection to Google Workspace."""
         try:
@@ -152,8 +349,7 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
                 return True, "Mock connection successful"
 
             # Test with a simple API call
-            service = build("admin", "directory_v1", credentials=self.credentials_obj)
-            service.domains().list(customer="my_customer").execute()
+            await self._get(f"{DIRECTORY_API}/customer/my_customer/domains")
 
             return True, "Connection successful"
 
@@ -161,17 +357,63 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
             logger.error(f"Google Workspace connection test failed: {e}")
             return False, str(e)
 
-    def _get_service(self, service_name: str, version: str):
-        """Get cached Google API service."""
-        key = f"{service_name}_{version}"
-        if key not in self.service_cache:
-            if not GOOGLE_AVAILABLE:
-                self.service_cache[key] = MockGoogleService()
-            else:
-                self.service_cache[key] = build(
-                    service_name, version, credentials=self.credentials_obj
+    async def _get(self, endpoint: str, **params: Any) -> Dict:
+        """GET an Admin SDK resource over the shared HTTP session."""
+        if not GOOGLE_AVAILABLE:
+            # Mock mode: no credentials to call Google with
+            return {}
+
+        response = await self.make_request(APIRequest("GET", endpoint, params=params or None))
+        return response.data or {}
+
+    async def _batch_get(self, paths: Sequence[str]) -> List[Tuple[int, Any]]:
+        """GET several Directory API resources in one multipart/mixed batch request
+
+        Returns the status and JSON body of each call, in the order of the paths;
+        a call missing from the batch response gets status 0.
+        """
+        if not GOOGLE_AVAILABLE:
+            # Mock mode: no credentials to call Google with
+            return [(200, {})] * len(paths)
+
+        boundary = f"batch_{secrets.token_hex(8)}"
+        response = await self.make_request(
+            APIRequest(
+                "POST",
+                DIRECTORY_BATCH_API,
+                headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+                body=_batch_body(boundary, paths),
+            )
+        )
+        responses = _batch_responses(response.headers.get("Content-Type", ""), response.data)
+        return [responses.get(index, (0, {})) for index in range(len(paths))]
+
+    async def _pages(self, endpoint: str, items_key: str, **params: Any) -> AsyncIterator[List]:
+        """Yield each page of a list endpoint, following nextPageToken
+
+        The next page is requested as soon as its token arrives, so it is in flight
+        while the caller processes the current page.
+        """
+        page = await self._get(endpoint, **params)
+        next_page = None
+        try:
+            while True:
+                token = page.get("nextPageToken")
+                next_page = (
+                    asyncio.create_task(self._get(endpoint, **params, pageToken=token))
+                    if token
+                    else None
                 )
-        return self.service_cache[key]
+                yield page.get(items_key, [])
+
+                if next_page is None:
+                    return
+                page = await next_page
+        finally:
+            # Drop the prefetched page if the caller stops early
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+                await asyncio.gather(next_page, return_exceptions=True)
 
     async def collect_users_evidence(self) -> CollectionResult:
         """Collect user directory evidence."""
@@ -179,21 +421,29 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
             if not await self.authenticate():
                 raise Exception("Authentication failed")
 
-            service = self._get_service("admin", "directory_v1")
-
-            # Get users
-            users_result = service.users().list(customer="my_customer", maxResults=500).execute()
-            users = users_result.get("users", [])
+            # Get users, summarizing each page as it arrives
+            users = [] if self.retain_raw else None
+            total_users = 0
+            mfa_enabled = 0
+            suspended_users = 0
+            async for page in self._pages(
+                f"{DIRECTORY_API}/users",
+                "users",
+                customer="my_customer",
+                maxResults=500,
+                fields=USER_FIELDS,
+            ):
+                page_mfa_enabled, page_suspended = summarize_users(page)
+                total_users += len(page)
+                mfa_enabled += page_mfa_enabled
+                suspended_users += page_suspended
+                if users is not None:
+                    users.extend(page)
 
             # Calculate quality score
-            total_users = len(users)
-            mfa_enabled = sum(1 for user in users if user.get("isEnforcedIn2Sv", False))
-            suspended_users = sum(1 for user in users if user.get("suspended", False))
-
             quality_score = self._calculate_users_quality(total_users, mfa_enabled, suspended_users)
 
             evidence_data = {
-                "users": users,
                 "summary": {
                     "total_users": total_users,
                     "active_users": total_users - suspended_users,
@@ -204,6 +454,8 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
                     else 0,
                 },
             }
+            if users is not None:
+                evidence_data["users"] = users
 
             return CollectionResult(
                 evidence_type="user_directory",
@@ -226,35 +478,34 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
             if not await self.authenticate():
                 raise Exception("Authentication failed")
 
-            service = self._get_service("admin", "directory_v1")
-
             # Get groups
-            groups_result = service.groups().list(customer="my_customer", maxResults=200).execute()
-            groups = groups_result.get("groups", [])
+            groups = [
+                group
+                async for page in self._pages(
+                    f"{DIRECTORY_API}/groups",
+                    "groups",
+                    customer="my_customer",
+                    maxResults=200,
+                    fields=GROUP_FIELDS,
+                )
+                for group in page
+            ]
 
             # Get group memberships
-            group_memberships = {}
-            for group in groups:
-                try:
-                    members_result = service.members().list(groupKey=group["id"]).execute()
-                    group_memberships[group["id"]] = members_result.get("members", [])
-                except Exception as e:
-                    logger.warning(f"Failed to get members for group {group['id']}: {e}")
-                    group_memberships[group["id"]] = []
+            group_memberships = await self._fetch_group_memberships(groups)
+
+            # Lowercase each group name once for all the name checks
+            group_names = [g.get("name", "").lower() for g in groups]
 
-            quality_score = self._calculate_groups_quality(groups, group_memberships)
+            quality_score = self._calculate_groups_quality(group_names, group_memberships)
 
             evidence_data = {
                 "groups": groups,
                 "group_memberships": group_memberships,
                 "summary": {
                     "total_groups": len(groups),
-                    "security_groups": len(
-                        [g for g in groups if "security" in g.get("name", "").lower()]
-                    ),
-                    "distribution_groups": len(
-                        [g for g in groups if "distribution" in g.get("name", "").lower()]
-                    ),
+                    "security_groups": sum(1 for name in group_names if "security" in name),
+                    "distribution_groups": sum(1 for name in group_names if "distribution" in name),
                 },
             }
 
@@ -273,44 +524,94 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
             logger.error(f"Failed to collect groups evidence: {e}")
             raise
 
-    async def collect_admin_logs_evidence(self) -> CollectionResult:
+    async def _fetch_group_memberships(self, groups: List[Dict]) -> Dict[str, List]:
+        """Fetch the members of each group in Directory API batch requests
+
+        Each batch carries up to BATCH_MAX_CALLS member pages and the batches of a
+        round are sent concurrently; groups with more members are continued in the
+        next round. A group whose lookup fails is recorded with no members.
+        """
+        group_memberships = {group["id"]: [] for group in groups}
+        page_tokens: Dict[str, Optional[str]] = dict.fromkeys(group_memberships)
+
+        while page_tokens:
+            pending = list(page_tokens.items())
+            chunks = [
+                pending[start : start + BATCH_MAX_CALLS]
+                for start in range(0, len(pending), BATCH_MAX_CALLS)
+            ]
+            outcomes = await asyncio.gather(
+                *(self._batch_get([_members_path(*call) for call in chunk]) for chunk in chunks),
+                return_exceptions=True,
+            )
+
+            page_tokens = {}
+            for chunk, outcome in zip(chunks, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.warning(f"Failed to get members for {len(chunk)} groups: {outcome}")
+                    for group_id, _ in chunk:
+                        group_memberships[group_id] = []
+                    continue
+
+                for (group_id, _), (status, page) in zip(chunk, outcome):
+                    if status != 200:
+                        logger.warning(
+                            f"Failed to get members for group {group_id}: {status} - {page}"
+                        )
+                        group_memberships[group_id] = []
+                        continue
+                    group_memberships[group_id].extend(page.get("members", []))
+                    if page.get("nextPageToken"):
+                        page_tokens[group_id] = page["nextPageToken"]
+
+        return group_memberships
+
+    async def collect_admin_logs_evidence(
+        self, start_time: Optional[str] = None
+    ) -> CollectionResult:
         """Collect admin activity logs evidence."""
         try:
             if not await self.authenticate():
                 raise Exception("Authentication failed")
 
-            service = self._get_service("admin", "reports_v1")
-
             # Get admin activities from last 7 days
-            start_time = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-
-            activities_result = (
-                service.activities()
-                .list(userKey="all", applicationName="admin", startTime=start_time, maxResults=1000)
-                .execute()
-            )
-
-            activities = activities_result.get("items", [])
-
-            quality_score = self._calculate_logs_quality(activities)
+            start_time = start_time or _seven_days_ago_rfc3339()
+            recent_cutoff = _recent_activity_cutoff()
+
+            # Summarize each page of activities as it arrives
+            activities = [] if self.retain_raw else None
+            total_events = 0
+            recent_events = 0
+            unique_users = set()
+            event_types = set()
+            async for page in self._pages(
+                f"{REPORTS_API}/activity/users/all/applications/admin",
+                "items",
+                startTime=start_time,
+                maxResults=1000,
+                fields=ACTIVITY_FIELDS,
+            ):
+                total_events += len(page)
+                recent_events += count_recent_activities(page, recent_cutoff)
+                for activity in page:
+                    unique_users.add(activity.get("actor", {}).get("email", ""))
+                    for event in activity.get("events", []):
+                        event_types.add(event.get("name", ""))
+                if activities is not None:
+                    activities.extend(page)
+
+            quality_score = self._calculate_logs_quality(total_events, recent_events)
 
             evidence_data = {
-                "activities": activities,
                 "summary": {
-                    "total_events": len(activities),
+                    "total_events": total_events,
                     "date_range": f"Last 7 days from {start_time}",
-                    "unique_users": len(
-                        set(act.get("actor", {}).get("email", "") for act in activities)
-                    ),
-                    "event_types": list(
-                        set(
-                            event.get("name", "")
-                            for act in activities
-                            for event in act.get("events", [])
-                        )
-                    ),
+                    "unique_users": len(unique_users),
+                    "event_types": list(event_types),
                 },
             }
+            if activities is not None:
+                evidence_data["activities"] = activities
 
             return CollectionResult(
                 evidence_type="admin_activity_logs",
@@ -327,50 +628,58 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
             logger.error(f"Failed to collect admin logs evidence: {e}")
             raise
 
-    async def collect_login_logs_evidence(self) -> CollectionResult:
+    async def collect_login_logs_evidence(
+        self, start_time: Optional[str] = None
+    ) -> CollectionResult:
         """Collect user login logs evidence."""
         try:
             if not await self.authenticate():
                 raise Exception("Authentication failed")
 
-            service = self._get_service("admin", "reports_v1")
-
             # Get login activities from last 7 days
-            start_time = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-
-            activities_result = (
-                service.activities()
-                .list(userKey="all", applicationName="login", startTime=start_time, maxResults=1000)
-                .execute()
-            )
-
-            activities = activities_result.get("items", [])
-
-            quality_score = self._calculate_logs_quality(activities)
-
-            # Analyze login patterns
-            successful_logins = []
-            failed_logins = []
-
-            for activity in activities:
-                for event in activity.get("events", []):
-                    if "login_success" in event.get("name", ""):
-                        successful_logins.append(activity)
-                    elif "login_failure" in event.get("name", ""):
-                        failed_logins.append(activity)
+            start_time = start_time or _seven_days_ago_rfc3339()
+            recent_cutoff = _recent_activity_cutoff()
+
+            # Analyze login patterns, a page of activities at a time
+            activities = [] if self.retain_raw else None
+            total_events = 0
+            recent_events = 0
+            successful_logins = 0
+            failed_logins = 0
+            unique_users = set()
+            async for page in self._pages(
+                f"{REPORTS_API}/activity/users/all/applications/login",
+                "items",
+                startTime=start_time,
+                maxResults=1000,
+                fields=ACTIVITY_FIELDS,
+            ):
+                total_events += len(page)
+                recent_events += count_recent_activities(page, recent_cutoff)
+                for activity in page:
+                    unique_users.add(activity.get("actor", {}).get("email", ""))
+                    for event in activity.get("events", []):
+                        name = event.get("name")
+                        if name in _LOGIN_SUCCESS_EVENTS:
+                            successful_logins += 1
+                        elif name in _LOGIN_FAILURE_EVENTS:
+                            failed_logins += 1
+                if activities is not None:
+                    activities.extend(page)
+
+            quality_score = self._calculate_logs_quality(total_events, recent_events)
 
             evidence_data = {
-                "activities": activities,
                 "summary": {
-                    "total_events": len(activities),
-                    "successful_logins": len(successful_logins),
-                    "failed_logins": len(failed_logins),
+                    "total_events": total_events,
+                    "successful_logins": successful_logins,
+                    "failed_logins": failed_logins,
                     "date_range": f"Last 7 days from {start_time}",
-                    "unique_users": len(
-                        set(act.get("actor", {}).get("email", "") for act in activities)
-                    ),
+                    "unique_users": len(unique_users),
                 },
             }
+            if activities is not None:
+                evidence_data["activities"] = activities
 
             return CollectionResult(
                 evidence_type="user_access_logs",
@@ -393,10 +702,8 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
             if not await self.authenticate():
                 raise Exception("Authentication failed")
 
-            service = self._get_service("admin", "directory_v1")
-
             # Get domain information
-            domains_result = service.domains().list(customer="my_customer").execute()
+            domains_result = await self._get(f"{DIRECTORY_API}/customer/my_customer/domains")
             domains = domains_result.get("domains", [])
 
             quality_score = self._calculate_domain_quality(domains)
@@ -408,7 +715,7 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
                     "primary_domain": next(
                         (d["domainName"] for d in domains if d.get("isPrimary")), None
                     ),
-                    "verified_domains": len([d for d in domains if d.get("verified")]),
+                    "verified_domains": sum(1 for d in domains if d.get("verified")),
                 },
             }
 
@@ -446,14 +753,16 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
         else:
             return EvidenceQuality.LOW
 
-    def _calculate_groups_quality(self, groups: List[Dict], memberships: Dict) -> EvidenceQuality:
-        """Calculate quality score for groups evidence."""
-        if not groups:
+    def _calculate_groups_quality(
+        self, group_names: List[str], memberships: Dict
+    ) -> EvidenceQuality:
+        """Calculate quality score for groups evidence from their lowercased names."""
+        if not group_names:
             return EvidenceQuality.LOW
 
         # Check for proper group organization
-        has_security_groups = any("security" in g.get("name", "").lower() for g in groups)
-        has_proper_naming = sum(1 for g in groups if len(g.get("name", "")) > 5) / len(groups) > 0.8
+        has_security_groups = any("security" in name for name in group_names)
+        has_proper_naming = sum(1 for name in group_names if len(name) > 5) / len(group_names) > 0.8
 
         if has_security_groups and has_proper_naming:
             return EvidenceQuality.HIGH
@@ -462,22 +771,12 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
         else:
             return EvidenceQuality.LOW
 
-    def _calculate_logs_quality(self, activities: List[Dict]) -> EvidenceQuality:
+    def _calculate_logs_quality(self, total_events: int, recent_events: int) -> EvidenceQuality:
         """Calculate quality score for log evidence."""
-        if not activities:
+        if total_events == 0:
             return EvidenceQuality.LOW
 
         # Quality based on log volume and recency
-        recent_events = sum(
-            1
-            for act in activities
-            if (
-                datetime.utcnow()
-                - datetime.fromisoformat(act.get("id", {}).get("time", "").replace("Z", "+00:00"))
-            ).days
-            < 3
-        )
-
         if recent_events > 50:
             return EvidenceQuality.HIGH
         elif recent_events > 10:
@@ -513,22 +812,31 @@ class GoogleWorkspaceAPIClient(BaseAPIClient):
     async def collect_all_evidence(self) -> List[CollectionResult]:
         """Collect all available evidence types."""
         results = []
+        semaphore = asyncio.Semaphore(self.max_concurrent_collectors)
+
+        async def run(collector, kwargs):
+            async with semaphore:
+                return await collector(**kwargs)
 
+        # Both activity log collectors cover the same window
+        start_time = _seven_days_ago_rfc3339()
         evidence_collectors = [
-            self.collect_users_evidence,
-            self.collect_groups_evidence,
-            self.collect_admin_logs_evidence,
-            self.collect_login_logs_evidence,
-            self.collect_domain_evidence,
+            (self.collect_users_evidence, {}),
+            (self.collect_groups_evidence, {}),
+            (self.collect_admin_logs_evidence, {"start_time": start_time}),
+            (self.collect_login_logs_evidence, {"start_time": start_time}),
+            (self.collect_domain_evidence, {}),
         ]
 
-        # Run collectors in parallel
-        for collector in evidence_collectors:
-            try:
-                result = await collector()
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to collect evidence with {collector.__name__}: {e}")
+        # Run collectors in parallel; a failing collector does not drop the others
+        outcomes = await asyncio.gather(
+            *(run(collector, kwargs) for collector, kwargs in evidence_collectors),
+            return_exceptions=True,
+        )
+        for (collector, _), outcome in zip(evidence_collectors, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to collect evidence with {collector.__name__}: {outcome}")
                 continue
+            results.append(outcome)
 
         return results
@@ -2,7 +2,6 @@
 Okta API client for identity and access management evidence collection
 """
 
-import aiohttp
 from typing import Dict, List
 from datetime import datetime, timedelta
 
@@ -47,10 +46,9 @@ class OktaAPIClient(BaseAPIClient):
             # Test authentication with a simple API call
             headers = await self._prepare_headers()
 
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            session = self._get_session()
 
-            async with self.session.get(f"{self.base_url}/users/me", headers=headers) as response:
+            async with session.get(f"{self.base_url}/users/me", headers=headers) as response:
                 if response.status == 200:
                     user_info = await response.json()
                     logger.info(
@@ -72,51 +70,15 @@ class OktaAPIClient(BaseAPIClient):
         """Okta API tokens don't typically expire, but we can validate them"""
         return await self.authenticate()
 
-    async def _prepare_headers(self, additional_headers: Dict[str, str] = None) -> Dict[str, str]:
-        """Prepare headers with API token"""
-        headers = {
-            "Authorization": f"SSWS {self.credentials.credentials['api_token']}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "User-Agent": "ruleIQ-compliance-collector/1.0",
-        }
-
-        if additional_headers:
-            headers.update(additional_headers)
-
-        return headers
-
-    def get_evidence_collector(self, evidence_type: str):
-        """Get Okta evidence collector for specific evidence type"""
-        collectors = {
-            "users": OktaUserCollector(self),
-            "groups": OktaGroupCollector(self),
-            "applications": OktaApplicationCollector(self),
-            "policies": OktaPolicyCollector(self),
-            "system_logs": OktaLogsCollector(self),
-            "mfa_factors": OktaMFACollector(self),
-            "zones": OktaZoneCollector(self),
-            "auth_servers": OktaAuthServerCollector(self),
-        }
-        return collectors.get(evidence_type)
-
-    def get_supported_evidence_types(self) -> List[str]:
-        """Get list of supported evidence types for Okta"""
-        return [
-            "users",
-            "groups",
-            "applications",
-            "policies",
-            "system_logs",
-            "mfa_factors",
-            "zones",
-            "auth_servers",
-        ]
+    def _auth_headers(self) -> Dict[str, str]:
+        """Get headers with API token"""
+        return {"Authorization": f"SSWS {self.credentials.credentials['api_token']}"}
 
     def get_health_endpoint(self) -> str:
         return "/users/me"
 
 
+@OktaAPIClient.register_collector("users")
 class OktaUserCollector(BaseEvidenceCollector):
     """Collect user and access evidence from Okta"""
 
@@ -309,6 +271,7 @@ class OktaUserCollector(BaseEvidenceCollector):
         return max(0.0, score)
 
 
+@OktaAPIClient.register_collector("groups")
 class OktaGroupCollector(BaseEvidenceCollector):
     """Collect group and membership evidence from Okta"""
 
@@ -436,6 +399,7 @@ class OktaGroupCollector(BaseEvidenceCollector):
         return max(0.0, score)
 
 
+@OktaAPIClient.register_collector("applications")
 class OktaApplicationCollector(BaseEvidenceCollector):
     """Collect application and access evidence from Okta"""
 
@@ -554,6 +518,7 @@ class OktaApplicationCollector(BaseEvidenceCollector):
         return max(0.0, score)
 
 
+@OktaAPIClient.register_collector("system_logs")
 class OktaLogsCollector(BaseEvidenceCollector):
     """Collect system logs for audit evidence"""
 
@@ -706,24 +671,28 @@ class OktaLogsCollector(BaseEvidenceCollector):
 
 
 # Additional collectors for completeness
+@OktaAPIClient.register_collector("policies")
 class OktaPolicyCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for policy collection
         return []
 
 
+@OktaAPIClient.register_collector("mfa_factors")
 class OktaMFACollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for MFA factor collection
         return []
 
 
+@OktaAPIClient.register_collector("zones")
 class OktaZoneCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for network zone collection
         return []
 
 
+@OktaAPIClient.register_collector("auth_servers")
 class OktaAuthServerCollector(BaseEvidenceCollector):
     async def collect(self, **kwargs) -> List[EvidenceItem]:
         # Implementation for authorization server collection
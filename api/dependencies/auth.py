@@ -2,8 +2,10 @@
 Asynchronous authentication dependencies for ComplianceGPT.
 """
 
+import asyncio
 import os
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from uuid import UUID
@@ -25,8 +27,16 @@ SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_EXPIRES = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt is deliberately slow; hashing runs in its own bounded pool so it
+# neither blocks the event loop nor competes without limit for the CPU
+_password_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token", auto_error=False)
 
 
@@ -73,6 +83,20 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_hash_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the hashing pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_hash_executor, get_password_hash, password)
+
+
 def create_token(data: dict, token_type: str, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -85,13 +109,11 @@ def create_token(data: dict, token_type: str, expires_delta: Optional[timedelta]
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    return create_token(
-        data, "access", expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    return create_token(data, "access", expires_delta or ACCESS_TOKEN_EXPIRES)
 
 
 def create_refresh_token(data: dict) -> str:
-    return create_token(data, "refresh", timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    return create_token(data, "refresh", REFRESH_TOKEN_EXPIRES)
 
 
 def validate_token_expiry(payload: Dict) -> None:
@@ -14,6 +14,18 @@ from uuid import UUID
 
 from cryptography.fernet import InvalidToken
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
 from config.app_config import get_cipher_suite  # Import the cipher
 from config.logging_config import get_logger
 
@@ -44,6 +56,7 @@ class IntegrationConfig:
 class BaseIntegration(ABC):
     def __init__(self, config: IntegrationConfig):
         self.config = config
+        # Resolved per instance so a cipher configured after import is still picked up
         self.cipher = get_cipher_suite()
         if not self.cipher:
             logger.error(
@@ -92,16 +105,9 @@ class BaseIntegration(ABC):
             self.config.credentials = original_creds  # Restore original
 
     def encrypt_credentials_to_str(self, credentials_dict: Dict[str, Any]) -> str:
-        if not self.cipher:
-            logger.error("Cannot encrypt credentials: Fernet cipher is not initialized.")
-            raise IntegrationError(
-                "Encryption cipher not available. Cannot save credentials securely."
-            )
-
+        # The cipher's presence is checked once, in __init__
         try:
-            credentials_json = json.dumps(credentials_dict)
-            credentials_bytes = credentials_json.encode("utf-8")
-            encrypted_bytes = self.cipher.encrypt(credentials_bytes)
+            encrypted_bytes = self.cipher.encrypt(_json_dumps(credentials_dict))
             return encrypted_bytes.decode(
                 "utf-8"
             )  # Store as string (Fernet tokens are URL-safe base64)
@@ -110,17 +116,9 @@ class BaseIntegration(ABC):
             raise IntegrationError(f"Failed to encrypt credentials: {e}") from e
 
     def decrypt_credentials_from_str(self, encrypted_credentials_str: str) -> Dict[str, Any]:
-        if not self.cipher:
-            logger.error("Cannot decrypt credentials: Fernet cipher is not initialized.")
-            raise IntegrationError(
-                "Decryption cipher not available. Cannot load credentials securely."
-            )
-
         try:
             encrypted_bytes = encrypted_credentials_str.encode("utf-8")
-            decrypted_bytes = self.cipher.decrypt(encrypted_bytes)
-            credentials_json = decrypted_bytes.decode("utf-8")
-            return json.loads(credentials_json)
+            return _json_loads(self.cipher.decrypt(encrypted_bytes))
         except InvalidToken as e:
             logger.error(
                 "Failed to decrypt credentials: Invalid Fernet token. Key might be wrong or data corrupted."
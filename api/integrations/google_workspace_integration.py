@@ -4,14 +4,23 @@ Google Workspace integration for collecting compliance evidence.
 
 import asyncio
 import logging
+from functools import partial
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Mock Google API imports for now - will be replaced when dependencies are installed
 try:
+    import httplib2
     from google.auth.transport.requests import Request
     from google.oauth2.credentials import Credentials
+    from google_auth_httplib2 import AuthorizedHttp
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
+    from googleapiclient.model import JsonModel
 
     GOOGLE_AVAILABLE = True
 except ImportError:
@@ -52,6 +61,26 @@ except ImportError:
             return {"items": []}
 
 
+if GOOGLE_AVAILABLE and orjson is not None:
+
+    class OrjsonModel(JsonModel):
+        """JSON model that decodes API responses with orjson"""
+
+        def deserialize(self, content):
+            try:
+                body = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                return super().deserialize(content)
+            if self._data_wrapper and "data" in body:
+                body = body["data"]
+            return body
+
+    _JSON_MODEL = OrjsonModel()
+else:
+    # googleapiclient picks its default JSON model
+    _JSON_MODEL = None
+
+
 from .base.base_integration import AuthenticationError, BaseIntegration, EvidenceCollectionError
 
 logger = logging.getLogger(__name__)
@@ -78,7 +107,7 @@ class GoogleWorkspaceIntegration(BaseIntegration):
 
         try:
             await self.authenticate()
-            build("admin", "reports_v1", credentials=self._get_credentials())
+            build("admin", "reports_v1", credentials=self._get_credentials(), model=_JSON_MODEL)
             return True
         except Exception as e:
             logger.error(f"Google Workspace connection test failed: {e}")
@@ -90,7 +119,9 @@ class GoogleWorkspaceIntegration(BaseIntegration):
             creds = self._get_credentials()
             if creds and creds.expired and creds.refresh_token:
                 try:
-                    creds.refresh(Request())
+                    # The refresh is a blocking HTTPS call, so keep it off the event loop
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, creds.refresh, Request())
                     # Persist the refreshed credentials
                     self.config.credentials["token"] = creds.token
                     # Here you would trigger a DB update for the user's integration config
@@ -145,13 +176,14 @@ class GoogleWorkspaceIntegration(BaseIntegration):
                 )
 
             creds = self._get_credentials()
-            service = build("admin", "reports_v1", credentials=creds)
+            service = build("admin", "reports_v1", credentials=creds, model=_JSON_MODEL)
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
+            fetch_activities = partial(self._fetch_activities, service, credentials=creds)
 
             # Run API calls in parallel
-            login_events_task = loop.run_in_executor(None, self._fetch_activities, service, "login")
-            admin_events_task = loop.run_in_executor(None, self._fetch_activities, service, "admin")
+            login_events_task = loop.run_in_executor(None, fetch_activities, "login")
+            admin_events_task = loop.run_in_executor(None, fetch_activities, "admin")
 
             login_events, admin_events = await asyncio.gather(
                 login_events_task, admin_events_task, return_exceptions=True
@@ -209,15 +241,18 @@ class GoogleWorkspaceIntegration(BaseIntegration):
             raise EvidenceCollectionError(f"Failed to collect evidence: {e}")
 
     def _fetch_activities(
-        self, service, application_name: str, max_results: int = 100
+        self, service, application_name: str, max_results: int = 100, credentials=None
     ) -> List[Dict]:
         """Helper to fetch activities from the Reports API."""
         try:
-            results = (
-                service.activities()
-                .list(userKey="all", applicationName=application_name, maxResults=max_results)
-                .execute()
+            request = service.activities().list(
+                userKey="all", applicationName=application_name, maxResults=max_results
             )
+            if GOOGLE_AVAILABLE and credentials is not None:
+                # httplib2 is not thread-safe, so concurrent fetches each get their own connection
+                results = request.execute(http=AuthorizedHttp(credentials, http=httplib2.Http()))
+            else:
+                results = request.execute()
 
             activities = results.get("items", [])
             logger.info(
@@ -42,6 +42,7 @@ from api.routers import (
 from api.middleware.error_handler import error_handler_middleware
 from api.middleware.rate_limiter import rate_limit_middleware
 from api.middleware.security_headers import security_headers_middleware
+from api.middleware.security_middleware import MaxConcurrentAuthMiddleware
 from database import (
     test_async_database_connection,
     cleanup_db_connections,
@@ -133,6 +134,7 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 app.middleware("http")(error_handler_middleware)
 app.middleware("http")(security_headers_middleware)
 app.middleware("http")(rate_limit_middleware)
+app.add_middleware(MaxConcurrentAuthMiddleware)
 
 # Include all routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
@@ -1,21 +1,26 @@
 from fastapi import Request
 
+# Security headers, pre-encoded for the raw ASGI header list
+_SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"content-security-policy", b"default-src 'self'"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+]
+# Headers dropped from the response before the security headers are added
+_REPLACED_HEADERS = frozenset(name for name, _ in _SECURITY_HEADERS) | {b"server"}
+
 
 async def security_headers_middleware(request: Request, call_next):
     """Add security headers to all responses"""
     response = await call_next(request)
 
-    # Security headers
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    response.headers["Content-Security-Policy"] = "default-src 'self'"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-
-    # Remove server header
-    if "Server" in response.headers:
-        del response.headers["Server"]
+    # Replace any existing security headers and remove the server header
+    raw_headers = response.raw_headers
+    raw_headers[:] = [header for header in raw_headers if header[0] not in _REPLACED_HEADERS]
+    raw_headers.extend(_SECURITY_HEADERS)
 
     return response
@@ -2,166 +2,410 @@
 Comprehensive security middleware for ruleIQ backend
 """
 
+import asyncio
+import logging
+import os
 import time
 import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Optional
+
 from fastapi import Request, Response
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api.context import request_id_var, user_id_var
 from config.logging_config import get_logger
 
-logger = get_logger(__name__)
+
+class _RequestIdFilter(logging.Filter):
+    """Stamp each record with the current request ID
+
+    Shared request context is attached once here instead of being repeated in
+    the extra dict of every per-request log call.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
 
 
-class SecurityMiddleware(BaseHTTPMiddleware):
+logger = get_logger(__name__)
+logger.addFilter(_RequestIdFilter())
+
+# Upper bound on client IPs tracked by RateLimitMiddleware
+MAX_TRACKED_IPS = 100_000
+
+# Atomically trims a client's sorted set to the window, then records the
+# request if the client is under the limit. Returns 1 if allowed, 0 if not.
+_ROLLING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+redis.call('ZREMRANGEBYSCORE', key, '-inf', ARGV[2])
+if redis.call('ZCARD', key) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', key, ARGV[1], ARGV[5])
+redis.call('EXPIRE', key, ARGV[4])
+return 1
+"""
+
+# Security headers added to every response, encoded once at import
+_SECURITY_HEADERS = [
+    (name.lower().encode("latin-1"), value.encode("latin-1"))
+    for name, value in (
+        ("X-Content-Type-Options", "nosniff"),
+        ("X-Frame-Options", "DENY"),
+        ("X-XSS-Protection", "1; mode=block"),
+        ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+        ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    )
+]
+_SECURITY_HEADER_NAMES = frozenset(name for name, _ in _SECURITY_HEADERS) | {b"x-request-id"}
+
+# CORS headers sent alongside Access-Control-Allow-Origin, encoded once at import
+_CORS_PREFLIGHT_HEADERS = [
+    (name.lower().encode("latin-1"), value.encode("latin-1"))
+    for name, value in (
+        ("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS"),
+        ("Access-Control-Allow-Headers", "Content-Type, Authorization"),
+        ("Access-Control-Allow-Credentials", "true"),
+    )
+]
+_CORS_RESPONSE_HEADERS = [(b"access-control-allow-credentials", b"true")]
+_CORS_RESPONSE_HEADER_NAMES = frozenset(
+    {b"access-control-allow-origin", b"access-control-allow-credentials"}
+)
+
+# Paths whose per-request logs are demoted to DEBUG
+_QUIET_PATH_PREFIXES = ("/health", "/static/")
+_QUIET_PATH_SUFFIXES = ("/health",)
+
+# Request headers never written to RequestLoggingMiddleware's log records
+_SENSITIVE_HEADERS = frozenset(
+    {b"authorization", b"proxy-authorization", b"cookie", b"x-api-key", b"x-csrf-token"}
+)
+
+
+def _log_level_for(path: str) -> int:
+    """Log level for per-request records, DEBUG for health checks and static files"""
+    if path.startswith(_QUIET_PATH_PREFIXES) or path.endswith(_QUIET_PATH_SUFFIXES):
+        return logging.DEBUG
+    return logging.INFO
+
+
+class SecurityMiddleware:
     """Comprehensive security middleware"""
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and add security headers"""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
 
         # Generate request ID for tracing
-        request_id = str(uuid.uuid4())
+        request_id = os.urandom(12).hex()
         request_id_var.set(request_id)
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
+
+        # Log request details, only building the record if it will be emitted
+        log_level = _log_level_for(scope["path"])
+        log_enabled = logger.isEnabledFor(log_level)
+        if log_enabled:
+            client = scope.get("client")
+            logger.log(
+                log_level,
+                "Request started",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "client": client[0] if client else "unknown",
+                    "user_agent": Headers(scope=scope).get("user-agent", "unknown"),
+                },
+            )
 
-        # Log request details
-        logger.info(
-            "Request started",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "client": request.client.host if request.client else "unknown",
-                "user_agent": request.headers.get("user-agent", "unknown"),
-            },
-        )
-
-        # Add security headers to response
-        response = await call_next(request)
-
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["X-Request-ID"] = request_id
-
-        # Calculate response time
-        process_time = time.time() - start_time
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Security headers replace any the application already set
+                headers = [
+                    header
+                    for header in message.get("headers", ())
+                    if header[0].lower() not in _SECURITY_HEADER_NAMES
+                ]
+                headers.extend(_SECURITY_HEADERS)
+                headers.append(request_id_header)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
         # Log response details
-        logger.info(
-            "Request completed",
-            extra={
-                "request_id": request_id,
-                "status_code": response.status_code,
-                "process_time": f"{process_time:.3f}s",
-            },
-        )
-
-        return response
+        if log_enabled:
+            logger.log(
+                log_level,
+                "Request completed",
+                extra={
+                    "status_code": status_code,
+                    "duration_ms": (time.perf_counter_ns() - start_ns) // 1_000_000,
+                },
+            )
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware"""
-
-    def __init__(self, app, max_requests: int = 100, window_seconds: int = 60):
+    """Rate limiting middleware
+
+    With a Redis client the rolling window is shared by every worker; without
+    one each process enforces its own window in memory.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        max_tracked_ips: int = MAX_TRACKED_IPS,
+        redis_client: Optional[Redis] = None,
+        key_prefix: str = "security_rate_limit",
+    ):
         super().__init__(app)
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = {}
+        self.max_tracked_ips = max_tracked_ips
+        # Request timestamps per client IP, least recently seen first
+        self.requests: OrderedDict[str, Deque[float]] = OrderedDict()
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self._window_script = (
+            redis_client.register_script(_ROLLING_WINDOW_SCRIPT) if redis_client else None
+        )
 
     async def dispatch(self, request: Request, call_next):
         """Apply rate limiting"""
         client_ip = request.client.host if request.client else "unknown"
         current_time = time.time()
 
-        # Clean old requests
-        window_start = current_time - self.window_seconds
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests.get(client_ip, []) if req_time > window_start
-        ]
+        if self._window_script is not None:
+            allowed = await self._record_shared(client_ip, current_time)
+        else:
+            allowed = self._record_local(client_ip, current_time)
 
-        # Check rate limit
-        if len(self.requests.get(client_ip, [])) >= self.max_requests:
+        if not allowed:
             logger.warning(
                 "Rate limit exceeded", extra={"client_ip": client_ip, "path": request.url.path}
             )
             return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
 
+        return await call_next(request)
+
+    async def _record_shared(self, client_ip: str, current_time: float) -> bool:
+        """Check and record a request in the Redis window shared by all workers"""
+        try:
+            allowed = await self._window_script(
+                keys=[f"{self.key_prefix}:{client_ip}"],
+                args=[
+                    current_time,
+                    current_time - self.window_seconds,
+                    self.max_requests,
+                    self.window_seconds,
+                    uuid.uuid4().hex,
+                ],
+            )
+        except RedisError as e:
+            # Fail open rather than rejecting traffic while Redis is unavailable
+            logger.error("Redis rate limiter error: %s", e)
+            return True
+        return bool(allowed)
+
+    def _record_local(self, client_ip: str, current_time: float) -> bool:
+        """Check and record a request in this process's window"""
+        timestamps = self.requests.get(client_ip)
+        if timestamps is None:
+            # Evict the least recently seen client to bound memory
+            if len(self.requests) >= self.max_tracked_ips:
+                self.requests.popitem(last=False)
+            timestamps = self.requests[client_ip] = deque()
+        else:
+            self.requests.move_to_end(client_ip)
+
+            # Drop requests that have left the window
+            window_start = current_time - self.window_seconds
+            while timestamps and timestamps[0] <= window_start:
+                timestamps.popleft()
+
+            # Check rate limit
+            if len(timestamps) >= self.max_requests:
+                return False
+
         # Record request
-        if client_ip not in self.requests:
-            self.requests[client_ip] = []
-        self.requests[client_ip].append(current_time)
+        timestamps.append(current_time)
+        return True
+
+
+class MaxConcurrentAuthMiddleware:
+    """Bound in-flight authentication requests and shed load once the queue is full
+
+    Password hashing makes auth requests CPU-heavy, so per-IP rate limits alone
+    do not stop many clients together from saturating a worker.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_concurrent: int = 32,
+        max_waiting: int = 64,
+        path_prefix: str = "/api/v1/auth",
+    ):
+        self.app = app
+        self.max_waiting = max_waiting
+        self.path_prefix = path_prefix
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run auth requests under the concurrency limit"""
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        # Reject immediately rather than queueing requests that would time out
+        if self._semaphore.locked() and self._waiting >= self.max_waiting:
+            logger.warning("Auth concurrency limit exceeded", extra={"path": scope["path"]})
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Authentication service busy"},
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._semaphore.release()
 
 
-class CORSMiddleware(BaseHTTPMiddleware):
+class CORSMiddleware:
     """CORS middleware with security checks"""
 
-    def __init__(self, app, allowed_origins: list):
-        super().__init__(app)
-        self.allowed_origins = allowed_origins
-
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp, allowed_origins: list):
+        self.app = app
+        self.allowed_origins = frozenset(allowed_origins)
+        # Response headers for each allowed origin, encoded once
+        self._preflight_headers_by_origin = {
+            origin: [(b"access-control-allow-origin", origin.encode("latin-1"))]
+            + _CORS_PREFLIGHT_HEADERS
+            for origin in self.allowed_origins
+        }
+        self._response_headers_by_origin = {
+            origin: [(b"access-control-allow-origin", origin.encode("latin-1"))]
+            + _CORS_RESPONSE_HEADERS
+            for origin in self.allowed_origins
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle CORS preflight and requests"""
-        origin = request.headers.get("origin")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = Headers(scope=scope).get("origin")
 
         # Handle preflight requests
-        if request.method == "OPTIONS":
+        if scope["method"] == "OPTIONS":
             response = Response()
-            if origin and origin in self.allowed_origins:
-                response.headers["Access-Control-Allow-Origin"] = origin
-                response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-                response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-                response.headers["Access-Control-Allow-Credentials"] = "true"
-            return response
+            response.raw_headers.extend(self._preflight_headers_by_origin.get(origin, ()))
+            await response(scope, receive, send)
+            return
 
         # Handle actual requests
-        response = await call_next(request)
+        cors_headers = self._response_headers_by_origin.get(origin)
+        if cors_headers is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    header
+                    for header in message.get("headers", ())
+                    if header[0].lower() not in _CORS_RESPONSE_HEADER_NAMES
+                ]
+                message["headers"].extend(cors_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class _LoggedHeaders:
+    """Raw request headers in a log record, formatted only if the record is emitted"""
+
+    __slots__ = ("raw_headers",)
+
+    def __init__(self, raw_headers: list):
+        self.raw_headers = raw_headers
+
+    def __str__(self) -> str:
+        return str(
+            {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in self.raw_headers
+                if name not in _SENSITIVE_HEADERS
+            }
+        )
 
-        if origin and origin in self.allowed_origins:
-            response.headers["Access-Control-Allow-Origin"] = origin
-            response.headers["Access-Control-Allow-Credentials"] = "true"
+    __repr__ = __str__
 
-        return response
 
+class RequestLoggingMiddleware:
+    """Detailed request logging middleware
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Detailed request logging middleware"""
+    The request body is never read here, so streaming uploads reach the route
+    untouched; its size is taken from the Content-Length header instead.
+    """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Log detailed request information"""
-        request_id = request_id_var.get()
-        user_id = user_id_var.get()
-
-        # Log request body for debugging (be careful with sensitive data)
-        body = None
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.body()
-                if len(body) > 1000:  # Truncate large bodies
-                    body = body[:1000] + b"..."
-            except Exception:
-                body = b"<could not read body>"
-
-        logger.info(
-            "Request details",
-            extra={
-                "request_id": request_id,
-                "user_id": str(user_id) if user_id else None,
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": dict(request.query_params),
-                "headers": dict(request.headers),
-                "body_length": len(body) if body else 0,
-            },
-        )
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log_level = _log_level_for(scope["path"])
+        if logger.isEnabledFor(log_level):
+            headers = Headers(scope=scope)
+            content_length = headers.get("content-length", "")
+
+            logger.log(
+                log_level,
+                "Request details",
+                extra={
+                    # Left as a UUID; the JSON formatter renders it only on output
+                    "user_id": user_id_var.get(),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query_string": scope["query_string"].decode("latin-1"),
+                    "headers": _LoggedHeaders(scope["headers"]),
+                    "content_length": int(content_length) if content_length.isdigit() else 0,
+                },
+            )
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
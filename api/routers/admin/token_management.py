@@ -8,14 +8,14 @@ Provides administrative tools for:
 - Performing maintenance operations
 """
 
-from datetime import datetime
 from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from api.dependencies.auth import get_current_active_user
 from api.dependencies.token_blacklist import get_token_blacklist
+from api.utils.timestamps import cached_iso_now
 from database.user import User
 
 router = APIRouter(prefix="/admin/tokens", tags=["admin", "token-management"])
@@ -24,6 +24,8 @@ router = APIRouter(prefix="/admin/tokens", tags=["admin", "token-management"])
 class BlacklistStatsResponse(BaseModel):
     """Response model for blacklist statistics."""
 
+    model_config = ConfigDict(frozen=True)
+
     current_blacklisted_tokens: int
     total_blacklisted: int
     blacklisted_today: int
@@ -36,6 +38,8 @@ class BlacklistStatsResponse(BaseModel):
 class BlacklistEntryResponse(BaseModel):
     """Response model for blacklist entry details."""
 
+    model_config = ConfigDict(frozen=True)
+
     token_hash: str
     reason: str
     blacklisted_at: str
@@ -50,6 +54,8 @@ class BlacklistEntryResponse(BaseModel):
 class TokenActionRequest(BaseModel):
     """Request model for token actions."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     token: str
     reason: Optional[str] = "administrative_action"
 
@@ -57,6 +63,8 @@ class TokenActionRequest(BaseModel):
 class BulkTokenActionRequest(BaseModel):
     """Request model for bulk token actions."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     user_id: str
     reason: str = "security_action"
     exclude_current_token: Optional[str] = None
@@ -163,7 +171,7 @@ async def cleanup_expired_tokens(admin_user: User = Depends(require_admin_role))
     return {
         "message": f"Cleaned up {cleaned_count} expired tokens",
         "tokens_cleaned": cleaned_count,
-        "cleanup_time": datetime.utcnow().isoformat(),
+        "cleanup_time": cached_iso_now(),
     }
 
 
@@ -192,14 +200,14 @@ async def get_blacklist_health(admin_user: User = Depends(require_admin_role)):
             "status": health_status,
             "issues": issues,
             "statistics": stats,
-            "last_check": datetime.utcnow().isoformat(),
+            "last_check": cached_iso_now(),
         }
 
     except Exception as e:
         return {
             "status": "error",
             "issues": [f"Blacklist system error: {str(e)}"],
-            "last_check": datetime.utcnow().isoformat(),
+            "last_check": cached_iso_now(),
         }
 
 
@@ -1,22 +1,25 @@
-from datetime import timedelta
-from datetime import datetime
+import asyncio
+from typing import Optional, Tuple
+from urllib.parse import parse_qs
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from api.dependencies.auth import (
-    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ACCESS_TOKEN_EXPIRES,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
+    get_password_hash_async,
     oauth2_scheme,
-    verify_password,
+    verify_password_async,
 )
 from api.middleware.rate_limiter import auth_rate_limit
 from api.schemas.models import Token, UserCreate, UserResponse
+from api.utils.timestamps import cached_iso_now
 from database.db_setup import get_db
 from database.user import User
 from services.auth_service import auth_service
@@ -29,6 +32,24 @@ class LoginRequest(BaseModel):
 
 router = APIRouter()
 
+# OpenAPI description of the /token form, which is parsed by hand
+_PASSWORD_FORM_SCHEMA = {
+    "required": True,
+    "content": {
+        "application/x-www-form-urlencoded": {
+            "schema": {
+                "type": "object",
+                "required": ["username", "password"],
+                "properties": {
+                    "grant_type": {"type": "string", "pattern": "password"},
+                    "username": {"type": "string"},
+                    "password": {"type": "string", "format": "password"},
+                },
+            }
+        }
+    },
+}
+
 
 class RegisterResponse(BaseModel):
     user: UserResponse
@@ -42,43 +63,68 @@ class RegisterResponse(BaseModel):
     dependencies=[Depends(auth_rate_limit())],
 )
 async def register(user: UserCreate, db: Session = Depends(get_db)):
-    # Check if user exists
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
+    # Create the user unless the email is taken, in a single race-free round trip
+    hashed_password = await get_password_hash_async(user.password)
+    stmt = (
+        insert(User)
+        .values(id=uuid4(), email=user.email, hashed_password=hashed_password, is_active=True)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
+    )
+    db_user = db.execute(stmt).scalar_one_or_none()
+    if db_user is None:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
 
-    # Create new user
-    hashed_password = get_password_hash(user.password)
-    db_user = User(id=uuid4(), email=user.email, hashed_password=hashed_password, is_active=True)
-    db.add(db_user)
+    # Read the new row before commit expires it
+    user_response = UserResponse(
+        id=db_user.id,
+        email=db_user.email,
+        is_active=db_user.is_active,
+        created_at=db_user.created_at,
+    )
     db.commit()
-    db.refresh(db_user)
 
     # Create tokens for the new user (auto-login after registration)
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(db_user.id)}, expires_delta=access_token_expires
+        data={"sub": str(user_response.id)}, expires_delta=ACCESS_TOKEN_EXPIRES
     )
-    refresh_token = create_refresh_token(data={"sub": str(db_user.id)})
+    refresh_token = create_refresh_token(data={"sub": str(user_response.id)})
 
     return RegisterResponse(
-        user=UserResponse(
-            id=db_user.id,
-            email=db_user.email,
-            is_active=db_user.is_active,
-            created_at=db_user.created_at,
-        ),
+        user=user_response,
         tokens=Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer"),
     )
 
 
-@router.post("/token", response_model=Token, dependencies=[Depends(auth_rate_limit())])
-async def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
-):
+def _parse_password_form(body: bytes) -> Tuple[str, str]:
+    """Read username and password from an OAuth2 password grant form body."""
+    try:
+        form = parse_qs(body.decode("ascii"), max_num_fields=10)
+    except (UnicodeDecodeError, ValueError):
+        form = {}
+    username = form.get("username", [""])[0]
+    password = form.get("password", [""])[0]
+    if not username or not password:
+        raise HTTPException(
+            status_code=422,
+            detail="username and password form fields are required",
+        )
+    return username, password
+
+
+@router.post(
+    "/token",
+    response_model=Token,
+    dependencies=[Depends(auth_rate_limit())],
+    openapi_extra={"requestBody": _PASSWORD_FORM_SCHEMA},
+)
+async def login_for_access_token(request: Request, db: Session = Depends(get_db)):
+    # Parse the form directly; a password grant never needs multipart handling
+    username, password = _parse_password_form(await request.body())
+
     # Authenticate user
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = db.execute(select(User).where(User.email == username)).scalar_one_or_none()
+    if not user or not await verify_password_async(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -86,9 +132,8 @@ async def login_for_access_token(
         )
 
     # Create tokens
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+        data={"sub": str(user.id)}, expires_delta=ACCESS_TOKEN_EXPIRES
     )
 
     # Create session for tracking
@@ -104,8 +149,8 @@ async def login_for_access_token(
 async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """Login endpoint - accepts JSON data for compatibility with tests"""
     # Authenticate user
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    user = db.execute(select(User).where(User.email == login_data.email)).scalar_one_or_none()
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -113,9 +158,8 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
         )
 
     # Create tokens
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+        data={"sub": str(user.id)}, expires_delta=ACCESS_TOKEN_EXPIRES
     )
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
@@ -125,6 +169,17 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 
+def _subject_user_id(payload: dict) -> Optional[UUID]:
+    """User ID from a token's subject claim, or None if it is missing or not a UUID."""
+    subject = payload.get("sub")
+    if not isinstance(subject, str):
+        return None
+    try:
+        return UUID(subject)
+    except ValueError:
+        return None
+
+
 @router.post("/refresh", response_model=Token, dependencies=[Depends(auth_rate_limit())])
 async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
     from api.dependencies.auth import decode_token
@@ -135,8 +190,14 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
         )
 
-    user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    # Reject malformed subjects before touching the database
+    user_id = _subject_user_id(payload)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+
+    user = db.get(User, user_id)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
 
@@ -164,15 +225,15 @@ async def get_current_user(db: Session = Depends(get_db), token: str = Depends(o
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id = payload.get("sub")
-    if not user_id:
+    user_id = _subject_user_id(payload)
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -194,23 +255,31 @@ async def logout(request: Request, token: str = Depends(oauth2_scheme)):
     from api.dependencies.auth import blacklist_token, decode_token
 
     if token:
-        # Enhanced blacklist with metadata
-        await blacklist_token(
-            token,
-            reason="user_logout",
-            ip_address=getattr(request.client, "host", None),
-            user_agent=request.headers.get("user-agent"),
-            metadata={"logout_timestamp": datetime.utcnow().isoformat()},
-        )
-
-        # Also invalidates sessions
+        # Decode first so session invalidation can run alongside the blacklist write
         try:
             payload = decode_token(token)
-            if payload and payload.get("sub"):
-                user_id = UUID(payload["sub"])
-                await auth_service.logout_user(user_id)
+            user_id = UUID(payload["sub"]) if payload and payload.get("sub") else None
         except Exception:
             # If token decode fails, still consider logout successful
-            pass
+            user_id = None
+
+        async def invalidate_sessions() -> None:
+            try:
+                await auth_service.logout_user(user_id)
+            except Exception:
+                # Session cleanup failures do not fail the logout
+                pass
+
+        # Enhanced blacklist with metadata, and also invalidates sessions
+        await asyncio.gather(
+            blacklist_token(
+                token,
+                reason="user_logout",
+                ip_address=getattr(request.client, "host", None),
+                user_agent=request.headers.get("user-agent"),
+                metadata={"logout_timestamp": cached_iso_now()},
+            ),
+            *([invalidate_sessions()] if user_id is not None else []),
+        )
 
     return {"message": "Successfully logged out"}
\ No newline at end of file
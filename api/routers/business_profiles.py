@@ -1,7 +1,9 @@
+from datetime import datetime
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
@@ -21,6 +23,66 @@ router = APIRouter()
 
 # Field mapping no longer needed - column names match API field names after migration
 
+# Fields an existing profile may have updated
+UPDATABLE_FIELDS = frozenset(
+    {
+        "company_name",
+        "industry",
+        "company_size",
+        "description",
+        "data_sensitivity",
+        "geographic_scope",
+        "target_frameworks",
+    }
+)
+
+# Core table for statements that return plain rows instead of ORM entities
+_PROFILE_TABLE = BusinessProfile.__table__
+
+# Statements built once and executed with bound parameters
+_SELECT_ROW_BY_USER = select(_PROFILE_TABLE).where(_PROFILE_TABLE.c.user_id == bindparam("user_id"))
+_SELECT_ROW_BY_ID = select(_PROFILE_TABLE).where(_PROFILE_TABLE.c.id == bindparam("profile_id"))
+_SELECT_OWNER_BY_ID = select(_PROFILE_TABLE.c.user_id).where(
+    _PROFILE_TABLE.c.id == bindparam("profile_id")
+)
+_DELETE_BY_ID = delete(_PROFILE_TABLE).where(_PROFILE_TABLE.c.id == bindparam("profile_id"))
+
+# Updatable fields that are stored as columns and can be written in an UPDATE
+_UPDATABLE_COLUMNS = UPDATABLE_FIELDS & frozenset(_PROFILE_TABLE.columns.keys())
+
+
+def _column_values(validated_data: dict) -> dict:
+    """Pick the updatable column values out of validated request data."""
+    return {key: validated_data[key] for key in validated_data.keys() & _UPDATABLE_COLUMNS}
+
+
+async def _update_profile(db: AsyncSession, condition, validated_data: dict):
+    """Write validated updates to the matching profile and return it in one round trip."""
+    values = _column_values(validated_data)
+    if values:
+        # The updated_at field is automatically handled by the column's onupdate
+        stmt = update(_PROFILE_TABLE).where(condition).values(**values).returning(_PROFILE_TABLE)
+    else:
+        stmt = select(_PROFILE_TABLE).where(condition)
+    row = (await db.execute(stmt)).first()
+    await db.commit()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
+        )
+    return BusinessProfileResponse.model_validate(row._mapping)
+
+
+async def _profile_owner_id(db: AsyncSession, profile_id: UUID) -> UUID:
+    """Look up the owner of a profile for the RBAC access check."""
+    result = await db.execute(_SELECT_OWNER_BY_ID, {"profile_id": profile_id})
+    owner_id = result.scalar_one_or_none()
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
+        )
+    return owner_id
+
 
 @router.post("/", response_model=BusinessProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_business_profile(
@@ -28,55 +90,29 @@ async def create_business_profile(
     current_user: UserWithRoles = Depends(require_permission("user_create")),
     db: AsyncSession = Depends(get_async_db),
 ):
-    # Check if profile already exists
-    stmt = select(BusinessProfile).where(BusinessProfile.user_id == current_user["id"])
-    result = await db.execute(stmt)
-    existing = result.scalars().first()
-
-    if existing:
-        # Instead of deleting and recreating, update the existing profile
-        # This prevents foreign key constraint violations with evidence_items
-        profile_data = profile.model_dump()
-
-        # Validate input data against whitelist and security patterns
-        try:
-            validated_data = validate_business_profile_update(profile_data)
-        except ValidationError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-
-        # Update existing profile fields with validated data
-        ALLOWED_FIELDS = [
-            "company_name",
-            "industry",
-            "company_size",
-            "description",
-            "data_sensitivity",
-            "geographic_scope",
-            "target_frameworks",
-        ]
-        for key, value in validated_data.items():
-            if key in ALLOWED_FIELDS:
-                setattr(existing, key, value)
-
-        # The updated_at field is automatically handled by the database
-        await db.commit()
-        await db.refresh(existing)
-        return existing
-    else:
-        # Create new profile only if none exists
-        profile_data = profile.model_dump()
+    profile_data = profile.model_dump()
 
-        # Validate input data against whitelist and security patterns
-        try:
-            validated_data = validate_business_profile_update(profile_data)
-        except ValidationError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+    # Validate input data against whitelist and security patterns
+    try:
+        validated_data = validate_business_profile_update(profile_data)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        db_profile = BusinessProfile(id=uuid4(), user_id=current_user["id"], **validated_data)
-        db.add(db_profile)
-        await db.commit()
-        await db.refresh(db_profile)
-        return db_profile
+    # Create the profile, or update the existing one in place so evidence_items
+    # keep their foreign key; user_id is unique so the conflict is on the owner
+    updates = _column_values(validated_data)
+    stmt = (
+        pg_insert(_PROFILE_TABLE)
+        .values(id=uuid4(), user_id=current_user["id"], **validated_data)
+        .on_conflict_do_update(
+            index_elements=[_PROFILE_TABLE.c.user_id],
+            set_={**updates, "updated_at": datetime.utcnow()},
+        )
+        .returning(_PROFILE_TABLE)
+    )
+    row = (await db.execute(stmt)).one()
+    await db.commit()
+    return BusinessProfileResponse.model_validate(row._mapping)
 
 
 @router.get("/", response_model=BusinessProfileResponse)
@@ -84,14 +120,13 @@ async def get_business_profile(
     current_user: UserWithRoles = Depends(require_permission("user_list")), 
     db: AsyncSession = Depends(get_async_db)
 ):
-    stmt = select(BusinessProfile).where(BusinessProfile.user_id == current_user["id"])
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    if not profile:
+    # Read the plain row; the response is read-only so no ORM entity is needed
+    row = (await db.execute(_SELECT_ROW_BY_USER, {"user_id": current_user["id"]})).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
         )
-    return profile
+    return BusinessProfileResponse.model_validate(row._mapping)
 
 
 @router.get("/{profile_id}", response_model=BusinessProfileResponse)
@@ -102,27 +137,23 @@ async def get_business_profile_by_id(
     sync_db: Session = Depends(get_db),
 ):
     """Get a specific business profile by ID - access controlled by RBAC data visibility."""
-    # First get the profile to check ownership
-    stmt = select(BusinessProfile).where(BusinessProfile.id == profile_id)
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    
-    if not profile:
+    # First get the profile row to check ownership
+    row = (await db.execute(_SELECT_ROW_BY_ID, {"profile_id": profile_id})).first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
         )
-    
+
     # Check data access permissions
     data_access_service = DataAccessService(sync_db)
-    if not data_access_service.can_access_business_profile(
-        current_user, profile_id, profile.user_id
-    ):
+    if not data_access_service.can_access_business_profile(current_user, profile_id, row.user_id):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, 
-            detail="Access denied: Insufficient permissions to view this profile"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: Insufficient permissions to view this profile",
         )
-    
-    return profile
+
+    return BusinessProfileResponse.model_validate(row._mapping)
 
 
 @router.put("/", response_model=BusinessProfileResponse)
@@ -131,14 +162,6 @@ async def update_business_profile(
     current_user: UserWithRoles = Depends(require_permission("user_update")),
     db: AsyncSession = Depends(get_async_db),
 ):
-    stmt = select(BusinessProfile).where(BusinessProfile.user_id == current_user["id"])
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
-        )
-
     update_data = profile_update.model_dump(exclude_unset=True)
     # Remove fields that are not in the BusinessProfile model
     update_data.pop("data_sensitivity", None)  # Temporarily removed until migration is run
@@ -149,24 +172,7 @@ async def update_business_profile(
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    ALLOWED_FIELDS = [
-        "company_name",
-        "industry",
-        "company_size",
-        "description",
-        "data_sensitivity",
-        "geographic_scope",
-        "target_frameworks",
-    ]
-    for key, value in validated_data.items():
-        if key in ALLOWED_FIELDS:
-            setattr(profile, key, value)
-
-    # The updated_at field is automatically handled by the database
-    await db.commit()
-    await db.refresh(profile)
-
-    return profile
+    return await _update_profile(db, _PROFILE_TABLE.c.user_id == current_user["id"], validated_data)
 
 
 @router.put("/{profile_id}", response_model=BusinessProfileResponse)
@@ -178,24 +184,15 @@ async def update_business_profile_by_id(
     sync_db: Session = Depends(get_db),
 ):
     """Update a specific business profile by ID - access controlled by RBAC data visibility."""
-    # First get the profile to check ownership
-    stmt = select(BusinessProfile).where(BusinessProfile.id == profile_id)
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
-        )
-    
+    # First get the profile owner to check ownership
+    owner_id = await _profile_owner_id(db, profile_id)
+
     # Check data access permissions
     data_access_service = DataAccessService(sync_db)
-    if not data_access_service.can_access_business_profile(
-        current_user, profile_id, profile.user_id
-    ):
+    if not data_access_service.can_access_business_profile(current_user, profile_id, owner_id):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, 
-            detail="Access denied: Insufficient permissions to update this profile"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: Insufficient permissions to update this profile",
         )
 
     update_data = profile_update.model_dump(exclude_unset=True)
@@ -208,24 +205,7 @@ async def update_business_profile_by_id(
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    ALLOWED_FIELDS = [
-        "company_name",
-        "industry",
-        "company_size",
-        "description",
-        "data_sensitivity",
-        "geographic_scope",
-        "target_frameworks",
-    ]
-    for key, value in validated_data.items():
-        if key in ALLOWED_FIELDS:
-            setattr(profile, key, value)
-
-    # The updated_at field is automatically handled by the database
-    await db.commit()
-    await db.refresh(profile)
-
-    return profile
+    return await _update_profile(db, _PROFILE_TABLE.c.id == profile_id, validated_data)
 
 
 @router.delete("/{profile_id}")
@@ -236,27 +216,20 @@ async def delete_business_profile_by_id(
     sync_db: Session = Depends(get_db),
 ):
     """Delete a specific business profile by ID - access controlled by RBAC data visibility."""
-    # First get the profile to check ownership
-    stmt = select(BusinessProfile).where(BusinessProfile.id == profile_id)
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
-        )
-    
+    # First get the profile owner to check ownership
+    owner_id = await _profile_owner_id(db, profile_id)
+
     # Check data access permissions
     data_access_service = DataAccessService(sync_db)
-    if not data_access_service.can_access_business_profile(
-        current_user, profile_id, profile.user_id
-    ):
+    if not data_access_service.can_access_business_profile(current_user, profile_id, owner_id):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, 
-            detail="Access denied: Insufficient permissions to delete this profile"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: Insufficient permissions to delete this profile",
         )
 
-    await db.delete(profile)
+    # Delete by primary key rather than through the ORM, which would first lazy-load
+    # evidence_items to detach them; the foreign key still guards linked evidence
+    await db.execute(_DELETE_BY_ID, {"profile_id": profile_id})
     await db.commit()
 
     return {"message": "Business profile deleted successfully"}
@@ -271,24 +244,15 @@ async def patch_business_profile(
     sync_db: Session = Depends(get_db),
 ):
     """Update a specific business profile by ID with partial data - access controlled by RBAC."""
-    # First get the profile to check ownership
-    stmt = select(BusinessProfile).where(BusinessProfile.id == profile_id)
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Business profile not found"
-        )
-    
+    # First get the profile owner to check ownership
+    owner_id = await _profile_owner_id(db, profile_id)
+
     # Check data access permissions
     data_access_service = DataAccessService(sync_db)
-    if not data_access_service.can_access_business_profile(
-        current_user, profile_id, profile.user_id
-    ):
+    if not data_access_service.can_access_business_profile(current_user, profile_id, owner_id):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, 
-            detail="Access denied: Insufficient permissions to update this profile"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: Insufficient permissions to update this profile",
         )
 
     update_data = profile_update.model_dump(exclude_unset=True)
@@ -298,7 +262,8 @@ async def patch_business_profile(
     # Handle version-based optimistic locking if version is provided
     if "version" in update_data:
         expected_version = update_data.pop("version")
-        current_version = getattr(profile, "version", 1)
+        # Profiles are not versioned yet, so every profile is at version 1
+        current_version = 1
         if expected_version != current_version:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -313,21 +278,4 @@ async def patch_business_profile(
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    ALLOWED_FIELDS = [
-        "company_name",
-        "industry",
-        "company_size",
-        "description",
-        "data_sensitivity",
-        "geographic_scope",
-        "target_frameworks",
-    ]
-    for key, value in validated_data.items():
-        if key in ALLOWED_FIELDS:
-            setattr(profile, key, value)
-
-    # The updated_at field is automatically handled by the database
-    await db.commit()
-    await db.refresh(profile)
-
-    return profile
+    return await _update_profile(db, _PROFILE_TABLE.c.id == profile_id, validated_data)
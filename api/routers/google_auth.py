@@ -4,7 +4,6 @@ Handles Google Sign-In integration for the ruleIQ platform
 """
 
 import secrets
-from datetime import timedelta
 from uuid import uuid4
 from typing import Optional
 
@@ -14,7 +13,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 import httpx
 
-from api.dependencies.auth import create_access_token, create_refresh_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from api.dependencies.auth import create_access_token, create_refresh_token, ACCESS_TOKEN_EXPIRES
 from api.middleware.rate_limiter import auth_rate_limit
 from api.schemas.models import Token, UserResponse
 from config.settings import get_settings
@@ -184,10 +183,9 @@ async def google_callback(
             db.commit()
     
     # Create JWT tokens
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(db_user.id)}, 
-        expires_delta=access_token_expires
+        expires_delta=ACCESS_TOKEN_EXPIRES
     )
     refresh_token = create_refresh_token(data={"sub": str(db_user.id)})
     
@@ -291,10 +289,9 @@ async def google_mobile_login(
             db.commit()
     
     # Create JWT tokens
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(db_user.id)}, 
-        expires_delta=access_token_expires
+        expires_delta=ACCESS_TOKEN_EXPIRES
     )
     refresh_token = create_refresh_token(data={"sub": str(db_user.id)})
     
@@ -0,0 +1,24 @@
+"""
+Timestamp helpers for response metadata.
+"""
+
+import time
+from datetime import datetime, timezone
+
+# (epoch second, formatted timestamp) of the last call to cached_iso_now
+_cache = (-1, "")
+
+
+def cached_iso_now() -> str:
+    """Current UTC time as a naive ISO 8601 string at second precision.
+
+    The string is formatted at most once per second and reused in between, which
+    suits response metadata but not records that need sub-second precision.
+    """
+    global _cache
+    second = time.time_ns() // 1_000_000_000
+    cached_second, formatted = _cache
+    if second != cached_second:
+        formatted = datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+        _cache = (second, formatted)
+    return formatted
@@ -1,11 +1,46 @@
 import re
+import threading
+from functools import lru_cache
 
-import bleach
+from bleach.sanitizer import Cleaner
 
 # Regex patterns
 EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 SAFE_STRING_REGEX = re.compile(r"^[a-zA-Z0-9\s\-_.,!?]+$")
 UUID_REGEX = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+URL_REGEX = re.compile(
+    r"^https?://"  # http:// or https://
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"  # domain...
+    r"localhost|"  # localhost...
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
+    r"(?::\d+)?"  # optional port
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
+# Strings bleach returns unchanged (SAFE_STRING_REGEX minus the \r, \f and \v it rewrites)
+_BLEACH_NOOP_REGEX = re.compile(r"[a-zA-Z0-9 \t\n\-_.,!?]*")
+
+# Inputs up to this many characters have their sanitised form cached; longer ones,
+# which rarely repeat, are always cleaned afresh so the cache stays small
+SANITIZE_CACHE_MAX_LENGTH = 1024
+
+ALLOWED_HTML_TAGS = frozenset({"b", "i", "u", "em", "strong", "p", "br", "ul", "li", "ol"})
+
+
+class _ThreadCleaners(threading.local):
+    """Reusable bleach cleaners; their parsers keep state, so each thread gets its own"""
+
+    def __init__(self):
+        self.html = Cleaner(tags=ALLOWED_HTML_TAGS, strip=True)
+        self.plain = Cleaner(tags=set(), strip=True)
+
+
+_CLEANERS = _ThreadCleaners()
+
+
+@lru_cache(maxsize=4096)
+def _cached_sanitize_html(value: str) -> str:
+    return _CLEANERS.html.clean(value)
 
 
 class InputValidators:
@@ -14,8 +49,9 @@ class InputValidators:
     @staticmethod
     def sanitize_html(value: str) -> str:
         """Remove dangerous HTML tags"""
-        allowed_tags = ["b", "i", "u", "em", "strong", "p", "br", "ul", "li", "ol"]
-        return bleach.clean(value, tags=allowed_tags, strip=True)
+        if len(value) > SANITIZE_CACHE_MAX_LENGTH:
+            return _CLEANERS.html.clean(value)
+        return _cached_sanitize_html(value)
 
     @staticmethod
     def validate_email(email: str) -> str:
@@ -28,8 +64,11 @@ class InputValidators:
         """Validate string contains only safe characters"""
         if len(value) > max_length:
             raise ValueError(f"String exceeds maximum length of {max_length}")
+        # Plain text has no markup to strip, so skip the HTML parser
+        if _BLEACH_NOOP_REGEX.fullmatch(value):
+            return value.strip()
         # Remove any HTML/script tags
-        cleaned = bleach.clean(value, tags=[], strip=True)
+        cleaned = _CLEANERS.plain.clean(value)
         return cleaned.strip()
 
     @staticmethod
@@ -44,17 +83,7 @@ class InputValidators:
     @staticmethod
     def validate_url(url: str) -> str:
         """Validate URL format"""
-        url_regex = re.compile(
-            r"^https?://"  # http:// or https://
-            r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"  # domain...
-            r"localhost|"  # localhost...
-            r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
-            r"(?::\d+)?"  # optional port
-            r"(?:/?|[/?]\S+)$",
-            re.IGNORECASE,
-        )
-
-        if not url_regex.match(url):
+        if not URL_REGEX.match(url):
             raise ValueError("Invalid URL format")
         return url
 
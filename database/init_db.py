@@ -8,6 +8,7 @@ Run this script after setting up your DATABASE_URL environment variable.
 import asyncio
 import os
 import sys
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from sqlalchemy import select
@@ -26,6 +27,9 @@ from services.framework_service import initialize_default_frameworks  # noqa: E4
 setup_logging()
 logger = get_logger(__name__)
 
+# One session shared by every initialization step
+async_session = asynccontextmanager(get_async_db)
+
 
 async def create_tables():
     """Run Alembic migrations to create/update database tables."""
@@ -50,14 +54,12 @@ async def create_tables():
         return False
 
 
-async def populate_default_data():
+async def populate_default_data(db):
     """Populate database with default frameworks and data asynchronously."""
     logger.info("Populating default data...")
     try:
-        async for db in get_async_db():
-            await initialize_default_frameworks(db)
-            # Ensure to commit if initialize_default_frameworks doesn't commit itself for new items
-            # However, initialize_default_frameworks already handles its commit.
+        # initialize_default_frameworks commits its own inserts
+        await initialize_default_frameworks(db)
         logger.info("Default frameworks initialized successfully.")
         return True
     except Exception as e:
@@ -65,12 +67,13 @@ async def populate_default_data():
         return False
 
 
-async def test_connection():
+async def test_connection(db):
     """Test database connection asynchronously."""
     logger.info("Testing database connection...")
     try:
-        async for db in get_async_db():
-            await db.execute(select(1))
+        await db.execute(select(1))
+        # End the read transaction so it is not held open while migrations run
+        await db.rollback()
         logger.info("Database connection successful.")
         return True
     except Exception as e:
@@ -90,14 +93,16 @@ async def main():
 
     logger.info(f"Database URL: {database_url}")
 
-    if not await test_connection():
-        return False
+    # Each step depends on the one before, so they run in order on one session
+    async with async_session() as db:
+        if not await test_connection(db):
+            return False
 
-    if not await create_tables():
-        return False
+        if not await create_tables():
+            return False
 
-    if not await populate_default_data():
-        return False
+        if not await populate_default_data(db):
+            return False
 
     logger.info("Database initialization completed successfully!")
     return True
@@ -116,6 +116,11 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Error cancelling monitoring task: {e}")
 
+    # Close HTTP sessions shared by the enterprise API clients
+    from api.clients.base_api_client import close_shared_sessions
+
+    await close_shared_sessions()
+
 
 app = FastAPI(
     title="ruleIQ Compliance Automation API",
@@ -195,6 +200,11 @@ from api.middleware.rate_limiter import rate_limit_middleware
 
 app.middleware("http")(rate_limit_middleware)
 
+# Bound concurrent authentication requests
+from api.middleware.security_middleware import MaxConcurrentAuthMiddleware
+
+app.add_middleware(MaxConcurrentAuthMiddleware)
+
 # Security headers
 from api.middleware.security_headers import security_headers_middleware
 
@@ -35,8 +35,8 @@ async def create_or_update_business_profile(
             profile = BusinessProfile(user_id=user.id, **profile_data)
             db.add(profile)
 
+        # The async session keeps attributes loaded after commit, so no refresh is needed
         await db.commit()
-        await db.refresh(profile)
         return profile
     except SQLAlchemyError as e:
         await db.rollback()
@@ -67,7 +67,6 @@ async def update_assessment_status(
         profile.updated_at = datetime.utcnow()
 
         await db.commit()
-        await db.refresh(profile)
 
         return profile
     except SQLAlchemyError as e:
@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 from uuid import UUID
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -196,12 +197,16 @@ async def initialize_default_frameworks(db: AsyncSession):
     ]
 
     try:
-        for framework_data in frameworks_data:
-            existing = await get_framework_by_name(db, framework_data["name"])
-            if not existing:
-                logger.info(f"Creating new framework: {framework_data['name']}")
-                framework = ComplianceFramework(**framework_data)
-                db.add(framework)
+        # One multi-row INSERT; frameworks that already exist are left untouched
+        stmt = (
+            pg_insert(ComplianceFramework)
+            .values(frameworks_data)
+            .on_conflict_do_nothing(index_elements=[ComplianceFramework.name])
+            .returning(ComplianceFramework.name)
+        )
+        result = await db.execute(stmt)
+        for name in result.scalars():
+            logger.info(f"Created new framework: {name}")
         await db.commit()
     except SQLAlchemyError as e:
         await db.rollback()
@@ -186,6 +186,7 @@ mock_botocore.exceptions.BotoCoreError = Exception
 sys.modules["boto3"] = mock_boto3
 sys.modules["botocore"] = mock_botocore
 sys.modules["botocore.exceptions"] = mock_botocore.exceptions
+sys.modules["botocore.config"] = mock_botocore.config
 sys.modules["google.generativeai.caching"] = mock_genai.caching
 
 # =============================================================================
@@ -279,8 +280,18 @@ mock_redis_asyncio = unittest.mock.MagicMock()
 mock_redis_asyncio.Redis = MockRedis
 mock_redis_asyncio.from_url = MockRedis
 
+# Mock redis.exceptions with real exception classes so code can catch them
+class MockRedisError(Exception):
+    """Stand-in for redis.exceptions.RedisError."""
+
+
+mock_redis_exceptions = unittest.mock.MagicMock()
+mock_redis_exceptions.RedisError = MockRedisError
+mock_redis_module.exceptions = mock_redis_exceptions
+
 sys.modules["redis"] = mock_redis_module
 sys.modules["redis.asyncio"] = mock_redis_asyncio
+sys.modules["redis.exceptions"] = mock_redis_exceptions
 
 # =============================================================================
 # MOCK ASYNCPG TO AVOID MISSING DEPENDENCY
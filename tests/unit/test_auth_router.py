@@ -0,0 +1,122 @@
+"""
+Unit tests for authentication router helpers
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from api.routers.auth import _parse_password_form, _subject_user_id, logout
+
+
+@pytest.mark.unit
+class TestPasswordForm:
+    """Test parsing the /token password grant form"""
+
+    def test_fields_decoded(self):
+        """Test percent-encoded credentials are decoded"""
+        body = b"grant_type=password&username=user%40example.com&password=p%26ss+word"
+
+        assert _parse_password_form(body) == ("user@example.com", "p&ss word")
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"",
+            b"username=user%40example.com",
+            b"password=secret",
+            "username=café&password=x".encode(),
+            b"&".join(b"f%d=1" % i for i in range(20)),
+        ],
+    )
+    def test_invalid_form_rejected(self, body):
+        """Test missing fields, non-ASCII bodies and oversized forms are rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            _parse_password_form(body)
+
+        assert exc_info.value.status_code == 422
+
+
+@pytest.mark.unit
+class TestSubjectUserId:
+    """Test reading the user ID from a token subject"""
+
+    def test_valid_subject(self):
+        """Test a UUID subject is parsed"""
+        user_id = uuid4()
+
+        assert _subject_user_id({"sub": str(user_id)}) == user_id
+
+    @pytest.mark.parametrize("payload", [{}, {"sub": None}, {"sub": ""}, {"sub": "1"}, {"sub": 1}])
+    def test_malformed_subject(self, payload):
+        """Test missing or malformed subjects yield None instead of reaching the database"""
+        assert _subject_user_id(payload) is None
+
+
+@pytest.mark.unit
+class TestLogout:
+    """Test logging out"""
+
+    @pytest.fixture
+    def logout_request(self):
+        """Logout request from a known client address"""
+        return Request(
+            {"type": "http", "method": "POST", "path": "/", "headers": [], "client": ("1.2.3.4", 1)}
+        )
+
+    @pytest.mark.asyncio
+    async def test_blacklist_and_sessions_overlap(self, monkeypatch, logout_request):
+        """Test the token blacklist write and session invalidation run concurrently"""
+        user_id = uuid4()
+        calls = []
+        both_started = asyncio.Event()
+
+        async def slow(name, *args, **kwargs):
+            # Neither call can finish until the other has started, so running
+            # them one after the other would time out below
+            calls.append((name, args, kwargs))
+            if len(calls) == 2:
+                both_started.set()
+            await both_started.wait()
+
+        monkeypatch.setattr(
+            "api.dependencies.auth.blacklist_token", lambda *a, **k: slow("blacklist", *a, **k)
+        )
+        monkeypatch.setattr("api.dependencies.auth.decode_token", lambda t: {"sub": str(user_id)})
+        monkeypatch.setattr(
+            "api.routers.auth.auth_service.logout_user", lambda uid: slow("logout", uid)
+        )
+
+        result = await asyncio.wait_for(logout(logout_request, token="token"), timeout=1)
+
+        assert result == {"message": "Successfully logged out"}
+        assert [name for name, _, _ in calls] == ["blacklist", "logout"]
+        assert calls[0][2]["ip_address"] == "1.2.3.4"
+        assert calls[1][1] == (user_id,)
+
+    @pytest.mark.asyncio
+    async def test_session_failure_still_logs_out(self, monkeypatch, logout_request):
+        """Test undecodable tokens and session errors do not fail the logout"""
+        blacklisted = []
+
+        async def blacklist(token, **kwargs):
+            blacklisted.append(token)
+
+        async def failing_logout(user_id):
+            raise RuntimeError("redis down")
+
+        def bad_decode(token):
+            raise ValueError("bad token")
+
+        monkeypatch.setattr("api.dependencies.auth.blacklist_token", blacklist)
+        monkeypatch.setattr("api.routers.auth.auth_service.logout_user", failing_logout)
+
+        monkeypatch.setattr("api.dependencies.auth.decode_token", lambda t: {"sub": str(uuid4())})
+        await logout(logout_request, token="a")
+        monkeypatch.setattr("api.dependencies.auth.decode_token", bad_decode)
+        await logout(logout_request, token="b")
+
+        assert blacklisted == ["a", "b"]
@@ -0,0 +1,620 @@
+"""
+Unit tests for the shared base API client
+"""
+
+import asyncio
+import json
+import time
+from email.utils import formatdate
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import AsyncMock, MagicMock
+
+from api.clients import base_api_client
+from api.clients.base_api_client import (
+    APICredentials,
+    APIRateLimitException,
+    APIRequest,
+    APIResponse,
+    AuthType,
+    BaseAPIClient,
+    BaseEvidenceCollector,
+    REAUTH_INTERVAL,
+    TokenBucket,
+    TTLCache,
+    _join_url,
+    _parse_retry_after,
+    close_shared_sessions,
+)
+
+
+class DummyAPIClient(BaseAPIClient):
+    """Minimal concrete client for exercising base class behaviour"""
+
+    @property
+    def provider_name(self) -> str:
+        return "dummy"
+
+    def get_base_url(self) -> str:
+        return "https://api.example.com/v1"
+
+    async def authenticate(self) -> bool:
+        return True
+
+    async def refresh_credentials(self) -> bool:
+        return True
+
+    def get_evidence_collector(self, evidence_type: str):
+        return None
+
+    def get_health_endpoint(self) -> str:
+        return "/health"
+
+
+@pytest.fixture
+def credentials():
+    return APICredentials(provider="dummy", auth_type=AuthType.API_KEY, credentials={})
+
+
+@pytest.mark.unit
+class TestBaseAPIClientSession:
+    """Test HTTP session creation"""
+
+    @pytest.mark.asyncio
+    async def test_session_uses_tuned_connector(self, credentials):
+        """Test the lazily created session is built on a tuned, reused connector"""
+        client = DummyAPIClient(credentials)
+
+        session = client._get_session()
+
+        try:
+            assert client._get_session() is session
+            assert session.connector.limit == BaseAPIClient.connection_limit
+            assert session.connector.limit_per_host == BaseAPIClient.connection_limit_per_host
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_limits_overridable_per_provider(self, credentials):
+        """Test providers can tune their connection pool through class attributes"""
+
+        class SmallPoolClient(DummyAPIClient):
+            connection_limit = 10
+            connection_limit_per_host = 2
+
+        client = SmallPoolClient(credentials)
+
+        try:
+            assert client._get_session().connector.limit_per_host == 2
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_session_shared_until_last_client_closes(self, credentials):
+        """Test clients of a provider share one session, closed with the last client"""
+        first, second = DummyAPIClient(credentials), DummyAPIClient(credentials)
+
+        session = first._get_session()
+        assert second._get_session() is session
+
+        await first.close()
+        assert not session.closed
+        assert first.session is None
+
+        await second.close()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_close_shared_sessions(self, credentials):
+        """Test shutdown closes shared sessions and clients start a fresh one afterwards"""
+        client = DummyAPIClient(credentials)
+        session = client._get_session()
+
+        await close_shared_sessions()
+        await client.close()
+
+        assert session.closed
+        fresh = DummyAPIClient(credentials)
+        try:
+            assert fresh._get_session() is not session
+        finally:
+            await fresh.close()
+
+    @pytest.mark.asyncio
+    async def test_client_replaces_session_closed_at_shutdown(self, credentials):
+        """Test a client still open at shutdown picks up a fresh session afterwards"""
+        client = DummyAPIClient(credentials)
+        session = client._get_session()
+
+        await close_shared_sessions()
+        try:
+            fresh = client._get_session()
+            assert fresh is not session
+            assert not fresh.closed
+        finally:
+            await client.close()
+
+        assert fresh.closed
+
+    def test_session_not_reused_across_event_loops(self, credentials):
+        """Test a client left open by one asyncio.run gets a new session on the next loop"""
+        client = DummyAPIClient(credentials)
+
+        async def first_task():
+            session = client._get_session()
+            # Leave the client open, but release the socket pool before the loop closes
+            await session.connector.close()
+            return session
+
+        async def second_task():
+            session = client._get_session()
+            await client.close()
+            return session
+
+        first = asyncio.run(first_task())
+        second = asyncio.run(second_task())
+
+        assert second is not first
+        assert second.closed
+        assert not any(key[2].is_closed() for key in base_api_client._SESSIONS)
+
+
+@pytest.mark.unit
+class TestRateLimiting:
+    """Test request admission control"""
+
+    @pytest.mark.asyncio
+    async def test_bucket_allows_burst_then_throttles(self):
+        """Test requests beyond the burst wait for tokens to refill"""
+        bucket = TokenBucket(rate=50.0, burst=2)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.015
+
+    @pytest.mark.asyncio
+    async def test_bucket_pause_holds_requests(self):
+        """Test a paused bucket holds requests until the pause ends"""
+        bucket = TokenBucket(rate=1000.0, burst=10)
+        bucket.pause(0.05)
+
+        assert bucket.paused
+        start = time.monotonic()
+        await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.04
+        assert not bucket.paused
+
+    def test_parse_retry_after(self):
+        """Test retry delays are read from Retry-After or rate limit reset headers"""
+        assert _parse_retry_after({"Retry-After": "7"}) == 7.0
+        assert 29 <= _parse_retry_after({"X-Rate-Limit-Reset": str(time.time() + 30)}) <= 30
+        assert 29 <= _parse_retry_after({"Retry-After": formatdate(time.time() + 30)}) <= 30
+        assert _parse_retry_after({"Retry-After": "soon"}) is None
+        assert _parse_retry_after({}) is None
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_response_carries_retry_after(self, credentials):
+        """Test a 429 raises with the advertised wait and pauses the rate limiter"""
+        client = DummyAPIClient(credentials)
+        response = MagicMock(status=429, headers={"Retry-After": "3"})
+
+        with pytest.raises(APIRateLimitException) as exc_info:
+            await client._check_response_status(response)
+
+        assert exc_info.value.retry_after == 3.0
+        assert client._bucket.paused
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_retry_waits_for_advertised_reset(self, credentials):
+        """Test a 429 with a reset header retries after the reset, not the blind backoff"""
+        client = DummyAPIClient(credentials)
+        response = APIResponse(200, {}, {}, 0.0, "id")
+
+        def execute(request):
+            if client._execute_request.await_count == 1:
+                client._bucket.pause(0.01)
+                raise APIRateLimitException("Rate limited by dummy", retry_after=0.01)
+            return response
+
+        client._execute_request = AsyncMock(side_effect=execute)
+
+        start = time.monotonic()
+        assert await client.make_request(APIRequest("GET", "/users")) is response
+        assert time.monotonic() - start < 0.5
+
+
+class SlowCollector(BaseEvidenceCollector):
+    """Collector returning one item after a delay, or failing"""
+
+    def __init__(self, api_client, delay: float, fail: bool = False):
+        super().__init__(api_client)
+        self.delay = delay
+        self.fail = fail
+
+    async def collect(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("collector failed")
+        return [
+            self.create_evidence_item(
+                "dummy", "res-1", "Resource", {}, ["CC6.1"], quality_score=0.5
+            )
+        ]
+
+
+@pytest.mark.unit
+class TestCollectMany:
+    """Test concurrent collection of several evidence types"""
+
+    @pytest.mark.asyncio
+    async def test_collects_concurrently_and_reports_failures(self, credentials):
+        """Test evidence types run concurrently and a failure does not drop the others"""
+        client = DummyAPIClient(credentials)
+        collectors = {
+            "users": SlowCollector(client, 0.05),
+            "groups": SlowCollector(client, 0.05),
+            "logs": SlowCollector(client, 0.01, fail=True),
+        }
+        client.get_evidence_collector = collectors.get
+
+        start = time.monotonic()
+        result = await client.collect_many(["users", "groups", "logs"])
+
+        assert time.monotonic() - start < 0.1
+        assert not result.success
+        assert result.total_collected == 2
+        assert result.quality_score == 0.5
+        assert result.errors == ["logs: collector failed"]
+
+
+@pytest.mark.unit
+class TestResponseParsing:
+    """Test response body decoding"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "body, expected",
+        [(b'{"users": [{"id": 1}]}', {"users": [{"id": 1}]}), (b"", None)],
+    )
+    async def test_json_body(self, credentials, body, expected):
+        """Test JSON bodies are decoded from the raw bytes and empty bodies give None"""
+        client = DummyAPIClient(credentials)
+        response = MagicMock(headers={"content-type": "application/json; charset=utf-8"})
+        response.read = AsyncMock(return_value=body)
+
+        assert await client._parse_response(response) == expected
+
+
+@pytest.mark.unit
+class TestAuthentication:
+    """Test authentication reuse"""
+
+    @pytest.mark.asyncio
+    async def test_reauthenticates_after_interval(self, credentials):
+        """Test authentication is reused within the interval and renewed after it"""
+        client = DummyAPIClient(credentials)
+        client.authenticate = AsyncMock(return_value=True)
+
+        assert await client.ensure_authenticated()
+        assert await client.ensure_authenticated()
+        assert client.authenticate.await_count == 1
+
+        client._last_auth_monotonic -= REAUTH_INTERVAL + 1
+        assert await client.ensure_authenticated()
+        assert client.authenticate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_authentication(self, credentials):
+        """Test callers arriving during authentication wait for it instead of repeating it"""
+        client = DummyAPIClient(credentials)
+
+        async def authenticate():
+            await asyncio.sleep(0.01)
+            return True
+
+        client.authenticate = AsyncMock(side_effect=authenticate)
+
+        results = await asyncio.gather(*(client.ensure_authenticated() for _ in range(10)))
+
+        assert all(results)
+        assert client.authenticate.await_count == 1
+
+
+@pytest.mark.unit
+class TestStreamJsonLines:
+    """Test streaming of newline-delimited JSON responses"""
+
+    @pytest.mark.asyncio
+    async def test_yields_records_across_chunk_boundaries(self, credentials, monkeypatch):
+        """Test records split over several reads are reassembled and blank lines skipped"""
+        monkeypatch.setattr("api.clients.base_api_client.STREAM_CHUNK_SIZE", 7)
+
+        async def export(request):
+            return web.Response(
+                body=b'{"id": 1, "name": "alice"}\n\n{"id": 2, "name": "bob"}',
+                content_type="application/x-ndjson",
+            )
+
+        app = web.Application()
+        app.router.add_get("/export", export)
+        async with TestServer(app) as server:
+            client = DummyAPIClient(credentials)
+            client.base_url = str(server.make_url(""))
+            try:
+                records = [
+                    record
+                    async for record in client.stream_json_lines(APIRequest("GET", "/export"))
+                ]
+            finally:
+                await client.close()
+
+        assert records == [{"id": 1, "name": "alice"}, {"id": 2, "name": "bob"}]
+
+
+@pytest.mark.unit
+class TestPrepareHeaders:
+    """Test request header preparation"""
+
+    @pytest.mark.asyncio
+    async def test_base_headers_shared_without_additions(self, credentials):
+        """Test the immutable base headers are returned as-is when nothing is added"""
+        client = DummyAPIClient(credentials)
+
+        assert await client._prepare_headers() is BaseAPIClient._BASE_HEADERS
+
+    @pytest.mark.asyncio
+    async def test_auth_and_additional_headers_merged(self, credentials):
+        """Test auth and per-request headers are layered over the base headers"""
+        client = DummyAPIClient(credentials)
+        client._auth_headers = lambda: {"Authorization": "Bearer token"}
+
+        headers = await client._prepare_headers({"Accept": "text/csv"})
+
+        assert headers["Authorization"] == "Bearer token"
+        assert headers["Accept"] == "text/csv"
+        assert headers["User-Agent"] == BaseAPIClient._BASE_HEADERS["User-Agent"]
+        assert BaseAPIClient._BASE_HEADERS["Accept"] == "application/json"
+
+
+@pytest.mark.unit
+class TestJoinUrl:
+    """Test request URL construction"""
+
+    @pytest.mark.parametrize(
+        "base_url, endpoint, expected",
+        [
+            ("https://api.example.com/v1", "/users", "https://api.example.com/v1/users"),
+            ("https://api.example.com/v1/", "/users", "https://api.example.com/v1/users"),
+            (
+                "https://api.example.com/v1",
+                "/users?after=abc&limit=200",
+                "https://api.example.com/v1/users?after=abc&limit=200",
+            ),
+            ("", "https://other.example.com/health", "https://other.example.com/health"),
+        ],
+    )
+    def test_join(self, base_url, endpoint, expected):
+        """Test endpoints join onto the base URL without doubled slashes or lost queries"""
+        assert str(_join_url(base_url, endpoint)) == expected
+
+    def test_encoded_segments_kept(self):
+        """Test an escaped slash in an ID stays within its path segment"""
+        url = _join_url("https://api.example.com/v1", "/groups/eng%2Fops/users?q=a%26b")
+
+        assert str(url) == "https://api.example.com/v1/groups/eng%2Fops/users?q=a%26b"
+        assert url.raw_parts[-2:] == ("eng%2Fops", "users")
+        assert url.query["q"] == "a&b"
+
+    def test_absolute_endpoint_used_as_given(self):
+        """Test absolute endpoints such as Link next URLs are not prefixed with the base path"""
+        next_url = "https://org.okta.com/api/v1/users?after=00u1%2Fx&limit=200"
+
+        assert str(_join_url("https://org.okta.com/api/v1", next_url)) == next_url
+
+
+@pytest.mark.unit
+class TestCollectorRegistry:
+    """Test evidence collector registration and lookup"""
+
+    @pytest.fixture
+    def registry_client(self, credentials):
+        """Client class with its own registered collectors"""
+
+        class RegistryClient(DummyAPIClient):
+            get_evidence_collector = BaseAPIClient.get_evidence_collector
+
+        @RegistryClient.register_collector("slow_users", delay=0.0)
+        @RegistryClient.register_collector("failing_users", delay=0.0, fail=True)
+        class RegisteredCollector(SlowCollector):
+            pass
+
+        return RegistryClient(credentials)
+
+    def test_registered_collectors_are_supported(self, registry_client):
+        """Test registered evidence types are supported and built with their arguments"""
+        assert registry_client.get_supported_evidence_types() == ["failing_users", "slow_users"]
+        assert registry_client.get_evidence_collector("failing_users").fail is True
+        assert registry_client.get_evidence_collector("unknown") is None
+
+    def test_collector_is_reused(self, registry_client):
+        """Test a collector is built once per client"""
+        first = registry_client.get_evidence_collector("slow_users")
+
+        assert registry_client.get_evidence_collector("slow_users") is first
+
+    def test_registries_are_per_provider(self, registry_client):
+        """Test registering on one provider does not affect others"""
+        assert DummyAPIClient._COLLECTORS == {}
+        assert BaseAPIClient._COLLECTORS == {}
+
+
+@pytest.mark.unit
+class TestExecuteRequest:
+    """Test request execution against a local server"""
+
+    @pytest.mark.asyncio
+    async def test_response_headers_kept_as_received(self, credentials):
+        """Test response headers are exposed case-insensitively without copying"""
+
+        async def users(request):
+            return web.json_response([{"id": 1}], headers={"Link": '<next>; rel="next"'})
+
+        app = web.Application()
+        app.router.add_get("/users", users)
+        async with TestServer(app) as server:
+            client = DummyAPIClient(credentials)
+            client.base_url = str(server.make_url(""))
+            try:
+                response = await client.make_request(APIRequest("GET", "/users"))
+            finally:
+                await client.close()
+
+        assert response.data == [{"id": 1}]
+        assert response.headers["link"] == '<next>; rel="next"'
+        assert response.headers_dict["Link"] == '<next>; rel="next"'
+
+    @pytest.mark.asyncio
+    async def test_requests_dispatched_by_method(self, credentials):
+        """Test each method reaches its route and bodyless methods send no body"""
+        received = []
+
+        async def record(request):
+            received.append((request.method, await request.read()))
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_route("*", "/items", record)
+        async with TestServer(app) as server:
+            client = DummyAPIClient(credentials)
+            client.base_url = str(server.make_url(""))
+            try:
+                await client.make_request(APIRequest("POST", "/items", body={"a": 1}))
+                await client.make_request(APIRequest("DELETE", "/items", body={"a": 1}))
+                await client.make_request(APIRequest("OPTIONS", "/items"))
+            finally:
+                await client.close()
+
+        assert received[0][0] == "POST" and json.loads(received[0][1]) == {"a": 1}
+        assert received[1] == ("DELETE", b"")
+        assert received[2][0] == "OPTIONS"
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test caching of idempotent GET responses"""
+
+    @pytest.fixture
+    def cached_client(self, credentials):
+        """Client whose requests are answered by a mock"""
+        client = DummyAPIClient(credentials)
+        client._execute_request = AsyncMock(
+            side_effect=lambda request: APIResponse(
+                200, [{"id": 1}], client.response_headers, 0.0, "id"
+            )
+        )
+        client.response_headers = {}
+        return client
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_served_from_cache(self, cached_client):
+        """Test an identical GET that opts in is answered from the cache"""
+        request = APIRequest("GET", "/users", params={"limit": 1}, cacheable=True)
+        first = await cached_client.make_request(request)
+        second = await cached_client.make_request(request)
+
+        assert second == first
+        assert cached_client._execute_request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_data_not_shared(self, cached_client):
+        """Test changes a caller makes to its response data do not reach later callers"""
+        request = APIRequest("GET", "/users", cacheable=True)
+        first = await cached_client.make_request(request)
+        first.data[0]["id"] = 2
+        second = await cached_client.make_request(request)
+        second.data.append({"id": 3})
+        third = await cached_client.make_request(request)
+
+        assert third.data == [{"id": 1}]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "request_kwargs, response_headers",
+        [
+            ({}, {}),
+            ({"cacheable": True, "headers": {"Cache-Control": "no-cache"}}, {}),
+            ({"cacheable": True}, {"Cache-Control": "private, max-age=0"}),
+            ({"cacheable": True}, {"Cache-Control": "no-store"}),
+        ],
+    )
+    async def test_uncacheable_requests_always_sent(
+        self, cached_client, request_kwargs, response_headers
+    ):
+        """Test requests not opting in and uncacheable responses are never served from cache"""
+        cached_client.response_headers = response_headers
+
+        for _ in range(2):
+            await cached_client.make_request(APIRequest("GET", "/users", **request_kwargs))
+
+        assert cached_client._execute_request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self):
+        """Test entries are dropped once their time to live has passed"""
+        cache = TTLCache(maxsize=2)
+        cache.set("fresh", 1, ttl=60)
+        cache.set("stale", 2, ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        assert cache.get("fresh") == 1
+        assert cache.get("stale") is None
+
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used entry is evicted when the cache is full"""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+
+@pytest.mark.unit
+class TestPaginate:
+    """Test concurrent page prefetching"""
+
+    @pytest.mark.asyncio
+    async def test_yields_items_in_page_order_with_prefetch(self, credentials):
+        """Test pages are fetched concurrently but their items yielded in order"""
+        client = DummyAPIClient(credentials)
+        in_flight = max_in_flight = 0
+
+        async def make_request(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            page = request.params["page"]
+            # Later pages answer first
+            await asyncio.sleep(0.01 * (5 - page) if page < 5 else 0)
+            in_flight -= 1
+            items = [f"{page}-{index}" for index in range(2)] if page <= 3 else []
+            return APIResponse(200, {"items": items}, {}, 0.0, "id")
+
+        client.make_request = make_request
+
+        items = [
+            item
+            async for item in client.paginate(
+                "/things", params={"size": 2}, items_key="items", max_concurrent=3
+            )
+        ]
+
+        assert items == ["1-0", "1-1", "2-0", "2-1", "3-0", "3-1"]
+        assert max_in_flight == 3
@@ -0,0 +1,77 @@
+"""
+Unit tests for the base integration's credential encryption
+"""
+
+from uuid import uuid4
+
+import pytest
+from cryptography.fernet import Fernet
+
+from api.integrations.base.base_integration import (
+    BaseIntegration,
+    IntegrationConfig,
+    IntegrationError,
+)
+
+
+class DummyIntegration(BaseIntegration):
+    """Minimal concrete integration for exercising base class behaviour"""
+
+    @property
+    def provider_name(self) -> str:
+        return "dummy"
+
+    async def test_connection(self) -> bool:
+        return True
+
+    async def authenticate(self) -> bool:
+        return True
+
+    async def collect_evidence(self, evidence_type, since=None):
+        return []
+
+    async def get_available_evidence_types(self):
+        return []
+
+
+@pytest.fixture
+def config():
+    return IntegrationConfig(user_id=uuid4(), provider="dummy", credentials={})
+
+
+@pytest.mark.unit
+class TestCredentialCipher:
+    """Test which cipher encrypts integration credentials"""
+
+    def test_cipher_configured_after_import_is_used(self, config, monkeypatch):
+        """Test the cipher is looked up when the integration is created, not at import"""
+        cipher = Fernet(Fernet.generate_key())
+        monkeypatch.setattr(
+            "api.integrations.base.base_integration.get_cipher_suite", lambda: cipher
+        )
+
+        integration = DummyIntegration(config)
+
+        assert integration.cipher is cipher
+
+    def test_missing_cipher_rejected(self, config, monkeypatch):
+        monkeypatch.setattr("api.integrations.base.base_integration.get_cipher_suite", lambda: None)
+
+        with pytest.raises(IntegrationError):
+            DummyIntegration(config)
+
+    def test_instance_cipher_used(self, config, monkeypatch):
+        """Test credentials go through the instance's cipher, e.g. one swapped for key rotation"""
+        old_cipher, new_cipher = Fernet(Fernet.generate_key()), Fernet(Fernet.generate_key())
+        monkeypatch.setattr(
+            "api.integrations.base.base_integration.get_cipher_suite", lambda: old_cipher
+        )
+        integration = DummyIntegration(config)
+        integration.cipher = new_cipher
+
+        token = integration.encrypt_credentials_to_str({"api_key": "secret"})
+
+        assert new_cipher.decrypt(token.encode())
+        assert integration.decrypt_credentials_from_str(token) == {"api_key": "secret"}
+        with pytest.raises(IntegrationError):
+            DummyIntegration(config).decrypt_credentials_from_str(token)
@@ -0,0 +1,428 @@
+"""
+Unit tests for the Google Workspace API client
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import AsyncMock, patch
+from yarl import URL
+
+from api.clients.base_api_client import (
+    APICredentials,
+    APIException,
+    AuthType,
+    EvidenceQuality,
+)
+from api.clients.google_workspace_client import (
+    MEMBER_FIELDS,
+    GoogleWorkspaceAPIClient,
+    count_recent_activities,
+    summarize_users,
+)
+
+
+@pytest.fixture(autouse=True)
+def google_libraries(monkeypatch):
+    """Take the real-library code path even where conftest stubs out the google package"""
+    monkeypatch.setattr("api.clients.google_workspace_client.GOOGLE_AVAILABLE", True)
+
+
+@pytest.fixture
+def workspace_client():
+    """Google Workspace client with sample OAuth2 credentials"""
+    credentials = APICredentials(
+        provider="google_workspace",
+        auth_type=AuthType.OAUTH2,
+        credentials={
+            "client_id": "client-id",
+            "client_secret": "client-secret",
+            "refresh_token": "refresh-token",
+            "access_token": "access-token",
+            "domain": "example.com",
+        },
+    )
+    return GoogleWorkspaceAPIClient(credentials)
+
+
+@pytest.mark.unit
+class TestCollectAllEvidence:
+    """Test running every evidence collector"""
+
+    @pytest.mark.asyncio
+    async def test_collectors_run_concurrently(self, workspace_client):
+        """Test collectors overlap and a failing collector does not drop the others"""
+
+        calls = {}
+
+        def slow(result):
+            async def collector(**kwargs):
+                calls[result] = kwargs
+                await asyncio.sleep(0.05)
+                return result
+
+            return collector
+
+        async def failing(**kwargs):
+            raise RuntimeError("quota exceeded")
+
+        workspace_client.collect_users_evidence = slow("users")
+        workspace_client.collect_groups_evidence = slow("groups")
+        workspace_client.collect_admin_logs_evidence = slow("admin")
+        workspace_client.collect_login_logs_evidence = failing
+        workspace_client.collect_domain_evidence = slow("domains")
+
+        start = time.monotonic()
+        results = await workspace_client.collect_all_evidence()
+
+        assert time.monotonic() - start < 0.15
+        assert results == ["users", "groups", "admin", "domains"]
+        assert calls["admin"]["start_time"].endswith("Z")
+        assert calls["users"] == {}
+
+
+@pytest.mark.unit
+class TestGroupMemberships:
+    """Test fetching group members"""
+
+    @pytest.mark.asyncio
+    async def test_members_fetched_in_batches(self, workspace_client):
+        """Test member pages are batched 100 at a time and failed lookups leave empty lists"""
+        seen_auth = set()
+        seen_fields = set()
+        batch_sizes = []
+
+        async def batch(request):
+            seen_auth.add(request.headers.get("Authorization"))
+            calls = []
+            async for part in await request.multipart():
+                request_line = (await part.text()).split("\r\n", 1)[0]
+                calls.append((part.headers["Content-ID"].strip("<>"), URL(request_line.split()[1])))
+            batch_sizes.append(len(calls))
+
+            lines = []
+            for content_id, url in calls:
+                group_key = url.path.split("/")[-2]
+                seen_fields.add(url.query.get("fields"))
+                if group_key == "g2":
+                    status, body = "404 Not Found", {"error": "not found"}
+                elif group_key == "g1" and "pageToken" not in url.query:
+                    status, body = "200 OK", {"members": [{"email": "g1@x"}], "nextPageToken": "p2"}
+                else:
+                    page = url.query.get("pageToken", "")
+                    status, body = "200 OK", {"members": [{"email": f"{group_key}{page}@x"}]}
+                lines += [
+                    "--response",
+                    "Content-Type: application/http",
+                    f"Content-ID: <response-{content_id}>",
+                    "",
+                    f"HTTP/1.1 {status}",
+                    "Content-Type: application/json; charset=UTF-8",
+                    "",
+                    json.dumps(body),
+                ]
+            lines.append("--response--")
+            return web.Response(
+                body="\r\n".join(lines).encode(),
+                headers={"Content-Type": "multipart/mixed; boundary=response"},
+            )
+
+        app = web.Application()
+        app.router.add_post("/batch/admin/directory_v1", batch)
+        async with TestServer(app) as server:
+            workspace_client.base_url = str(server.make_url(""))
+            try:
+                memberships = await workspace_client._fetch_group_memberships(
+                    [{"id": f"g{i}"} for i in range(150)]
+                )
+            finally:
+                await workspace_client.close()
+
+        assert list(memberships) == [f"g{i}" for i in range(150)]
+        assert memberships["g0"] == [{"email": "g0@x"}]
+        assert memberships["g1"] == [{"email": "g1@x"}, {"email": "g1p2@x"}]
+        assert memberships["g2"] == []
+        # Both first-round batches are sent together, then g1's second page on its own
+        assert sorted(batch_sizes[:2]) == [50, 100]
+        assert batch_sizes[2:] == [1]
+        assert seen_auth == {f"Bearer {workspace_client.credentials_obj.token}"}
+        assert seen_fields == {MEMBER_FIELDS}
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_leaves_empty_lists(self, workspace_client, monkeypatch):
+        """Test every group in a batch that fails outright is recorded with no members"""
+
+        async def failing_batch(paths):
+            raise APIException("batch rejected")
+
+        monkeypatch.setattr(workspace_client, "_batch_get", failing_batch)
+
+        memberships = await workspace_client._fetch_group_memberships([{"id": "g0"}, {"id": "g1"}])
+
+        assert memberships == {"g0": [], "g1": []}
+
+
+@pytest.mark.unit
+class TestAuthentication:
+    """Test OAuth2 authentication"""
+
+    @pytest.mark.asyncio
+    async def test_valid_credentials_reused(self, workspace_client):
+        """Test credentials are parsed at construction and reused while the token is valid"""
+        with patch(
+            "api.clients.google_workspace_client.GoogleWorkspaceCredentials"
+        ) as parse_credentials:
+            assert await workspace_client.authenticate()
+            credentials_obj = workspace_client.credentials_obj
+            assert await workspace_client.authenticate()
+
+        parse_credentials.assert_not_called()
+        assert workspace_client.credentials_obj is credentials_obj
+
+    @pytest.mark.asyncio
+    async def test_invalid_credentials_fail_authentication(self):
+        """Test credentials missing required fields are rejected without contacting Google"""
+        client = GoogleWorkspaceAPIClient(
+            APICredentials(
+                provider="google_workspace",
+                auth_type=AuthType.OAUTH2,
+                credentials={"client_id": "client-id"},
+            )
+        )
+
+        assert client._credentials_error is not None
+        assert not await client.authenticate()
+        assert client.credentials_obj is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_refresh(self, workspace_client):
+        """Test collectors finding an expired token together refresh it once"""
+        credentials_obj = ExpiredCredentials()
+        workspace_client.credentials_obj = credentials_obj
+
+        results = await asyncio.gather(*(workspace_client.authenticate() for _ in range(5)))
+
+        assert all(results)
+        assert credentials_obj.refresh_count == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_does_not_block_event_loop(self, workspace_client):
+        """Test other coroutines keep running while the token refreshes"""
+        workspace_client.credentials_obj = ExpiredCredentials()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            assert await workspace_client.authenticate()
+        finally:
+            ticking.cancel()
+
+        assert ticks > 1
+
+
+class ExpiredCredentials:
+    """Credentials whose access token has expired until refreshed"""
+
+    refresh_token = "refresh-token"
+
+    def __init__(self):
+        self.token = "expired-token"
+        self.expired = True
+        self.refresh_count = 0
+
+    @property
+    def valid(self):
+        return not self.expired
+
+    def refresh(self, request):
+        time.sleep(0.01)
+        self.refresh_count += 1
+        self.token = f"token-{self.refresh_count}"
+        self.expired = False
+
+
+@pytest.mark.unit
+class TestLogsQuality:
+    """Test log evidence recency counting"""
+
+    @pytest.mark.parametrize("numpy_available", [True, False])
+    def test_count_recent_activities(self, monkeypatch, numpy_available):
+        """Test only activities from the last three days are counted, with and without NumPy"""
+        if not numpy_available:
+            monkeypatch.setattr("api.clients.google_workspace_client.np", None)
+        now = datetime.now(timezone.utc)
+        activities = [
+            {"id": {"time": (now - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")}},
+            {"id": {"time": (now - timedelta(days=2)).strftime("%Y-%m-%dT%H:%M:%SZ")}},
+            {"id": {"time": (now - timedelta(days=5)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")}},
+            {"id": {}},
+        ]
+
+        assert count_recent_activities(activities) == 2
+
+    def test_unparseable_timestamp_not_counted(self):
+        """Test a malformed timestamp is skipped rather than failing the count"""
+        recent = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        activities = [{"id": {"time": recent}}, {"id": {"time": "yesterday"}}]
+
+        assert count_recent_activities(activities) == 1
+
+
+@pytest.mark.unit
+class TestSummarizeUsers:
+    """Test counting user flags"""
+
+    @pytest.mark.parametrize(
+        "users, expected",
+        [
+            ([], (0, 0)),
+            (
+                [
+                    {"isEnforcedIn2Sv": True, "suspended": False},
+                    {"isEnforcedIn2Sv": True, "suspended": True},
+                    {"isEnforcedIn2Sv": False, "suspended": False},
+                ],
+                (2, 1),
+            ),
+            ([{"isEnforcedIn2Sv": True}, {"suspended": True}, {}], (1, 1)),
+        ],
+    )
+    @pytest.mark.parametrize("numpy_available", [True, False])
+    def test_summarize_users(self, monkeypatch, users, expected, numpy_available):
+        """Test flags are counted whether or not every user carries them, with and without NumPy"""
+        if not numpy_available:
+            monkeypatch.setattr("api.clients.google_workspace_client.np", None)
+        assert summarize_users(users) == expected
+
+
+@pytest.mark.unit
+class TestPagination:
+    """Test following nextPageToken"""
+
+    @pytest.fixture
+    async def paged_client(self, workspace_client):
+        """Client pointed at a server serving three pages of users"""
+        requested = []
+
+        async def users(request):
+            token = request.query.get("pageToken", "0")
+            requested.append(token)
+            page = int(token)
+            body = {"users": [{"id": f"u{page}"}]}
+            if page < 2:
+                body["nextPageToken"] = str(page + 1)
+            return web.json_response(body)
+
+        app = web.Application()
+        app.router.add_get("/admin/directory/v1/users", users)
+        async with TestServer(app) as server:
+            workspace_client.base_url = str(server.make_url(""))
+            workspace_client.requested = requested
+            yield workspace_client
+            await workspace_client.close()
+
+    @pytest.mark.asyncio
+    async def test_pages_followed_and_prefetched(self, paged_client):
+        """Test every page is yielded in order and the next one is fetched during processing"""
+        pages = []
+        async for page in paged_client._pages("/admin/directory/v1/users", "users"):
+            await asyncio.sleep(0.05)
+            pages.append((page, list(paged_client.requested)))
+
+        assert [page for page, _ in pages] == [[{"id": "u0"}], [{"id": "u1"}], [{"id": "u2"}]]
+        # While the first page was processed, the second had already been requested
+        assert pages[0][1] == ["0", "1"]
+
+    @pytest.mark.asyncio
+    async def test_stopping_early_cancels_prefetch(self, paged_client):
+        """Test breaking out of the pages leaves no request running"""
+        pages = paged_client._pages("/admin/directory/v1/users", "users")
+        async for page in pages:
+            break
+        await pages.aclose()
+
+        assert page == [{"id": "u0"}]
+        assert paged_client.requested[-1] != "2"
+
+
+@pytest.mark.unit
+class TestRawEvidence:
+    """Test which raw records are kept alongside the evidence summaries"""
+
+    @pytest.fixture
+    def client_factory(self, monkeypatch):
+        """Build clients whose list endpoints serve two single-record pages"""
+        monkeypatch.setattr(GoogleWorkspaceAPIClient, "authenticate", AsyncMock(return_value=True))
+        # Capture the evidence fields the collectors build their results from
+        monkeypatch.setattr("api.clients.google_workspace_client.CollectionResult", SimpleNamespace)
+
+        def build(**kwargs):
+            client = GoogleWorkspaceAPIClient(
+                APICredentials(
+                    provider="google_workspace",
+                    auth_type=AuthType.OAUTH2,
+                    credentials={
+                        "client_id": "client-id",
+                        "client_secret": "client-secret",
+                        "refresh_token": "refresh-token",
+                    },
+                ),
+                **kwargs,
+            )
+
+            async def pages(endpoint, items_key, **params):
+                for record_id in ("r0", "r1"):
+                    yield [{"id": {"time": "2024-01-01T00:00:00Z"}, "record": record_id}]
+
+            client._pages = pages
+            return client
+
+        return build
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "collector, kwargs, raw_key",
+        [
+            ("collect_users_evidence", {}, "users"),
+            ("collect_admin_logs_evidence", {"start_time": "2024-01-01T00:00:00Z"}, "activities"),
+            ("collect_login_logs_evidence", {"start_time": "2024-01-01T00:00:00Z"}, "activities"),
+        ],
+    )
+    async def test_summary_only_by_default(self, client_factory, collector, kwargs, raw_key):
+        """Test raw records are left out unless retain_raw is set"""
+        summary_only = await getattr(client_factory(), collector)(**kwargs)
+        with_raw = await getattr(client_factory(retain_raw=True), collector)(**kwargs)
+
+        assert raw_key not in summary_only.data
+        assert summary_only.data["summary"] == with_raw.data["summary"]
+        assert [record["record"] for record in with_raw.data[raw_key]] == ["r0", "r1"]
+
+
+@pytest.mark.unit
+class TestQualityScores:
+    """Test evidence quality calculations"""
+
+    @pytest.mark.parametrize(
+        "group_names, expected",
+        [
+            ([], EvidenceQuality.LOW),
+            (["security admins", "engineering"], EvidenceQuality.HIGH),
+            (["security", "eng"], EvidenceQuality.MEDIUM),
+            (["ops", "eng"], EvidenceQuality.LOW),
+        ],
+    )
+    def test_groups_quality(self, workspace_client, group_names, expected):
+        """Test groups are scored on security groups and descriptive names"""
+        assert workspace_client._calculate_groups_quality(group_names, {}) == expected
@@ -0,0 +1,41 @@
+"""
+Unit tests for off-loop password hashing
+"""
+
+import asyncio
+
+import pytest
+
+from api.dependencies.auth import get_password_hash_async, verify_password_async
+
+
+@pytest.mark.unit
+class TestPasswordHashing:
+    """Test hashing and verifying passwords in the hashing pool"""
+
+    @pytest.mark.asyncio
+    async def test_hash_round_trip(self):
+        """Test a hashed password verifies and a wrong one does not"""
+        hashed = await get_password_hash_async("Sup3r$ecret")
+
+        assert await verify_password_async("Sup3r$ecret", hashed)
+        assert not await verify_password_async("wrong", hashed)
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """Test other coroutines keep running while a password is hashed"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            await get_password_hash_async("Sup3r$ecret")
+        finally:
+            ticking.cancel()
+
+        assert ticks > 1
@@ -0,0 +1,327 @@
+"""
+Unit tests for the security middleware
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from redis.exceptions import RedisError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from api.context import request_id_var
+from api.middleware.security_headers import security_headers_middleware
+from api.middleware.security_middleware import (
+    CORSMiddleware,
+    MaxConcurrentAuthMiddleware,
+    RateLimitMiddleware,
+    RequestLoggingMiddleware,
+    SecurityMiddleware,
+)
+
+
+def build_app(*middleware):
+    """Starlette app with one route, wrapped in the given middleware classes"""
+
+    async def homepage(request):
+        return PlainTextResponse(
+            request_id_var.get() or "", headers={"X-Frame-Options": "SAMEORIGIN"}
+        )
+
+    app = Starlette(routes=[Route("/", homepage, methods=["GET", "POST"])])
+    for middleware_class, kwargs in middleware:
+        app.add_middleware(middleware_class, **kwargs)
+    return app
+
+
+@pytest.mark.unit
+class TestSecurityMiddleware:
+    """Test security headers and request tracing"""
+
+    def test_security_headers_added(self):
+        """Test every response carries the security headers and its request ID"""
+        client = TestClient(build_app((SecurityMiddleware, {})))
+
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["X-XSS-Protection"] == "1; mode=block"
+        assert "max-age=31536000" in response.headers["Strict-Transport-Security"]
+        assert response.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+        assert response.headers.get_list("X-Frame-Options") == ["DENY"]
+        assert response.headers["X-Request-ID"] == response.text
+
+    def test_request_ids_unique(self):
+        """Test each request is given its own ID"""
+        client = TestClient(build_app((SecurityMiddleware, {})))
+
+        request_ids = {client.get("/").headers["X-Request-ID"] for _ in range(3)}
+
+        assert len(request_ids) == 3
+        assert all(len(request_id) == 24 for request_id in request_ids)
+
+    @pytest.mark.parametrize(
+        "path, level",
+        [("/", "INFO"), ("/health", "DEBUG"), ("/api/v1/monitoring/health", "DEBUG")],
+    )
+    def test_request_log_level(self, caplog, path, level):
+        """Test health checks are logged at DEBUG and other requests at INFO"""
+        client = TestClient(build_app((SecurityMiddleware, {})))
+
+        with caplog.at_level("DEBUG", logger="api.middleware.security_middleware"):
+            client.get(path)
+
+        records = [r for r in caplog.records if r.getMessage().startswith("Request ")]
+        assert [r.levelname for r in records] == [level, level]
+
+    def test_request_logs_carry_request_id(self, caplog):
+        """Test both request records carry the request ID sent back to the client"""
+        client = TestClient(build_app((SecurityMiddleware, {})))
+
+        with caplog.at_level("INFO", logger="api.middleware.security_middleware"):
+            response = client.get("/")
+
+        records = [r for r in caplog.records if r.getMessage().startswith("Request ")]
+        assert len(records) == 2
+        assert {r.request_id for r in records} == {response.headers["X-Request-ID"]}
+        assert records[1].status_code == 200
+
+    def test_request_logs_skipped_when_disabled(self, caplog):
+        """Test nothing is logged when INFO is disabled"""
+        client = TestClient(build_app((SecurityMiddleware, {})))
+
+        with caplog.at_level("WARNING", logger="api.middleware.security_middleware"):
+            response = client.get("/")
+
+        assert response.status_code == 200
+        assert not [r for r in caplog.records if r.getMessage().startswith("Request ")]
+
+
+@pytest.mark.unit
+class TestRateLimitMiddleware:
+    """Test per-client rate limiting"""
+
+    def test_requests_over_limit_rejected(self):
+        """Test requests beyond the limit within the window are rejected"""
+        client = TestClient(
+            build_app((RateLimitMiddleware, {"max_requests": 2, "window_seconds": 60}))
+        )
+
+        statuses = [client.get("/").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+
+    def test_window_expiry(self, monkeypatch):
+        """Test requests are allowed again once earlier ones leave the window"""
+        now = [1000.0]
+        monkeypatch.setattr("api.middleware.security_middleware.time.time", lambda: now[0])
+        client = TestClient(
+            build_app((RateLimitMiddleware, {"max_requests": 1, "window_seconds": 60}))
+        )
+
+        assert client.get("/").status_code == 200
+        assert client.get("/").status_code == 429
+        now[0] += 61
+        assert client.get("/").status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_tracked_clients_bounded(self):
+        """Test the least recently seen client is evicted once the cap is reached"""
+
+        async def call_next(request):
+            return PlainTextResponse("ok")
+
+        middleware = RateLimitMiddleware(build_app(), max_tracked_ips=2)
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3"):
+            request = Request({"type": "http", "method": "GET", "path": "/", "client": (ip, 1)})
+            await middleware.dispatch(request, call_next)
+
+        assert list(middleware.requests) == ["10.0.0.1", "10.0.0.3"]
+
+    def test_shared_window_in_redis(self):
+        """Test a Redis client moves the window into the atomic script"""
+        redis_client = ScriptedRedis([1, 0])
+        client = TestClient(
+            build_app(
+                (
+                    RateLimitMiddleware,
+                    {"max_requests": 5, "window_seconds": 60, "redis_client": redis_client},
+                )
+            )
+        )
+
+        statuses = [client.get("/").status_code for _ in range(2)]
+
+        assert statuses == [200, 429]
+        keys, args = redis_client.calls[0]
+        assert keys == ["security_rate_limit:testclient"]
+        assert args[0] - args[1] == 60
+        assert args[2:4] == [5, 60]
+        # Each request is stored under its own member
+        assert redis_client.calls[0][1][4] != redis_client.calls[1][1][4]
+
+    def test_redis_failure_fails_open(self):
+        """Test requests are allowed while Redis is unavailable"""
+        client = TestClient(
+            build_app((RateLimitMiddleware, {"redis_client": ScriptedRedis([RedisError("down")])}))
+        )
+
+        assert client.get("/").status_code == 200
+
+
+class ScriptedRedis:
+    """Redis client whose rate limit script returns queued results"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    def register_script(self, script):
+        async def run(keys, args):
+            self.calls.append((keys, args))
+            result = self.results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return run
+
+
+@pytest.mark.unit
+class TestMaxConcurrentAuthMiddleware:
+    """Test bounding concurrent authentication requests"""
+
+    @pytest.mark.asyncio
+    async def test_excess_auth_requests_shed(self):
+        """Test auth requests beyond the running and waiting limits get 503"""
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def login(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+            return PlainTextResponse("ok")
+
+        app = Starlette(
+            routes=[Route("/api/v1/auth/login", login), Route("/", login)],
+            middleware=[Middleware(MaxConcurrentAuthMiddleware, max_concurrent=2, max_waiting=1)],
+        )
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            requests = [asyncio.create_task(client.get("/api/v1/auth/login")) for _ in range(4)]
+            other = asyncio.create_task(client.get("/"))
+            await asyncio.sleep(0.05)
+            release.set()
+            statuses = sorted(r.status_code for r in await asyncio.gather(*requests))
+            other_response = await other
+
+        assert statuses == [200, 200, 200, 503]
+        assert peak == 3  # two auth requests plus the unrestricted one
+        assert other_response.status_code == 200
+
+
+@pytest.mark.unit
+class TestCORSMiddleware:
+    """Test CORS handling"""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(
+            build_app((CORSMiddleware, {"allowed_origins": ["https://app.example.com"]}))
+        )
+
+    def test_preflight_allowed_origin(self, client):
+        """Test preflight requests from an allowed origin receive the CORS headers"""
+        response = client.options("/", headers={"Origin": "https://app.example.com"})
+
+        assert response.status_code == 200
+        assert response.headers["Access-Control-Allow-Origin"] == "https://app.example.com"
+        assert response.headers["Access-Control-Allow-Methods"] == "GET, POST, PUT, DELETE, OPTIONS"
+        assert response.headers["Access-Control-Allow-Credentials"] == "true"
+
+    def test_preflight_unknown_origin(self, client):
+        """Test preflight requests from other origins receive no CORS headers"""
+        response = client.options("/", headers={"Origin": "https://evil.example.com"})
+
+        assert response.status_code == 200
+        assert "Access-Control-Allow-Origin" not in response.headers
+
+    @pytest.mark.parametrize(
+        "origin, allowed",
+        [("https://app.example.com", True), ("https://evil.example.com", False), (None, False)],
+    )
+    def test_actual_request(self, client, origin, allowed):
+        """Test only allowed origins are echoed on regular responses"""
+        headers = {"Origin": origin} if origin else {}
+
+        response = client.post("/", headers=headers)
+
+        assert response.status_code == 200
+        assert ("Access-Control-Allow-Origin" in response.headers) is allowed
+        if allowed:
+            assert response.headers["Access-Control-Allow-Credentials"] == "true"
+
+
+@pytest.mark.unit
+class TestRequestLoggingMiddleware:
+    """Test request detail logging"""
+
+    def test_body_left_for_route(self, caplog):
+        """Test the body reaches the route unread and its size comes from Content-Length"""
+
+        async def echo(request):
+            return PlainTextResponse(await request.body())
+
+        app = Starlette(routes=[Route("/", echo, methods=["POST"])])
+        app.add_middleware(RequestLoggingMiddleware)
+        client = TestClient(app)
+
+        with caplog.at_level("INFO", logger="api.middleware.security_middleware"):
+            response = client.post(
+                "/?page=2", content=b"x" * 5000, headers={"Authorization": "Bearer secret"}
+            )
+
+        assert response.content == b"x" * 5000
+        record = next(r for r in caplog.records if r.getMessage() == "Request details")
+        assert record.content_length == 5000
+        assert record.query_string == "page=2"
+        assert "'content-length': '5000'" in str(record.headers)
+        assert "secret" not in str(record.headers)
+
+
+@pytest.mark.unit
+class TestSecurityHeadersMiddleware:
+    """Test the function-based security headers middleware"""
+
+    def test_headers_replaced(self):
+        """Test security headers override the route's own and the server header is removed"""
+
+        async def homepage():
+            return PlainTextResponse(
+                "ok", headers={"X-Frame-Options": "SAMEORIGIN", "Server": "uvicorn"}
+            )
+
+        app = FastAPI()
+        app.add_api_route("/", homepage)
+        app.middleware("http")(security_headers_middleware)
+
+        response = TestClient(app).get("/")
+
+        assert response.text == "ok"
+        assert response.headers.get_list("X-Frame-Options") == ["DENY"]
+        assert response.headers["Content-Security-Policy"] == "default-src 'self'"
+        assert response.headers["Permissions-Policy"].startswith("geolocation=()")
+        assert "Server" not in response.headers
@@ -0,0 +1,38 @@
+"""
+Unit tests for timestamp helpers
+"""
+
+from datetime import datetime
+
+import pytest
+
+from api.utils.timestamps import cached_iso_now
+
+
+@pytest.mark.unit
+class TestCachedIsoNow:
+    """Test the per-second cached timestamp"""
+
+    def test_matches_current_utc_second(self):
+        """Test the timestamp is the current UTC time without microseconds"""
+        before = datetime.utcnow().replace(microsecond=0)
+        timestamp = datetime.fromisoformat(cached_iso_now())
+        after = datetime.utcnow()
+
+        assert before <= timestamp <= after
+        assert timestamp.microsecond == 0
+
+    def test_reused_within_second(self, monkeypatch):
+        """Test the same string is returned until the second changes"""
+        now_ns = [1_700_000_000_100_000_000]
+        monkeypatch.setattr("api.utils.timestamps.time.time_ns", lambda: now_ns[0])
+
+        first = cached_iso_now()
+        now_ns[0] += 500_000_000
+        second = cached_iso_now()
+        now_ns[0] += 500_000_000
+        third = cached_iso_now()
+
+        assert first is second
+        assert first == "2023-11-14T22:13:20"
+        assert third == "2023-11-14T22:13:21"
@@ -0,0 +1,94 @@
+"""
+Unit tests for the API input validators
+"""
+
+import threading
+
+import bleach
+import pytest
+
+from api.utils.validators import (
+    _CLEANERS,
+    SANITIZE_CACHE_MAX_LENGTH,
+    InputValidators,
+    _cached_sanitize_html,
+)
+
+
+@pytest.mark.unit
+class TestValidateSafeString:
+    """Test safe string cleaning"""
+
+    @pytest.mark.parametrize(
+        "value",
+        [" Acme, Ltd. ", "Hello!\tWorld?", "line\nbreak", "a\r\nb", "a\x0cb", "<b>Acme</b> & Co"],
+    )
+    def test_matches_bleach(self, value):
+        """Test the plain-text fast path returns what bleach would"""
+        expected = bleach.clean(value, tags=[], strip=True).strip()
+
+        assert InputValidators.validate_safe_string(value) == expected
+
+    def test_plain_text_skips_bleach(self, monkeypatch):
+        """Test strings without markup never reach the HTML parser"""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("bleach cleaner called")
+
+        monkeypatch.setattr(_CLEANERS.plain, "clean", fail)
+
+        assert InputValidators.validate_safe_string(" Acme Ltd ") == "Acme Ltd"
+
+
+@pytest.mark.unit
+class TestSanitizeHtml:
+    """Test HTML sanitising"""
+
+    @pytest.mark.parametrize(
+        "value", ["<p>Hi <b>there</b></p>", "<script>alert(1)</script><em>ok</em>", "a & b"]
+    )
+    def test_matches_bleach(self, value):
+        """Test the shared cleaner keeps the allowed tags exactly as bleach.clean does"""
+        allowed_tags = ["b", "i", "u", "em", "strong", "p", "br", "ul", "li", "ol"]
+
+        assert InputValidators.sanitize_html(value) == bleach.clean(
+            value, tags=allowed_tags, strip=True
+        )
+
+    def test_only_short_inputs_cached(self):
+        """Test long inputs are sanitised without being kept in the cache"""
+        _cached_sanitize_html.cache_clear()
+        short = "<b>Acme</b>"
+        long = "<b>" + "x" * SANITIZE_CACHE_MAX_LENGTH + "</b>"
+
+        InputValidators.sanitize_html(short)
+        InputValidators.sanitize_html(short)
+        assert InputValidators.sanitize_html(long) == long
+
+        info = _cached_sanitize_html.cache_info()
+        assert (info.hits, info.currsize) == (1, 1)
+
+    def test_cleaners_per_thread(self):
+        """Test each thread gets its own cleaner, since a cleaner's parser keeps state"""
+        cleaners = []
+        thread = threading.Thread(target=lambda: cleaners.append(_CLEANERS.html))
+        thread.start()
+        thread.join()
+
+        assert cleaners[0] is not _CLEANERS.html
+
+
+@pytest.mark.unit
+class TestValidateUrl:
+    """Test URL validation"""
+
+    @pytest.mark.parametrize(
+        "url", ["https://example.com", "http://localhost:8000/path?q=1", "http://10.0.0.1"]
+    )
+    def test_valid_url_accepted(self, url):
+        assert InputValidators.validate_url(url) == url
+
+    @pytest.mark.parametrize("url", ["ftp://example.com", "example.com", "https://"])
+    def test_invalid_url_rejected(self, url):
+        with pytest.raises(ValueError, match="Invalid URL format"):
+            InputValidators.validate_url(url)